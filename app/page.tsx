@@ -1,10 +1,10 @@
 'use client';
 
-import { useState, useEffect, Suspense, useCallback, useRef } from 'react';
+import { useState, useEffect, useMemo, Suspense, useCallback, useRef } from 'react';
 import { useSearchParams } from 'next/navigation';
-import type { Region, Product, Category, Source, ReportData, AttainmentRow, RAGStatus } from '@/lib/types';
+import type { Region, Product, Category, Source, ReportData, AttainmentRow, RAGStatus, DealIndex } from '@/lib/types';
 import type { RiskProfile } from '@/lib/constants/dimensions';
-import { filterReportData, parseRegionsFromURL, parseProductsFromURL, parseCategoriesFromURL, parseSourcesFromURL } from '@/lib/filterData';
+import { applyRiskProfile, filterReportData, parseRegionsFromURL, parseProductsFromURL, parseCategoriesFromURL, parseSourcesFromURL } from '@/lib/filterData';
 import { computeFilterScope } from '@/lib/filterScope';
 import ReportFilter from '@/components/ReportFilter';
 import UserMenu from '@/components/UserMenu';
@@ -34,6 +34,10 @@ import ThemeToggle from '@/components/ThemeToggle';
 
 // Import the pre-generated data as fallback
 import reportDataJson from '@/data/report-data.json';
+import dealIndexJson from '@/data/report-data.deal-index.json';
+
+// Posting lists for the static deal lists; ignored if built for another run
+const dealIndex = dealIndexJson as DealIndex;
 
 // Transform API response to ReportData format
 function transformAPIResponse(apiData: any): ReportData {
@@ -354,8 +358,12 @@ function ReportContent() {
   const fetchInProgress = useRef(false);
   const [urlParamsLoaded, setUrlParamsLoaded] = useState(false);
 
-  // Load and parse data - fallback to static JSON
-  const rawData = reportDataJson as ReportData;
+  // Load and parse data - fallback to static JSON. Its targets are switched to the
+  // selected risk profile locally; live data is fetched for the profile instead.
+  const rawData = useMemo(
+    () => applyRiskProfile(reportDataJson as ReportData, selectedRiskProfile),
+    [selectedRiskProfile]
+  );
 
   // Fetch live data from BigQuery API
   const fetchLiveData = useCallback(async (
@@ -440,7 +448,7 @@ function ReportContent() {
     if (!initialLoadComplete.current) {
       // First load - immediately show static data with correct filters from URL
       if (rawData) {
-        const filtered = filterReportData(rawData, selectedRegions, selectedProducts, selectedCategories, selectedSources);
+        const filtered = filterReportData(rawData, selectedRegions, selectedProducts, selectedCategories, selectedSources, dealIndex);
         setFilteredData(filtered);
       }
       initialLoadComplete.current = true;
@@ -478,7 +486,7 @@ function ReportContent() {
     } else {
       // Apply client-side filtering to static data
       if (rawData) {
-        const filtered = filterReportData(rawData, selectedRegions, selectedProducts, selectedCategories, selectedSources);
+        const filtered = filterReportData(rawData, selectedRegions, selectedProducts, selectedCategories, selectedSources, dealIndex);
         setFilteredData(filtered);
       }
     }
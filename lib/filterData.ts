@@ -19,8 +19,11 @@ import type {
   ActionItem,
   WinBrightSpot,
   MomentumIndicator,
-  TopRiskPocket
+  TopRiskPocket,
+  DealIndex,
+  DealListIndex
 } from './types';
+import type { RiskProfile } from './constants/dimensions';
 
 const ALL_PRODUCTS: Product[] = ['POR', 'R360'];
 const ALL_CATEGORIES: Category[] = ['NEW LOGO', 'STRATEGIC', 'EXPANSION', 'MIGRATION', 'RENEWAL'];
@@ -194,14 +197,17 @@ function isAllRegions(regions: Region[]): boolean {
 }
 
 /**
- * Filter all report data by selected regions, products, categories, and sources
+ * Filter all report data by selected regions, products, categories, and sources.
+ * With a deal index built for this data, deal lists are filtered from its
+ * posting lists instead of scanning every deal.
  */
 export function filterReportData(
   data: ReportData,
   regions: Region[],
   products: Product[] = ALL_PRODUCTS,
   categories: Category[] = ALL_CATEGORIES,
-  sources: Source[] = ALL_SOURCES
+  sources: Source[] = ALL_SOURCES,
+  dealIndex?: DealIndex
 ): ReportData {
   const allRegions = isAllRegions(regions);
   const allProducts = isAllProducts(products);
@@ -293,6 +299,33 @@ export function filterReportData(
     return filtered;
   };
 
+  // Same selection as filterDeals, from the posting lists: union within a
+  // dimension, intersection across dimensions, positions kept in list order
+  const indexMatches = dealIndex !== undefined && dealIndex.generated_at_utc === data.generated_at_utc;
+  const selectDeals = <T extends { region: Region; category?: Category; source?: Source }>(
+    items: T[],
+    isIncluded: boolean,
+    entry: DealListIndex | undefined
+  ): T[] => {
+    if (!isIncluded) return [];
+    if (!indexMatches || !entry || entry.count !== items.length) return filterDeals(items, true);
+    const constraints: [string, string[]][] = [];
+    if (!allRegions) constraints.push(['region', regions]);
+    // Deals without a category or source pass those filters, as in filterDeals
+    if (!allCategories) constraints.push(['category', [...categories, '']]);
+    if (!allSources) constraints.push(['source', [...sources, '']]);
+    if (constraints.length === 0) return items;
+
+    let selected: Set<number> | null = null;
+    for (const [dimension, values] of constraints) {
+      const postings = entry.postings[dimension] || {};
+      const matches = new Set<number>();
+      values.forEach(value => (postings[value] || []).forEach(i => matches.add(i)));
+      selected = selected === null ? matches : new Set(Array.from(selected).filter(i => matches.has(i)));
+    }
+    return Array.from(selected || []).sort((a, b) => a - b).map(i => items[i]);
+  };
+
   // Filter attainment detail by product, region, and category
   const filteredAttainmentPOR = filterAttainmentRows(data.attainment_detail.POR, includePOR);
   const filteredAttainmentR360 = filterAttainmentRows(data.attainment_detail.R360, includeR360);
@@ -441,16 +474,16 @@ export function filterReportData(
     },
     // Deal lists for drill-down (filtered by region, category, and source)
     won_deals: data.won_deals ? {
-      POR: filterDeals(data.won_deals.POR || [], includePOR),
-      R360: filterDeals(data.won_deals.R360 || [], includeR360),
+      POR: selectDeals(data.won_deals.POR || [], includePOR, dealIndex?.sections.won_deals?.POR),
+      R360: selectDeals(data.won_deals.R360 || [], includeR360, dealIndex?.sections.won_deals?.R360),
     } : undefined,
     lost_deals: data.lost_deals ? {
-      POR: filterDeals(data.lost_deals.POR || [], includePOR),
-      R360: filterDeals(data.lost_deals.R360 || [], includeR360),
+      POR: selectDeals(data.lost_deals.POR || [], includePOR, dealIndex?.sections.lost_deals?.POR),
+      R360: selectDeals(data.lost_deals.R360 || [], includeR360, dealIndex?.sections.lost_deals?.R360),
     } : undefined,
     pipeline_deals: data.pipeline_deals ? {
-      POR: filterDeals(data.pipeline_deals.POR || [], includePOR),
-      R360: filterDeals(data.pipeline_deals.R360 || [], includeR360),
+      POR: selectDeals(data.pipeline_deals.POR || [], includePOR, dealIndex?.sections.pipeline_deals?.POR),
+      R360: selectDeals(data.pipeline_deals.R360 || [], includeR360, dealIndex?.sections.pipeline_deals?.R360),
     } : undefined,
     // MQL details (filter by product, region, source, AND category)
     mql_details: data.mql_details ? {
@@ -519,6 +552,16 @@ export function filterReportData(
   };
 }
 
+/**
+ * Swap in the target-dependent sections precomputed for a risk profile
+ * (data.risk_profiles, see scripts/risk_profiles.py). Data without that
+ * profile is returned unchanged.
+ */
+export function applyRiskProfile(data: ReportData, profile: RiskProfile): ReportData {
+  const sections = data.risk_profiles?.[profile];
+  return sections ? { ...data, ...sections } : data;
+}
+
 /**
  * Parse regions from URL search params
  */
@@ -1,3 +1,5 @@
+import type { RiskProfile } from './constants/dimensions';
+
 // Region and Product types
 export type Region = 'AMER' | 'EMEA' | 'APAC';
 export type Product = 'POR' | 'R360';
@@ -433,6 +435,9 @@ export interface ReportData {
     R360: MomentumIndicator[];
   };
   top_risk_pockets?: TopRiskPocket[];
+  // Attainment sections recomputed against every SOP percentile in one run
+  // (scripts/risk_profiles.py), keyed by percentile, e.g. risk_profiles.P90
+  risk_profiles?: Partial<Record<RiskProfile, RiskProfileSections>>;
   // Deal lists for drill-down
   won_deals?: {
     POR: DealDetail[];
@@ -484,6 +489,42 @@ export interface ReportData {
   // which unlocks dropping those ~4MB arrays from the client→server payload.
   // Shape intentionally loose here; see lib/ai-aggregations.ts for the detail.
   ai_funnel_aggregations?: any;
+  // Set by scripts/generate-data.py; matches DealIndex.generated_at_utc
+  generated_at_utc?: string;
+}
+
+// Posting lists and presorted orders for one product's deal list
+// (data/report-data.deal-index.json, written by scripts/deal_indexes.py)
+export interface DealListIndex {
+  count: number;
+  // dimension -> value -> ascending deal positions; missing values are ''
+  postings: Record<string, Record<string, number[]>>;
+  orders: Record<'acv_desc' | 'acv_asc' | 'close_date_asc' | 'close_date_desc', number[]>;
+}
+
+export interface DealIndex {
+  generated_at_utc: string | null;
+  dimensions: string[];
+  sections: Partial<Record<'won_deals' | 'lost_deals' | 'pipeline_deals', Partial<Record<Product, DealListIndex>>>>;
+}
+
+// Target-dependent sections for one SOP percentile
+export interface RiskProfileSections {
+  grand_total: GrandTotal;
+  product_totals: {
+    POR: ProductTotal;
+    R360: ProductTotal;
+  };
+  attainment_detail: {
+    POR: AttainmentRow[];
+    R360: AttainmentRow[];
+  };
+  source_attainment: {
+    POR: SourceAttainmentRow[];
+    R360: SourceAttainmentRow[];
+  };
+  top_risk_pockets: TopRiskPocket[];
+  executive_counts: ExecutiveCounts;
 }
 
 // Executive Summary Counts
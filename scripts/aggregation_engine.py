@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Local Attainment Aggregation Engine
+
+Recomputes attainment_detail, source_attainment, product_totals, grand_total
+and top_risk_pockets from deal-level rows (won_deals, lost_deals,
+pipeline_deals) and target rows, with the same formulas, rounding and
+NULL behavior as query_comprehensive_risk_analysis.sql. Re-slicing the report
+(dropping a deal type, moving the as-of cutoff, narrowing to some sources or
+owners) then takes milliseconds locally instead of a warehouse round trip.
+
+Deals are held column-wise in DealColumns; a selection is a list of row
+positions, and each aggregation is a single pass over the selected positions
+into per-segment accumulators. Targets come from target rows (by default
+those already in the report, see targets_from_report).
+
+The deal lists carry no created date, so pipeline_avg_age_days is taken from
+the target rows unless deals carry an age_days field.
+
+Usage:
+    python scripts/aggregation_engine.py                      # verify against the SQL numbers
+    python scripts/aggregation_engine.py --exclude-deal-type Migration
+    python scripts/aggregation_engine.py --as-of 2026-01-10 --sources INBOUND,OUTBOUND -o slice.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+
+DEAL_SECTIONS = (("won", "won_deals"), ("lost", "lost_deals"), ("pipeline", "pipeline_deals"))
+RISK_POCKET_FIELDS = ("product", "region", "category", "qtd_target", "qtd_acv", "qtd_gap", "qtd_attainment_pct",
+                      "rag_status", "win_rate_pct", "pipeline_acv", "pipeline_coverage_x")
+RISK_POCKET_LIMIT = 10
+
+
+def sql_round(value, digits=0):
+    """ROUND() as BigQuery does it: half away from zero; NULL stays NULL."""
+    if value is None:
+        return None
+    rounded = Decimal(repr(value)).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP)
+    return int(rounded) if digits == 0 else float(rounded)
+
+
+def safe_divide(numerator, denominator):
+    """SAFE_DIVIDE(): NULL instead of a division by zero."""
+    return numerator / denominator if denominator else None
+
+
+def _pct(numerator, denominator):
+    ratio = safe_divide(numerator, denominator)
+    return sql_round(ratio * 100, 1) if ratio is not None else None
+
+
+def rag_status(actual, target):
+    """GREEN at 90%+ of target, YELLOW at 70%+, otherwise RED (including no target)."""
+    ratio = safe_divide(actual, target)
+    if ratio is not None and ratio >= 0.90:
+        return "GREEN"
+    if ratio is not None and ratio >= 0.70:
+        return "YELLOW"
+    return "RED"
+
+
+class DealColumns:
+    """Won, lost and open pipeline deals stored column-wise."""
+
+    __slots__ = ("kind", "product", "region", "category", "source", "deal_type", "owner_name",
+                 "acv", "close_date", "age_days", "segment_key", "source_key")
+
+    def __init__(self, deals_by_kind):
+        """deals_by_kind maps "won"/"lost"/"pipeline" to iterables of deal dicts."""
+        for name in self.__slots__:
+            setattr(self, name, [])
+        for kind, deals in deals_by_kind.items():
+            for deal in deals:
+                self.kind.append(kind)
+                self.product.append(deal.get("product"))
+                self.region.append(deal.get("region"))
+                self.category.append(deal.get("category"))
+                self.source.append(deal.get("source"))
+                self.deal_type.append(deal.get("deal_type"))
+                self.owner_name.append(deal.get("owner_name"))
+                self.acv.append(deal.get("acv") or 0)
+                self.close_date.append(deal.get("close_date") or "")
+                self.age_days.append(deal.get("age_days"))
+                self.segment_key.append((self.product[-1], self.region[-1], self.category[-1]))
+                self.source_key.append((self.product[-1], self.region[-1], self.source[-1]))
+
+    @classmethod
+    def from_report(cls, data):
+        """Build from the won_deals/lost_deals/pipeline_deals sections of a report."""
+        return cls({
+            kind: (deal for deals in (data.get(section) or {}).values() for deal in deals)
+            for kind, section in DEAL_SECTIONS
+        })
+
+    def __len__(self):
+        return len(self.kind)
+
+    def select(self, products=None, regions=None, categories=None, sources=None, owners=None,
+               exclude_deal_types=(), where=None):
+        """
+        Return the positions of deals matching every given filter.
+
+        Each filter is a collection of allowed values (None means any);
+        where, if given, is called with the position for custom predicates.
+        """
+        columns = ((products, self.product), (regions, self.region), (categories, self.category),
+                   (sources, self.source), (owners, self.owner_name))
+        active = [(set(allowed), values) for allowed, values in columns if allowed is not None]
+        excluded = set(exclude_deal_types)
+        if not active and not excluded and where is None:
+            return list(range(len(self.kind)))
+        return [
+            i for i in range(len(self.kind))
+            if all(values[i] in allowed for allowed, values in active)
+            and self.deal_type[i] not in excluded
+            and (where is None or where(i))
+        ]
+
+
+def targets_from_report(data):
+    """
+    Return the target rows embedded in a report.
+
+    {"segments": [{product, region, category, q1_target, pipeline_avg_age_days}],
+     "sources": [{product, region, source, q1_target}],
+     "fy_targets": {product: total_fy_target}}
+    """
+    return {
+        "segments": [
+            {key: row.get(key) for key in ("product", "region", "category", "q1_target", "pipeline_avg_age_days")}
+            for rows in (data.get("attainment_detail") or {}).values() for row in rows
+        ],
+        "sources": [
+            {key: row.get(key) for key in ("product", "region", "source", "q1_target")}
+            for rows in (data.get("source_attainment") or {}).values() for row in rows
+        ],
+        "fy_targets": {product: totals.get("total_fy_target")
+                       for product, totals in (data.get("product_totals") or {}).items()},
+    }
+
+
+def select_targets(targets, products=None, regions=None, categories=None, sources=None):
+    """
+    Narrow a target set to the same filters as DealColumns.select.
+
+    Segment targets are matched on product, region and category, source
+    targets on product, region and source. FY targets are only kept per
+    selected product, and dropped once regions, categories or sources narrow
+    the selection (they are not split below product).
+    """
+    def allowed(value, accepted):
+        return accepted is None or value in accepted
+
+    fy_targets = targets.get("fy_targets") or {}
+    if regions is not None or categories is not None or sources is not None:
+        fy_targets = {}
+    return {
+        "segments": [t for t in targets["segments"] if allowed(t["product"], products)
+                     and allowed(t["region"], regions) and allowed(t["category"], categories)],
+        "sources": [t for t in targets["sources"] if allowed(t["product"], products)
+                    and allowed(t["region"], regions) and allowed(t["source"], sources)],
+        "fy_targets": {product: value for product, value in fy_targets.items() if allowed(product, products)},
+    }
+
+
+def period_as_of(period, as_of=None):
+    """Return the report period, moved to a different as-of date if given."""
+    if as_of is None:
+        return period
+    quarter_start = date.fromisoformat(period["quarter_start"])
+    elapsed = (date.fromisoformat(as_of) - quarter_start).days + 1
+    total = period["total_days"]
+    return {
+        "quarter_start": period["quarter_start"],
+        "as_of_date": as_of,
+        "days_elapsed": elapsed,
+        "days_remaining": total - elapsed,
+        "total_days": total,
+        "quarter_pct_complete": sql_round(elapsed / total * 100, 1),
+    }
+
+
+def _accumulate(deals, positions, period, key_column):
+    """
+    Sum deals into per-segment accumulators in one pass.
+
+    Returns {"won": {key: [count, acv]}, "lost": ..., "pipeline": {key: [count, acv, age_sum, aged]}}
+    where key is the deal's segment_key or source_key. Won and lost deals only
+    count when they closed inside the quarter up to the as-of date.
+    """
+    start, end = period["quarter_start"], period["as_of_date"]
+    sums = {"won": {}, "lost": {}, "pipeline": {}}
+    kinds, keys = deals.kind, getattr(deals, key_column)
+    acvs, closes, ages = deals.acv, deals.close_date, deals.age_days
+    for i in positions:
+        kind = kinds[i]
+        if kind != "pipeline" and not start <= closes[i] <= end:
+            continue
+        bucket = sums[kind].get(keys[i])
+        if bucket is None:
+            bucket = sums[kind][keys[i]] = [0, 0.0, 0, 0]
+        bucket[0] += 1
+        bucket[1] += acvs[i]
+        if ages[i] is not None:
+            bucket[2] += ages[i]
+            bucket[3] += 1
+    return sums
+
+
+def attainment_rows(deals, positions, segment_targets, period):
+    """Return attainment_detail rows (product, region, category), ordered as the query orders them."""
+    sums = _accumulate(deals, positions, period, "segment_key")
+    fraction = period["days_elapsed"] / period["total_days"]
+    rows = []
+    for target in segment_targets:
+        q1_target = target["q1_target"] or 0
+        if q1_target <= 0:
+            continue
+        key = (target["product"], target["region"], target["category"])
+        won_deals, won_acv = sums["won"].get(key, (0, 0))[:2]
+        lost_deals, lost_acv = sums["lost"].get(key, (0, 0))[:2]
+        opps, pipeline_acv, age_sum, aged = sums["pipeline"].get(key, (0, 0, 0, 0))
+        qtd_acv = sql_round(won_acv, 2)
+        prorated = q1_target * fraction
+        rows.append({
+            "product": key[0],
+            "region": key[1],
+            "category": key[2],
+            "q1_target": q1_target,
+            "qtd_target": sql_round(prorated, 2),
+            "qtd_deals": won_deals,
+            "qtd_acv": qtd_acv,
+            "qtd_attainment_pct": _pct(qtd_acv, prorated),
+            "q1_progress_pct": _pct(qtd_acv, q1_target),
+            "qtd_gap": sql_round(qtd_acv - prorated, 2),
+            "qtd_lost_deals": lost_deals,
+            "qtd_lost_acv": sql_round(lost_acv, 2),
+            "win_rate_pct": _pct(won_deals, won_deals + lost_deals),
+            "pipeline_opps": opps,
+            "pipeline_acv": sql_round(pipeline_acv, 2),
+            "pipeline_avg_age_days": sql_round(age_sum / aged) if aged else target.get("pipeline_avg_age_days") or 0,
+            "pipeline_coverage_x": sql_round(safe_divide(sql_round(pipeline_acv, 2), q1_target - qtd_acv), 1),
+            "rag_status": rag_status(qtd_acv, prorated),
+        })
+    rows.sort(key=lambda r: (r["product"], r["region"], r["category"]))
+    return rows
+
+
+def source_rows(deals, positions, source_targets, period):
+    """Return source_attainment rows (product, region, source): targets full-outer-joined to won ACV."""
+    sums = _accumulate(deals, positions, period, "source_key")["won"]
+    fraction = period["days_elapsed"] / period["total_days"]
+    targets = {(t["product"], t["region"], t["source"]): t["q1_target"] or 0 for t in source_targets}
+    rows = []
+    for key in sorted(set(targets) | set(sums)):
+        q1_target = targets.get(key, 0)
+        won_deals, won_acv = sums.get(key, (0, 0))[:2]
+        qtd_acv = sql_round(won_acv, 2)
+        if q1_target <= 0 and qtd_acv <= 0:
+            continue
+        prorated = q1_target * fraction
+        rows.append({
+            "product": key[0],
+            "region": key[1],
+            "source": key[2],
+            "q1_target": q1_target,
+            "qtd_target": sql_round(prorated, 2),
+            "qtd_deals": won_deals,
+            "qtd_acv": qtd_acv,
+            "attainment_pct": _pct(qtd_acv, prorated),
+            "gap": sql_round(qtd_acv - prorated, 2),
+            "rag_status": rag_status(qtd_acv, prorated),
+        })
+    return rows
+
+
+def totals_row(product, rows, fy_target=None):
+    """Return a product_totals / grand_total entry summed over attainment rows."""
+    q1_target = sum(r["q1_target"] for r in rows)
+    qtd_target = sum(r["qtd_target"] for r in rows)
+    qtd_acv = sum(r["qtd_acv"] for r in rows)
+    won = sum(r["qtd_deals"] for r in rows)
+    lost = sum(r["qtd_lost_deals"] for r in rows)
+    pipeline_acv = sum(r["pipeline_acv"] for r in rows)
+    return {
+        "product": product,
+        "total_fy_target": fy_target,
+        "total_q1_target": q1_target,
+        "total_qtd_target": qtd_target,
+        "total_qtd_deals": won,
+        "total_qtd_acv": qtd_acv,
+        "total_qtd_attainment_pct": _pct(qtd_acv, qtd_target),
+        "total_q1_progress_pct": _pct(qtd_acv, q1_target),
+        "total_qtd_gap": sum(r["qtd_gap"] for r in rows),
+        "total_lost_deals": lost,
+        "total_lost_acv": sum(r["qtd_lost_acv"] for r in rows),
+        "total_win_rate_pct": _pct(won, won + lost),
+        "total_pipeline_acv": pipeline_acv,
+        "total_pipeline_coverage_x": sql_round(safe_divide(pipeline_acv, q1_target - qtd_acv), 1),
+        "total_won_deals": won,
+    }
+
+
+def top_risk_pockets(rows, limit=RISK_POCKET_LIMIT):
+    """Return the segments furthest behind their QTD target."""
+    behind = sorted((r for r in rows if r["qtd_gap"] < 0), key=lambda r: r["qtd_gap"])
+    return [{key: r[key] for key in RISK_POCKET_FIELDS} for r in behind[:limit]]
+
+
+def _group(rows):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row["product"], []).append(row)
+    return grouped
+
+
+def aggregate(deals, targets, period, positions=None, as_of=None):
+    """
+    Return the attainment sections for the selected deals.
+
+    positions defaults to every deal (see DealColumns.select); as_of moves the
+    QTD cutoff (target proration and which closed deals count).
+    """
+    if positions is None:
+        positions = range(len(deals))
+    period = period_as_of(period, as_of)
+    detail = attainment_rows(deals, positions, targets["segments"], period)
+    grouped = _group(detail)
+    fy_targets = targets.get("fy_targets") or {}
+    product_totals = {product: totals_row(product, rows, fy_targets.get(product))
+                      for product, rows in grouped.items()}
+    known_fy = [v for v in fy_targets.values() if v is not None]
+    return {
+        "period": period,
+        "grand_total": totals_row("ALL", detail, sum(known_fy) if known_fy else None),
+        "product_totals": product_totals,
+        "attainment_detail": grouped,
+        "top_risk_pockets": top_risk_pockets(detail),
+        "source_attainment": _group(source_rows(deals, positions, targets["sources"], period)),
+    }
+
+
+def compare(expected, actual, path="", tolerance=0.05):
+    """
+    Return paths where two section values differ.
+
+    Numbers within tolerance (or one part in 10^7, for large sums of deal ACVs
+    that were each rounded to cents) are equal.
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return [diff for key in expected if key in actual
+                for diff in compare(expected[key], actual[key], f"{path}.{key}", tolerance)]
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: {len(expected)} rows, got {len(actual)}"]
+        return [diff for i, (e, a) in enumerate(zip(expected, actual))
+                for diff in compare(e, a, f"{path}[{i}]", tolerance)]
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)) and not isinstance(expected, bool):
+        return [] if abs(expected - actual) <= max(tolerance, abs(expected) * 1e-7) else [f"{path}: {expected} != {actual}"]
+    return [] if expected == actual else [f"{path}: {expected!r} != {actual!r}"]
+
+
+def _or_na(value, unit):
+    return f"{value}{unit}" if value is not None else "n/a"
+
+
+def _csv(value):
+    return [v for v in value.split(",") if v] if value else None
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Re-aggregate attainment sections locally from deal rows")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--products")
+    parser.add_argument("--regions")
+    parser.add_argument("--categories")
+    parser.add_argument("--sources")
+    parser.add_argument("--owners")
+    parser.add_argument("--exclude-deal-type", action="append", default=[],
+                        help="Deal type to drop (repeatable), e.g. Migration")
+    parser.add_argument("--as-of", help="Move the QTD cutoff to this date (YYYY-MM-DD)")
+    parser.add_argument("-o", "--output", help="Write the re-aggregated sections here as JSON")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs (best is reported)")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    with open(args.data, "r") as f:
+        data = json.load(f)
+
+    deals = DealColumns.from_report(data)
+    targets = select_targets(targets_from_report(data), _csv(args.products), _csv(args.regions),
+                             _csv(args.categories), _csv(args.sources))
+    filtered = any((args.products, args.regions, args.categories, args.sources, args.owners,
+                    args.exclude_deal_type, args.as_of))
+
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        positions = deals.select(_csv(args.products), _csv(args.regions), _csv(args.categories),
+                                 _csv(args.sources), _csv(args.owners), args.exclude_deal_type)
+        sections = aggregate(deals, targets, data["period"], positions, args.as_of)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"Aggregated {len(positions):,} of {len(deals):,} deals in {best * 1000:.2f} ms")
+    totals = sections["grand_total"]
+    print(f"  QTD ACV ${totals['total_qtd_acv']:,.0f} of ${totals['total_qtd_target']:,.0f} "
+          f"({_or_na(totals['total_qtd_attainment_pct'], '%')}), "
+          f"win rate {_or_na(totals['total_win_rate_pct'], '%')}, "
+          f"coverage {_or_na(totals['total_pipeline_coverage_x'], 'x')}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(sections, indent=2))
+        print(f"Sections saved to: {args.output}")
+
+    if not filtered:
+        diffs = [diff for name, value in sections.items() if name != "period"
+                 for diff in compare(data.get(name), value, name)]
+        for diff in diffs[:20]:
+            print(f"  MISMATCH {diff}")
+        print(f"{len(diffs)} difference(s) from the SQL-computed sections")
+        return 1 if diffs else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
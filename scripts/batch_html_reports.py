@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Batch Audience HTML Reports
+
+Renders the risk report once per audience instead of one combined report:
+
+    region   AMER, EMEA and APAC views (both products)
+    product  POR-only and R360-only views (all regions)
+    owner    one view per deal owner, scoped to the product x region x
+             category segments the owner has won, lost or open deals in
+
+report-data.json is loaded once and handed to each worker process when the
+pool starts; workers build their audience's filtered view and stream it to
+its own file, so wall time scales with the number of cores rather than the
+number of reports. Totals, product totals and executive counts are
+recalculated from the filtered attainment rows, the same way the dashboard
+filters do (lib/filterData.ts). Sections shared between audiences are
+reused from the render cache.
+
+Output goes to scripts/reports/audiences_<report date>/ with an index.html
+linking every audience report. With --linked-css all reports share one
+content-hashed stylesheet in assets/ instead of each inlining it.
+
+Usage:
+    python scripts/batch_html_reports.py
+    python scripts/batch_html_reports.py --kinds region,product --workers 4
+    python scripts/batch_html_reports.py --data data/report-data.json --no-render-cache
+    python scripts/batch_html_reports.py --linked-css --minify
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from deal_indexes import DEAL_SECTIONS
+from generate_html_report import (
+    RENDER_BUFFER_BYTES, RENDER_TEMPLATE_VERSION, format_currency, format_percent, render_html, write_stylesheet,
+)
+from render_cache import DEFAULT_MAX_ENTRIES, RenderCache, prune as prune_render_cache
+from snapshot_store import atomic_write
+
+
+PRODUCTS = ("POR", "R360")
+REGIONS = ("AMER", "EMEA", "APAC")
+AUDIENCE_KINDS = ("region", "product", "owner")
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+OUTPUT_ROOT = Path(__file__).parent / "reports"
+
+# Momentum tiers counted as "areas with momentum" in the executive summary
+MOMENTUM_TIERS = ("STRONG_MOMENTUM", "MODERATE_MOMENTUM")
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def build_audiences(data, kinds=AUDIENCE_KINDS):
+    """
+    Return the audience specs for a report.
+
+    Each spec is a dict with slug, kind, title and the filters applied to the
+    data: products, regions (empty tuple = all) and owner (None = all).
+    """
+    audiences = []
+    if "region" in kinds:
+        for region in REGIONS:
+            audiences.append({"slug": f"region-{region.lower()}", "kind": "region", "title": f"Region - {region}",
+                              "products": (), "regions": (region,), "owner": None})
+    if "product" in kinds:
+        for product in PRODUCTS:
+            audiences.append({"slug": f"product-{product.lower()}", "kind": "product", "title": f"Product - {product}",
+                              "products": (product,), "regions": (), "owner": None})
+    if "owner" in kinds:
+        owners = sorted({
+            deal["owner_name"]
+            for section in DEAL_SECTIONS
+            for deals in data.get(section, {}).values()
+            for deal in deals
+            if deal.get("owner_name")
+        })
+        for owner in owners:
+            audiences.append({"slug": f"owner-{_slug(owner)}", "kind": "owner", "title": f"Owner - {owner}",
+                              "products": (), "regions": (), "owner": owner})
+    return audiences
+
+
+def _deal_segments(data, owner=None):
+    """Return the (product, region, category) segments with deals, optionally for one owner."""
+    return {
+        (product, deal.get("region"), deal.get("category"))
+        for section in DEAL_SECTIONS
+        for product, deals in data.get(section, {}).items()
+        for deal in deals
+        if owner is None or deal.get("owner_name") == owner
+    }
+
+
+def _row_filter(audience, segments, deal_categories):
+    """
+    Return keep(product, row) for an audience.
+
+    segments restricts rows to owner segments (None = no restriction). Rows
+    whose category is a deal category (NEW LOGO, EXPANSION, ...) match on
+    product x region x category; other rows match on product x region.
+    """
+    products = audience["products"]
+    regions = audience["regions"]
+    segment_regions = {(p, r) for p, r, _c in segments or ()}
+    segment_products = {p for p, _r, _c in segments or ()}
+
+    def keep(product, row):
+        product = row.get("product") or product
+        region = row.get("region")
+        if products and product not in products:
+            return False
+        # Rows without a region (product-wide action items, competitor losses) apply to every region
+        if regions and region is not None and region not in regions:
+            return False
+        if segments is not None:
+            if region is None:
+                return product in segment_products
+            if row.get("category") in deal_categories:
+                return (product, region, row["category"]) in segments
+            return (product, region) in segment_regions
+        return True
+
+    return keep
+
+
+def _product_totals(product, rows, full):
+    """
+    Recalculate a product_totals entry from (filtered) attainment rows.
+
+    Attainment rows carry no FY target, so the product's total_fy_target
+    (from the unfiltered entry `full`) is prorated by the rows' share of its
+    Q1 target.
+    """
+    q1_target = sum(r.get("q1_target") or 0 for r in rows)
+    full_q1_target = full.get("total_q1_target") or 0
+    fy_target = full.get("total_fy_target") or 0
+    if q1_target != full_q1_target:
+        fy_target = round(fy_target * q1_target / full_q1_target, 2) if full_q1_target else 0
+    qtd_target = sum(r.get("qtd_target") or 0 for r in rows)
+    qtd_acv = sum(r.get("qtd_acv") or 0 for r in rows)
+    won = sum(r.get("qtd_deals") or 0 for r in rows)
+    lost = sum(r.get("qtd_lost_deals") or 0 for r in rows)
+    pipeline_acv = sum(r.get("pipeline_acv") or 0 for r in rows)
+    return _totals(product, {
+        "total_fy_target": fy_target,
+        "total_q1_target": q1_target,
+        "total_qtd_target": qtd_target,
+        "total_qtd_acv": qtd_acv,
+        "total_qtd_deals": won,
+        "total_lost_deals": lost,
+        "total_lost_acv": sum(r.get("qtd_lost_acv") or 0 for r in rows),
+        "total_pipeline_acv": pipeline_acv,
+    })
+
+
+def _totals(product, sums):
+    """Derive the ratio fields of a totals entry from its summed fields."""
+    q1_target = sums["total_q1_target"]
+    qtd_target = sums["total_qtd_target"]
+    qtd_acv = sums["total_qtd_acv"]
+    won = sums["total_qtd_deals"]
+    closed = won + sums["total_lost_deals"]
+    remaining = q1_target - qtd_acv
+    totals = {"product": product}
+    totals.update(sums)
+    totals.update({
+        # target=0 means 100% attainment (met a zero target)
+        "total_qtd_attainment_pct": round(qtd_acv / qtd_target * 100, 1) if qtd_target > 0 else 100,
+        "total_q1_progress_pct": round(qtd_acv / q1_target * 100, 1) if q1_target > 0 else 0,
+        "total_qtd_gap": qtd_acv - qtd_target,
+        "total_win_rate_pct": round(won / closed * 100, 1) if closed > 0 else 0,
+        "total_pipeline_coverage_x": round(sums["total_pipeline_acv"] / remaining, 1) if remaining > 0 else 0,
+        "total_won_deals": won,
+    })
+    return totals
+
+
+def _executive_counts(attainment_rows, momentum_rows):
+    return {
+        "areas_exceeding_target": sum(1 for r in attainment_rows if (r.get("qtd_attainment_pct") or 0) >= 100),
+        "areas_at_risk": sum(1 for r in attainment_rows if r.get("rag_status") == "RED"),
+        "areas_needing_attention": sum(1 for r in attainment_rows if r.get("rag_status") == "YELLOW"),
+        "areas_with_momentum": sum(1 for r in momentum_rows if r.get("momentum_tier") in MOMENTUM_TIERS),
+    }
+
+
+def filter_report(data, audience):
+    """Return the report data as seen by one audience."""
+    owner = audience["owner"]
+    segments = _deal_segments(data, owner) if owner else None
+    keep = _row_filter(audience, segments, {c for _p, _r, c in _deal_segments(data)})
+
+    view = {}
+    for name, value in data.items():
+        if isinstance(value, list):
+            view[name] = [row for row in value if isinstance(row, dict) and keep(None, row)]
+        elif isinstance(value, dict) and value and all(isinstance(v, list) for v in value.values()):
+            # Product-keyed sections use the key as the product; action_items groups by urgency
+            view[name] = {
+                group: [row for row in rows if keep(group if group in PRODUCTS else None, row)
+                        and (name not in DEAL_SECTIONS or owner is None or row.get("owner_name") == owner)]
+                for group, rows in value.items()
+            }
+        else:
+            view[name] = value
+
+    attainment = view.get("attainment_detail", {})
+    product_totals = {
+        product: _product_totals(product, attainment.get(product, []), (data.get("product_totals") or {}).get(product, {}))
+        for product in PRODUCTS
+    }
+    summed = {
+        field: sum(product_totals[p][field] for p in PRODUCTS)
+        for field in ("total_fy_target", "total_q1_target", "total_qtd_target", "total_qtd_acv",
+                      "total_qtd_deals", "total_lost_deals", "total_lost_acv", "total_pipeline_acv")
+    }
+    view["product_totals"] = product_totals
+    view["grand_total"] = _totals("ALL", summed)
+    view["quarterly_targets"] = {
+        "POR_Q1_target": product_totals["POR"]["total_q1_target"],
+        "R360_Q1_target": product_totals["R360"]["total_q1_target"],
+        "combined_Q1_target": summed["total_q1_target"],
+    }
+    view["executive_counts"] = _executive_counts(
+        [row for rows in attainment.values() for row in rows],
+        [row for rows in view.get("momentum_indicators", {}).values() for row in rows],
+    )
+    view["audience"] = audience["title"]
+    return view
+
+
+# Per-process state, set once by the pool initializer
+_worker_data = None
+_worker_cache = None
+_worker_options = {}
+
+
+def _init_worker(data, use_cache, options):
+    global _worker_data, _worker_cache, _worker_options
+    _worker_data = data
+    _worker_cache = RenderCache(RENDER_TEMPLATE_VERSION) if use_cache else None
+    _worker_options = options
+
+
+def _render_audience(audience, output_path):
+    """Filter and render one audience report. Runs in a worker process."""
+    start = time.perf_counter()
+    view = filter_report(_worker_data, audience)
+    with open(output_path, "w", encoding="utf-8", buffering=RENDER_BUFFER_BYTES) as f:
+        stats = render_html(view, f, _worker_cache, **_worker_options)
+    grand_total = view["grand_total"]
+    return {
+        "slug": audience["slug"],
+        "kind": audience["kind"],
+        "title": audience["title"],
+        "file": Path(output_path).name,
+        "qtd_acv": grand_total["total_qtd_acv"],
+        "qtd_target": grand_total["total_qtd_target"],
+        "attainment_pct": grand_total["total_qtd_attainment_pct"],
+        "pipeline_coverage_x": grand_total["total_pipeline_coverage_x"],
+        "rendered": stats["rendered"],
+        "cached": stats["cached"],
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def render_index(data, results):
+    """Return the HTML index page linking every audience report."""
+    from html import escape
+
+    rows = []
+    for kind in AUDIENCE_KINDS:
+        for result in results:
+            if result["kind"] != kind:
+                continue
+            rows.append(f"""            <tr>
+                <td>{kind.title()}</td>
+                <td><a href="{escape(result['file'])}">{escape(result['title'])}</a></td>
+                <td>{format_currency(result['qtd_acv'])}</td>
+                <td>{format_currency(result['qtd_target'])}</td>
+                <td>{format_percent(result['attainment_pct'])}</td>
+                <td>{result['pipeline_coverage_x']:.1f}x</td>
+            </tr>
+""")
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Q1 2026 Bookings Risk Analysis Reports - {data.get('report_date', 'N/A')}</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif; font-size: 14px; color: #333; margin: 24px; }}
+        table {{ border-collapse: collapse; }}
+        th, td {{ padding: 6px 12px; border-bottom: 1px solid #dee2e6; text-align: left; }}
+        th {{ background: #f8f9fa; }}
+    </style>
+</head>
+<body>
+    <h1>Q1 2026 Bookings Risk Analysis Reports</h1>
+    <p>Report Date: {data.get('report_date', 'N/A')} | Generated: {data.get('generated_at_utc', 'N/A')[:19]} UTC</p>
+    <table>
+        <thead>
+            <tr>
+                <th>Audience</th>
+                <th>Report</th>
+                <th>QTD ACV</th>
+                <th>QTD Target</th>
+                <th>Attainment</th>
+                <th>Coverage</th>
+            </tr>
+        </thead>
+        <tbody>
+{''.join(rows)}        </tbody>
+    </table>
+</body>
+</html>
+"""
+
+
+def render_batch(data, audiences, output_dir, workers=None, use_cache=True, linked_css=False, minify=False):
+    """Render every audience report in parallel and write the index. Returns per-audience results."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = [output_dir / f"Q1_2026_Risk_Report_{a['slug']}.html" for a in audiences]
+    options = {"stylesheet": write_stylesheet(output_dir) if linked_css else None, "minify": minify}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(data, use_cache, options)) as pool:
+        results = list(pool.map(_render_audience, audiences, paths))
+
+    atomic_write(output_dir / "index.html", render_index(data, results).encode("utf-8"))
+    return results
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Render one risk report per audience in parallel")
+    parser.add_argument("--data", default=str(DATA_PATH), help="Report data artifact to render from")
+    parser.add_argument("--kinds", default=",".join(AUDIENCE_KINDS),
+                        help=f"Comma-separated audience kinds ({', '.join(AUDIENCE_KINDS)})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output-dir", help="Output directory (default: scripts/reports/audiences_<date>)")
+    parser.add_argument("--no-render-cache", action="store_true",
+                        help="Re-render every section instead of reusing cached fragments")
+    parser.add_argument("--cache-entries", type=int, metavar="MAX",
+                        help="Fragments to keep in the render cache (default: this batch's fragments "
+                             f"plus {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument("--linked-css", action="store_true",
+                        help="Link one shared, content-hashed stylesheet instead of inlining it in every report")
+    parser.add_argument("--minify", action="store_true", help="Strip comments and indentation from the HTML")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    kinds = [k for k in args.kinds.split(",") if k]
+    unknown = [k for k in kinds if k not in AUDIENCE_KINDS]
+    if unknown:
+        print(f"Error: unknown audience kind(s): {', '.join(unknown)}")
+        return 1
+
+    with open(args.data, "r") as f:
+        data = json.load(f)
+
+    audiences = build_audiences(data, kinds)
+    output_dir = Path(args.output_dir) if args.output_dir else OUTPUT_ROOT / f"audiences_{data.get('report_date')}"
+    workers = args.workers or os.cpu_count()
+
+    print(f"Rendering {len(audiences)} audience reports on {workers} workers to: {output_dir}")
+    start = time.perf_counter()
+    results = render_batch(data, audiences, output_dir, workers, not args.no_render_cache,
+                           args.linked_css, args.minify)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        print(f"  {result['title']:<36} {format_percent(result['attainment_pct']):>8} "
+              f"{result['rendered']:>3} rendered {result['cached']:>3} cached  {result['seconds'] * 1000:>7.1f} ms")
+    print(f"\n{len(results)} reports + index.html in {elapsed:.2f}s "
+          f"({sum(r['seconds'] for r in results):.2f}s of render work)")
+
+    if not args.no_render_cache:
+        # Keep every fragment this batch used, on top of what single reports need
+        fragments = sum(r["rendered"] + r["cached"] for r in results)
+        prune_render_cache(args.cache_entries if args.cache_entries is not None else fragments + DEFAULT_MAX_ENTRIES)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
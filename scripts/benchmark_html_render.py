@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+HTML Render Benchmark
+
+Times render_html() on report-data.json with its row-level sections
+(attainment, funnel, loss, pipeline RCA, ...) replicated 1x, 10x, 100x and
+1000x, and reports time per rendered row so linear scaling is easy to see.
+It checks that file and in-memory rendering produce byte-identical output.
+
+The "+= model" column is an estimate, not a measurement of the old
+renderer: the streaming time plus the time to join the same fragments with
+html += chunk, which is what the old renderer did on top of formatting.
+With --baseline REV, generate_html_report.py as of a git revision is timed
+on the same data as well. Only that file is taken from the revision; its
+imports of sibling modules (report_models, ...) resolve to the working
+tree, and a revision whose renderer cannot read the data is reported as an
+error.
+
+Usage:
+    python scripts/benchmark_html_render.py
+    python scripts/benchmark_html_render.py --scales 1,10,100 --repeat 5
+    python scripts/benchmark_html_render.py --scales 1,10,100 --baseline REV
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+from generate_html_report import render_html
+
+
+# Sections rendered row-by-row; these are the ones replicated when scaling
+ROW_SECTIONS = (
+    "attainment_detail", "funnel_pacing", "funnel_health", "funnel_rca_insights",
+    "funnel_trends", "loss_reason_rca", "loss_reasons", "pipeline_rca", "trend_rca",
+    "wins_bright_spots", "momentum_indicators", "google_ads", "top_risk_pockets",
+    "won_deals", "lost_deals", "pipeline_deals",
+)
+
+
+def scale_report(data, factor):
+    """Return a copy of data with every row-level section repeated `factor` times."""
+    scaled = dict(data)
+    for section in ROW_SECTIONS:
+        value = data.get(section)
+        if isinstance(value, list):
+            scaled[section] = value * factor
+        elif isinstance(value, dict):
+            scaled[section] = {
+                key: rows * factor if isinstance(rows, list) else rows
+                for key, rows in value.items()
+            }
+    return scaled
+
+
+def count_rows(data):
+    """Count the rows in the row-level sections."""
+    total = 0
+    for section in ROW_SECTIONS:
+        value = data.get(section)
+        if isinstance(value, list):
+            total += len(value)
+        elif isinstance(value, dict):
+            total += sum(len(rows) for rows in value.values() if isinstance(rows, list))
+    return total
+
+
+class _ChunkRecorder:
+    """Text sink that keeps every written fragment."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
+        return len(text)
+
+
+def _join_with_concat(chunks):
+    html = ""
+    for chunk in chunks:
+        html += chunk
+    return html
+
+
+def load_baseline(revision):
+    """
+    Import generate_html_report.py as of a git revision and return a function
+    rendering data to a string with it. Raises RuntimeError if git fails.
+    """
+    scripts_dir = Path(__file__).parent
+    path = f"{revision}:scripts/generate_html_report.py"
+    result = subprocess.run(["git", "show", path], cwd=scripts_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git show {path} failed: {result.stderr.strip()}")
+
+    module = types.ModuleType(f"generate_html_report@{revision}")
+    module.__file__ = str(scripts_dir / "generate_html_report.py")
+    exec(compile(result.stdout, path, "exec"), module.__dict__)
+
+    if hasattr(module, "render_html"):
+        def render(data):
+            buffer = io.StringIO()
+            module.render_html(data, buffer)
+            return buffer.getvalue()
+        return render
+    # Before streaming, the whole page was returned as one string
+    return module.generate_html
+
+
+def _best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(data, scales, repeat, baseline=None):
+    """
+    Print the benchmark table. Returns False if outputs differ between sinks.
+
+    baseline is an optional (label, render function) pair timed on the same data.
+    """
+    print("=" * 78)
+    print("HTML RENDER BENCHMARK (best of {})".format(repeat))
+    if baseline is not None:
+        print(f"Baseline: generate_html_report.py at {baseline[0]}")
+    print("=" * 78)
+    print(f"{'Scale':>6} {'Rows':>8} {'Output':>12} {'Stream':>10} {'File':>10} {'+= model':>10} "
+          f"{'Baseline' if baseline is not None else '':>10} {'us/row':>8}")
+
+    identical = True
+    tmp_dir = tempfile.mkdtemp(prefix="render-bench-")
+    for factor in scales:
+        scaled = scale_report(data, factor)
+        rows = count_rows(scaled)
+
+        recorder = _ChunkRecorder()
+        render_html(scaled, recorder)
+
+        def to_string():
+            buffer = io.StringIO()
+            render_html(scaled, buffer)
+            return buffer.getvalue()
+
+        file_path = os.path.join(tmp_dir, f"report-{factor}.html")
+
+        def to_file():
+            with open(file_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+                render_html(scaled, f)
+
+        stream_s = _best_of(repeat, to_string)
+        file_s = _best_of(repeat, to_file)
+        # Estimate only: the same fragments joined with html += chunk on top of streaming
+        model_s = stream_s + _best_of(repeat, lambda: _join_with_concat(recorder.chunks))
+        baseline_ms = ""
+        if baseline is not None:
+            try:
+                baseline_ms = f"{_best_of(repeat, lambda: baseline[1](scaled)) * 1000:>8.1f}ms"
+            except Exception as e:
+                raise RuntimeError(f"baseline renderer at {baseline[0]} failed: {type(e).__name__}: {e}")
+
+        output = to_string()
+        with open(file_path, "r", encoding="utf-8") as f:
+            if f.read() != output or "".join(recorder.chunks) != output:
+                identical = False
+
+        print(f"{factor:>5}x {rows:>8,} {len(output):>11,}B {stream_s * 1000:>8.1f}ms "
+              f"{file_s * 1000:>8.1f}ms {model_s * 1000:>8.1f}ms {baseline_ms:>10} {stream_s / rows * 1e6:>8.1f}")
+
+    print("=" * 78)
+    print(f"Byte-identical across sinks: {identical}")
+    return identical
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark HTML report rendering at increasing row counts")
+    parser.add_argument("--data", default=str(Path(__file__).parent.parent / "data" / "report-data.json"))
+    parser.add_argument("--scales", default="1,10,100,1000", help="Comma-separated scale factors")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", metavar="REV",
+                        help="Also time generate_html_report.py as of this git revision")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as f:
+        data = json.load(f)
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    try:
+        baseline = (args.baseline, load_baseline(args.baseline)) if args.baseline else None
+        return 0 if run(data, scales, args.repeat, baseline) else 1
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Python Pipeline Benchmark Suite
+
+Times the report pipeline end to end on data/report-data.json and on
+synthetic copies with every row-level section (deal lists, funnel,
+attainment, RCA, ...) replicated 10x and 100x (1000x on request; it needs
+several GB of memory):
+
+    parse          parse_query_output() on bq --format=json output
+    save_data      save_data() into a scratch directory (snapshot publish,
+                   report + section index, deal indexes, delta)
+    generate_html  render_html() into memory, no render cache
+    print_summary  print_summary() on the parsed dict and on the lazy,
+                   index-backed ReportData
+
+Each case records the best wall time over --repeat runs and the peak Python
+heap (tracemalloc) of one extra run. --save-baseline stores the results;
+later runs compare against the stored baseline and exit non-zero if any case
+is slower or uses more memory than the thresholds allow. Baselines are
+machine-specific and are not committed.
+
+Usage:
+    python scripts/benchmark_suite.py                       # compare to baseline
+    python scripts/benchmark_suite.py --save-baseline
+    python scripts/benchmark_suite.py --scales 1,10 --cases parse,generate_html
+    python scripts/benchmark_suite.py --scales 1000 --repeat 1
+    python scripts/benchmark_suite.py --time-threshold 0.5 --memory-threshold 0.2
+"""
+
+import argparse
+import contextlib
+import copy
+import importlib.util
+import io
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmark_html_render import count_rows, scale_report
+from generate_html_report import render_html
+from report_data import ReportData, write_report
+
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_PATH = SCRIPT_DIR.parent / "data" / "report-data.json"
+BASELINE_PATH = SCRIPT_DIR / "benchmark-baseline.json"
+
+DEFAULT_SCALES = (1, 10, 100)
+CASES = ("parse", "save_data", "generate_html", "print_summary")
+
+# Regressions smaller than this are treated as timer noise
+MIN_TIME_DELTA_S = 0.02
+MIN_MEMORY_DELTA_B = 256 * 1024
+
+
+def _load_generate_data():
+    """Import scripts/generate-data.py (its file name is not a valid module name)."""
+    spec = importlib.util.spec_from_file_location("generate_data", SCRIPT_DIR / "generate-data.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _measure(fn, repeat):
+    """Return (best seconds, peak traced bytes) for fn()."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _case_functions(generate_data, data, scratch):
+    """Return {case: fn} for one dataset; fns write only under scratch."""
+    stdout = json.dumps([{"comprehensive_risk_analysis_json": json.dumps(data)}])
+
+    report_path = scratch / "summary" / "report-data.json"
+    write_report(report_path, data)
+
+    save_dir = scratch / "save"
+    save_dir.mkdir()
+
+    def save():
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_data.save_data(copy.copy(data), save_dir)
+
+    # Publish one generation up front so every timed save also writes a delta
+    save()
+
+    def summary():
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_data.print_summary(data)
+            with ReportData(report_path) as lazy:
+                generate_data.print_summary(lazy)
+
+    return {
+        "parse": lambda: generate_data.parse_query_output(stdout),
+        "save_data": save,
+        "generate_html": lambda: render_html(data, io.StringIO()),
+        "print_summary": summary,
+    }
+
+
+def run_suite(data, scales, cases, repeat):
+    """Run every case at every scale. Returns {"<case>@<scale>x": result}."""
+    generate_data = _load_generate_data()
+    results = {}
+    for factor in scales:
+        scaled = scale_report(data, factor)
+        rows = count_rows(scaled)
+        # Big datasets are slow enough that one timed run is representative
+        case_repeat = repeat if rows < 100_000 else 1
+        scratch = Path(tempfile.mkdtemp(prefix="bench-suite-"))
+        try:
+            functions = _case_functions(generate_data, scaled, scratch)
+            for case in cases:
+                seconds, peak = _measure(functions[case], case_repeat)
+                key = f"{case}@{factor}x"
+                results[key] = {"rows": rows, "seconds": seconds, "peak_bytes": peak}
+                print(f"  {key:<22} {rows:>10,} rows {seconds * 1000:>10.1f} ms {peak / 1e6:>9.1f} MB", flush=True)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, time_threshold, memory_threshold):
+    """Print the comparison against baseline. Returns the list of regressed case keys."""
+    regressions = []
+    print(f"\n{'Case':<22} {'Time':>10} {'Baseline':>10} {'Change':>8} {'Peak MB':>9} {'Baseline':>9} {'Change':>8}")
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<22} {result['seconds'] * 1000:>8.1f}ms {'-':>10} {'new':>8}")
+            continue
+        time_change = result["seconds"] / base["seconds"] - 1 if base["seconds"] else 0
+        mem_change = result["peak_bytes"] / base["peak_bytes"] - 1 if base["peak_bytes"] else 0
+        slower = (time_change > time_threshold
+                  and result["seconds"] - base["seconds"] > MIN_TIME_DELTA_S)
+        bigger = (mem_change > memory_threshold
+                  and result["peak_bytes"] - base["peak_bytes"] > MIN_MEMORY_DELTA_B)
+        flag = "  REGRESSION" if slower or bigger else ""
+        if flag:
+            regressions.append(key)
+        print(f"{key:<22} {result['seconds'] * 1000:>8.1f}ms {base['seconds'] * 1000:>8.1f}ms {time_change:>+7.0%} "
+              f"{result['peak_bytes'] / 1e6:>9.1f} {base['peak_bytes'] / 1e6:>9.1f} {mem_change:>+7.0%}{flag}")
+    return regressions
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline and gate on regressions")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Comma-separated scale factors")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated cases ({', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (best is kept)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.25,
+                        help="Allowed slowdown as a fraction of the baseline (default: 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="Allowed peak memory growth as a fraction of the baseline (default: 0.10)")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        print(f"Error: unknown case(s): {', '.join(unknown)}")
+        return 1
+
+    with open(args.data, "r") as f:
+        data = json.load(f)
+    scales = [int(s) for s in args.scales.split(",") if s]
+
+    print("=" * 78)
+    print(f"PIPELINE BENCHMARK SUITE (Python {platform.python_version()}, {platform.machine()})")
+    print("=" * 78)
+    results = run_suite(data, scales, cases, args.repeat)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }, indent=2))
+        print(f"\nBaseline saved to: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one.")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())["results"]
+    regressions = compare(results, baseline, args.time_threshold, args.memory_threshold)
+    print("=" * 78)
+    if regressions:
+        print(f"FAILED: {len(regressions)} case(s) regressed: {', '.join(regressions)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
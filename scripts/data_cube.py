@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Report Data Cube
+
+Materializes additive measures for every product x region x category x
+source x week cell, plus every rollup (any dimension replaced by "ALL"), so
+any filter combination is answered by cube lookups and ratios are derived
+afterwards:
+
+    won_acv, won_deals          won deals, by close week
+    lost_acv, lost_deals        lost deals, by close week
+    pipeline_acv, pipeline_deals
+                                open deals, by expected close week
+    mql, sql, sal, sqo          quarter-to-date funnel actuals (funnel_by_source)
+    q1_target                   SOP Q1 target (see below)
+
+Weeks start on Monday and are keyed by that date. Missing regions,
+categories and sources are keyed as "". The funnel actuals are
+quarter-to-date totals, so like targets they only appear in week=ALL cells.
+Targets are quarterly and are set by the query at two grains:
+segment targets (attainment_detail) roll up wherever source=ALL, and source
+targets (source_attainment) wherever category=ALL and source is set.
+
+The cube is written next to report-data.json as a compact sidecar:
+
+    {"dimensions": [...], "measures": [...], "cells": [[dim..., measure...], ...]}
+
+Usage:
+    python scripts/data_cube.py                            # build the sidecar
+    python scripts/data_cube.py --filter product=POR --filter region=AMER --filter region=EMEA
+    python scripts/data_cube.py --filter category="NEW LOGO" --by week
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from aggregation_engine import safe_divide, sql_round
+
+
+CUBE_PATH = Path(__file__).parent.parent / "data" / "report-data.cube.json"
+ALL = "ALL"
+
+DIMENSIONS = ("product", "region", "category", "source", "week")
+MEASURES = (
+    "won_acv", "won_deals", "lost_acv", "lost_deals", "pipeline_acv", "pipeline_deals",
+    "mql", "sql", "sal", "sqo", "q1_target",
+)
+ACV_MEASURES = ("won_acv", "lost_acv", "pipeline_acv", "q1_target")
+
+# section -> (acv measure, count measure)
+DEAL_SECTIONS = {
+    "won_deals": ("won_acv", "won_deals"),
+    "lost_deals": ("lost_acv", "lost_deals"),
+    "pipeline_deals": ("pipeline_acv", "pipeline_deals"),
+}
+# measure -> funnel_by_source field (the *_details lists carry no usable stage rows)
+FUNNEL_MEASURES = {"mql": "actual_mql", "sql": "actual_sql", "sal": "actual_sal", "sqo": "actual_sqo"}
+_MEASURE_INDEX = {measure: i for i, measure in enumerate(MEASURES)}
+_TARGET = _MEASURE_INDEX["q1_target"]
+
+
+def week_of(iso_date):
+    """Monday of the week containing iso_date, or None when there is no date."""
+    if not iso_date:
+        return None
+    day = date.fromisoformat(iso_date[:10])
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def _rollups(key, fixed=()):
+    """
+    Every key obtained by replacing a subset of dimensions with ALL.
+
+    Positions in `fixed` are kept as they are (a None week can only be ALL).
+    """
+    options = [(value,) if i in fixed else (value, ALL) for i, value in enumerate(key)]
+    return itertools.product(*options)
+
+
+def build_cube(data):
+    """Return {(product, region, category, source, week): [measure values]}."""
+    cells = {}
+
+    def add(key, measure, value):
+        fixed = ()
+        if key[4] is None:
+            key, fixed = key[:4] + (ALL,), (4,)
+        index = _MEASURE_INDEX[measure]
+        for cell in _rollups(key, fixed):
+            values = cells.get(cell)
+            if values is None:
+                values = cells[cell] = [0] * len(MEASURES)
+            values[index] += value
+
+    for section, (acv_measure, count_measure) in DEAL_SECTIONS.items():
+        for product, deals in (data.get(section) or {}).items():
+            for deal in deals:
+                key = (deal.get("product") or product, deal.get("region") or "", deal.get("category") or "",
+                       deal.get("source") or "", week_of(deal.get("close_date")))
+                add(key, acv_measure, deal.get("acv") or 0)
+                add(key, count_measure, 1)
+
+    # Funnel actuals: quarter-to-date, so week=ALL only
+    for product, rows in (data.get("funnel_by_source") or {}).items():
+        for row in rows:
+            key = (row.get("product") or product, row.get("region") or "", row.get("category") or "",
+                   row.get("source") or "", None)
+            for measure, field in FUNNEL_MEASURES.items():
+                add(key, measure, row.get(field) or 0)
+
+    # Segment targets: every rollup that keeps source=ALL and week=ALL
+    for rows in (data.get("attainment_detail") or {}).values():
+        for row in rows:
+            key = (row["product"], row["region"] or "", row["category"] or "", ALL, ALL)
+            for cell in _rollups(key, fixed=(3, 4)):
+                cells.setdefault(cell, [0] * len(MEASURES))[_TARGET] += row.get("q1_target") or 0
+    # Source targets: category=ALL, source set, week=ALL
+    for rows in (data.get("source_attainment") or {}).values():
+        for row in rows:
+            key = (row["product"], row["region"] or "", ALL, row["source"] or "", ALL)
+            for cell in _rollups(key, fixed=(2, 3, 4)):
+                cells.setdefault(cell, [0] * len(MEASURES))[_TARGET] += row.get("q1_target") or 0
+
+    for values in cells.values():
+        for i, measure in enumerate(MEASURES):
+            if measure in ACV_MEASURES:
+                values[i] = sql_round(values[i], 2)
+    return cells
+
+
+def encode_cube(cells, data=None):
+    """Return the sidecar document for a cube."""
+    return {
+        "generated_at_utc": (data or {}).get("generated_at_utc"),
+        "period": (data or {}).get("period"),
+        "dimensions": list(DIMENSIONS),
+        "measures": list(MEASURES),
+        "cells": [list(key) + values for key, values in sorted(cells.items())],
+    }
+
+
+def decode_cube(document):
+    """Inverse of encode_cube: {key tuple: [measure values]}."""
+    width = len(document["dimensions"])
+    return {tuple(row[:width]): row[width:] for row in document["cells"]}
+
+
+def write_cube(data, path=CUBE_PATH):
+    """Write the cube sidecar compactly. Returns its size in bytes."""
+    from snapshot_store import atomic_write
+
+    payload = json.dumps(encode_cube(build_cube(data), data), separators=(",", ":")).encode("utf-8")
+    atomic_write(path, payload)
+    return len(payload)
+
+
+def load_cube(path=CUBE_PATH, data=None):
+    """Load the sidecar; if data is given, reject a cube built for another run."""
+    with open(path, "r") as f:
+        document = json.load(f)
+    if data is not None and document.get("generated_at_utc") != data.get("generated_at_utc"):
+        raise ValueError(
+            f"Cube was built for {document.get('generated_at_utc')}, "
+            f"report is {data.get('generated_at_utc')}"
+        )
+    return document
+
+
+def lookup(cells, **filters):
+    """
+    Return {measure: total} for a filter combination.
+
+    Each filter maps a dimension to a list of accepted values (OR within a
+    dimension, AND across dimensions); a missing or empty list means ALL.
+    Multi-value filters sum one cell per value combination.
+    """
+    choices = [filters.get(dim) or [ALL] for dim in DIMENSIONS]
+    totals = [0] * len(MEASURES)
+    for key in itertools.product(*choices):
+        values = cells.get(key)
+        if values:
+            totals = [a + b for a, b in zip(totals, values)]
+    return {measure: sql_round(total, 2) if measure in ACV_MEASURES else total
+            for measure, total in zip(MEASURES, totals)}
+
+
+def _pct(numerator, denominator):
+    ratio = safe_divide(numerator, denominator)
+    return sql_round(ratio * 100, 1) if ratio is not None else None
+
+
+def derive(totals, period):
+    """Ratios from looked-up totals, with the query's formulas."""
+    qtd_target = sql_round(totals["q1_target"] * period["days_elapsed"] / period["total_days"], 2)
+    closed = totals["won_deals"] + totals["lost_deals"]
+    return {
+        "qtd_target": qtd_target,
+        "qtd_attainment_pct": _pct(totals["won_acv"], qtd_target),
+        "qtd_gap": sql_round(totals["won_acv"] - qtd_target, 2),
+        "pipeline_coverage_x": sql_round(safe_divide(totals["pipeline_acv"], totals["q1_target"] - totals["won_acv"]), 1),
+        "win_rate_pct": _pct(totals["won_deals"], closed),
+        "mql_to_sql_pct": _pct(totals["sql"], totals["mql"]),
+        "sql_to_sqo_pct": _pct(totals["sqo"], totals["sql"]),
+    }
+
+
+def breakdown(cells, by, **filters):
+    """Return [(value, totals)] for every value of dimension `by` under the filters."""
+    index = DIMENSIONS.index(by)
+    values = sorted({key[index] for key in cells if key[index] != ALL})
+    rows = []
+    for value in values:
+        totals = lookup(cells, **dict(filters, **{by: [value]}))
+        if any(totals.values()):
+            rows.append((value, totals))
+    return rows
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Build or query the report data cube")
+    parser.add_argument("--report", default=str(Path(__file__).parent.parent / "data" / "report-data.json"))
+    parser.add_argument("--filter", action="append", default=[], metavar="DIM=VALUE",
+                        help="Filter on a dimension (repeat for more values/dimensions)")
+    parser.add_argument("--by", choices=DIMENSIONS, help="Break the result down by this dimension")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    with open(args.report, "r") as f:
+        data = json.load(f)
+
+    if not args.filter and not args.by:
+        size = write_cube(data)
+        print(f"Data cube saved to: {CUBE_PATH} ({size:,} bytes)")
+        return 0
+
+    filters = {}
+    for item in args.filter:
+        dim, _, value = item.partition("=")
+        if dim not in DIMENSIONS:
+            print(f"Error: unknown dimension {dim!r} (expected one of {', '.join(DIMENSIONS)})")
+            return 1
+        filters.setdefault(dim, []).append(value)
+
+    cells = build_cube(data)
+    if args.by:
+        print(f"{args.by:<14} {'Won ACV':>14} {'Won':>5} {'Lost':>5} {'Pipeline ACV':>14} {'MQL':>6} {'SQL':>6}")
+        for value, totals in breakdown(cells, args.by, **filters):
+            print(f"{value or '-':<14} {totals['won_acv']:>14,.2f} {totals['won_deals']:>5} {totals['lost_deals']:>5} "
+                  f"{totals['pipeline_acv']:>14,.2f} {totals['mql']:>6} {totals['sql']:>6}")
+        return 0
+
+    totals = lookup(cells, **filters)
+    for name, value in list(totals.items()) + list(derive(totals, data["period"]).items()):
+        print(f"{name:<20} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Deal List Indexes
+
+Precomputes secondary indexes for won_deals, lost_deals and pipeline_deals so
+filtering and sorting no longer require scanning the deal arrays:
+
+    postings  for each dimension (region, category, source, owner_name,
+              stage, deal_type) and value, the ascending positions of the
+              deals in that product's list
+    orders    permutation arrays for the common sort orders (ACV and close
+              date, ascending and descending)
+
+Filtering becomes a union of posting lists within a dimension and an
+intersection across dimensions; sorting becomes walking a permutation.
+Positions refer to the deal lists in the report-data.json written in the
+same run; the sidecar records generated_at_utc so stale indexes are detected.
+
+Usage:
+    python scripts/deal_indexes.py                       # build the sidecar
+    python scripts/deal_indexes.py --section pipeline_deals --product POR \
+        --filter region=AMER --filter stage=Discovery --order acv_desc
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+DEAL_SECTIONS = ("won_deals", "lost_deals", "pipeline_deals")
+
+INDEX_DIMENSIONS = ("region", "category", "source", "owner_name", "stage", "deal_type")
+
+INDEX_PATH = Path(__file__).parent.parent / "data" / "report-data.deal-index.json"
+
+
+def _acv(deal):
+    return deal.get("acv") or 0
+
+
+def _sort_orders(deals):
+    """Return the permutation arrays for the common sort orders."""
+    positions = range(len(deals))
+    dated = [i for i in positions if deals[i].get("close_date")]
+    undated = [i for i in positions if not deals[i].get("close_date")]
+    by_date = sorted(dated, key=lambda i: deals[i]["close_date"])
+    # sorted() is stable, so ties keep list order in both directions
+    return {
+        "acv_desc": sorted(positions, key=lambda i: -_acv(deals[i])),
+        "acv_asc": sorted(positions, key=lambda i: _acv(deals[i])),
+        "close_date_asc": by_date + undated,
+        "close_date_desc": sorted(dated, key=lambda i: deals[i]["close_date"], reverse=True) + undated,
+    }
+
+
+def _postings(deals):
+    """Return {dimension: {value: [positions]}} for one deal list."""
+    postings = {dim: {} for dim in INDEX_DIMENSIONS}
+    for i, deal in enumerate(deals):
+        for dim in INDEX_DIMENSIONS:
+            value = deal.get(dim)
+            if value is None:
+                value = ""
+            postings[dim].setdefault(value, []).append(i)
+    return postings
+
+
+def build_deal_indexes(data):
+    """Build posting lists and sort permutations for every deal section and product."""
+    sections = {}
+    for section in DEAL_SECTIONS:
+        sections[section] = {}
+        for product, deals in data.get(section, {}).items():
+            sections[section][product] = {
+                "count": len(deals),
+                "postings": _postings(deals),
+                "orders": _sort_orders(deals),
+            }
+    return {
+        "generated_at_utc": data.get("generated_at_utc"),
+        "dimensions": list(INDEX_DIMENSIONS),
+        "sections": sections,
+    }
+
+
+def write_deal_indexes(data, path=INDEX_PATH):
+    """Write the index sidecar compactly. Returns its size in bytes."""
+    from snapshot_store import atomic_write
+
+    payload = json.dumps(build_deal_indexes(data), separators=(",", ":")).encode("utf-8")
+    atomic_write(path, payload)
+    return len(payload)
+
+
+def select(index, section, product, filters=None, order=None):
+    """
+    Return deal positions matching filters, optionally in a presorted order.
+
+    filters maps a dimension to a list of accepted values (OR within a
+    dimension, AND across dimensions); an empty or missing list means "all".
+    """
+    entry = index["sections"][section][product]
+    selected = None
+    for dim, values in (filters or {}).items():
+        if not values:
+            continue
+        postings = entry["postings"][dim]
+        matches = set()
+        for value in values:
+            matches.update(postings.get(value, ()))
+        selected = matches if selected is None else selected & matches
+        if not selected:
+            return []
+
+    if order:
+        permutation = entry["orders"][order]
+        if selected is None:
+            return list(permutation)
+        return [i for i in permutation if i in selected]
+    if selected is None:
+        return list(range(entry["count"]))
+    return sorted(selected)
+
+
+def load_deal_indexes(path=INDEX_PATH, data=None):
+    """Load the sidecar; if data is given, reject an index built for another run."""
+    with open(path, "r") as f:
+        index = json.load(f)
+    if data is not None and index.get("generated_at_utc") != data.get("generated_at_utc"):
+        raise ValueError(
+            f"Deal index was built for {index.get('generated_at_utc')}, "
+            f"report is {data.get('generated_at_utc')}"
+        )
+    return index
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Build or query deal list indexes")
+    parser.add_argument("--report", default=str(Path(__file__).parent.parent / "data" / "report-data.json"))
+    parser.add_argument("--section", choices=DEAL_SECTIONS, help="Query this deal section instead of building")
+    parser.add_argument("--product", default="POR")
+    parser.add_argument("--filter", action="append", default=[], metavar="DIM=VALUE",
+                        help="Filter on a dimension (repeat for more values/dimensions)")
+    parser.add_argument("--order", choices=("acv_desc", "acv_asc", "close_date_asc", "close_date_desc"))
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    with open(args.report, "r") as f:
+        data = json.load(f)
+
+    if not args.section:
+        size = write_deal_indexes(data)
+        print(f"Deal indexes saved to: {INDEX_PATH} ({size:,} bytes)")
+        return 0
+
+    filters = {}
+    for item in args.filter:
+        dim, _, value = item.partition("=")
+        if dim not in INDEX_DIMENSIONS:
+            print(f"Error: unknown dimension '{dim}' (expected one of {', '.join(INDEX_DIMENSIONS)})")
+            return 1
+        filters.setdefault(dim, []).append(value)
+
+    index = build_deal_indexes(data)
+    deals = data[args.section][args.product]
+    for i in select(index, args.section, args.product, filters, args.order):
+        deal = deals[i]
+        print(f"{deal.get('close_date') or '':<12} ${_acv(deal):>12,.0f}  {deal.get('region', ''):<5} "
+              f"{deal.get('stage', ''):<16} {deal.get('account_name', '')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
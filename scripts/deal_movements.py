@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Deal Movement Change Feed
+
+Answers "what moved since yesterday" by diffing the deal lists
+(pipeline_deals, won_deals, lost_deals) of two report snapshots. The
+previous snapshot is reduced to one small tuple per opportunity_id (status,
+stage, close date, ACV, segment). Each deal of the new snapshot then probes
+that table once, and whatever is left over has dropped out. Time is linear
+in the number of deals, and only the old side's tuples are held in memory.
+
+Events (one deal can produce several):
+
+    new               first seen, open
+    won / lost        closed since the previous snapshot (or first seen closed)
+    reopened          was won or lost, is open again
+    stage_advance     moved to a later stage (by STAGE_WIN_PROBABILITY)
+    stage_regress     moved to an earlier stage
+    stage_change      stage changed, order unknown
+    close_date_push   expected close date moved later
+    close_date_pull   expected close date moved earlier
+    acv_change        ACV changed
+    dropped           open deal no longer listed (disqualified, re-scoped)
+
+Won and lost deals that are no longer listed have only aged out of the
+quarter-to-date window and produce no event.
+
+Per product x region x category segment, the feed sums new, won, lost, ACV
+change and slipped ACV. Slipped ACV is the ACV of open deals whose close
+date was pushed. slipped_out_acv is the part pushed past the quarter end.
+
+The feed is written next to report-data.json on every refresh:
+
+    {"base", "target", "totals": {...}, "segments": [...], "events": [...]}
+
+Usage:
+    python scripts/deal_movements.py                      # two newest snapshot generations
+    python scripts/deal_movements.py OLD.json NEW.json
+    python scripts/deal_movements.py OLD.json NEW.json -o movements.json --events 50
+"""
+
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from aggregation_engine import sql_round
+from monte_carlo_forecast import STAGE_WIN_PROBABILITY
+from snapshot_store import SNAPSHOT_ROOT, atomic_write_json, list_generations, load_generation
+
+
+MOVEMENTS_PATH = Path(__file__).parent.parent / "data" / "report-data.movements.json"
+
+DEAL_SECTIONS = (("pipeline_deals", "open"), ("won_deals", "won"), ("lost_deals", "lost"))
+SEGMENT_FIELDS = ("product", "region", "category")
+SEGMENT_MEASURES = (
+    "new_deals", "new_acv", "won_deals", "won_acv", "lost_deals", "lost_acv",
+    "stage_advances", "stage_regressions", "acv_change", "slipped_deals", "slipped_acv", "slipped_out_acv",
+)
+ACV_MEASURES = ("new_acv", "won_acv", "lost_acv", "acv_change", "slipped_acv", "slipped_out_acv")
+DEFAULT_EVENTS = 20
+
+# Compact per-deal record fields
+STATUS, STAGE, CLOSE_DATE, ACV, SEGMENT = range(5)
+
+
+def _record(deal, status):
+    return (status, deal.get("stage"), (deal.get("close_date") or "")[:10] or None,
+            deal.get("acv") or 0, tuple(deal.get(field) for field in SEGMENT_FIELDS))
+
+
+def iter_deals(data):
+    """Yield (opportunity_id, deal, status) for every deal in a report."""
+    for section, status in DEAL_SECTIONS:
+        for deals in (data.get(section) or {}).values():
+            for deal in deals:
+                if deal.get("opportunity_id"):
+                    yield deal["opportunity_id"], deal, status
+
+
+def index_deals(data):
+    """The build side of the join: {opportunity_id: compact record}."""
+    return {deal_id: _record(deal, status) for deal_id, deal, status in iter_deals(data)}
+
+
+def quarter_end(period):
+    return (date.fromisoformat(period["quarter_start"]) + timedelta(days=period["total_days"] - 1)).isoformat()
+
+
+def _event(kind, deal_id, record, **fields):
+    product, region, category = record[SEGMENT]
+    event = {"type": kind, "opportunity_id": deal_id, "product": product, "region": region,
+             "category": category, "stage": record[STAGE], "close_date": record[CLOSE_DATE], "acv": record[ACV]}
+    event.update(fields)
+    return event
+
+
+def _stage_event(old_stage, new_stage):
+    before, after = STAGE_WIN_PROBABILITY.get(old_stage), STAGE_WIN_PROBABILITY.get(new_stage)
+    if before is None or after is None or before == after:
+        return "stage_change"
+    return "stage_advance" if after > before else "stage_regress"
+
+
+def movements(old_index, new_data):
+    """
+    Diff a previous snapshot's deal index against a new report.
+
+    Yields events in probe order. old_index is consumed: the deals left in it
+    afterwards are those the new snapshot no longer lists.
+    """
+    end = quarter_end(new_data["period"])
+    for deal_id, deal, status in iter_deals(new_data):
+        record = _record(deal, status)
+        old = old_index.pop(deal_id, None)
+        if old is None:
+            yield _event("new" if status == "open" else status, deal_id, record)
+            continue
+        if old == record:
+            continue
+        if old[STATUS] != status:
+            if status == "open":
+                yield _event("reopened", deal_id, record, previous_status=old[STATUS])
+            else:
+                yield _event(status, deal_id, record, previous_stage=old[STAGE])
+            continue
+        if status != "open":
+            continue
+        if old[STAGE] != record[STAGE]:
+            yield _event(_stage_event(old[STAGE], record[STAGE]), deal_id, record, previous_stage=old[STAGE])
+        if old[CLOSE_DATE] and record[CLOSE_DATE] and old[CLOSE_DATE] != record[CLOSE_DATE]:
+            days = (date.fromisoformat(record[CLOSE_DATE]) - date.fromisoformat(old[CLOSE_DATE])).days
+            yield _event("close_date_push" if days > 0 else "close_date_pull", deal_id, record,
+                         previous_close_date=old[CLOSE_DATE], days=days,
+                         out_of_quarter=old[CLOSE_DATE] <= end < record[CLOSE_DATE])
+        if abs(record[ACV] - old[ACV]) > 0.005:
+            yield _event("acv_change", deal_id, record, previous_acv=old[ACV],
+                         delta=sql_round(record[ACV] - old[ACV], 2))
+
+    for deal_id, old in old_index.items():
+        if old[STATUS] == "open":
+            yield _event("dropped", deal_id, old)
+
+
+def _accumulate(segments, event):
+    key = (event["product"], event["region"], event["category"])
+    totals = segments.get(key)
+    if totals is None:
+        totals = segments[key] = dict.fromkeys(SEGMENT_MEASURES, 0)
+    kind = event["type"]
+    if kind in ("new", "won", "lost"):
+        totals[f"{kind}_deals"] += 1
+        totals[f"{kind}_acv"] += event["acv"]
+    elif kind == "stage_advance":
+        totals["stage_advances"] += 1
+    elif kind == "stage_regress":
+        totals["stage_regressions"] += 1
+    elif kind == "acv_change":
+        totals["acv_change"] += event["delta"]
+    elif kind == "close_date_push":
+        totals["slipped_deals"] += 1
+        totals["slipped_acv"] += event["acv"]
+        if event["out_of_quarter"]:
+            totals["slipped_out_acv"] += event["acv"]
+
+
+def change_feed(old_data, new_data):
+    """Return the change feed document from old_data to new_data."""
+    segments, events = {}, []
+    for event in movements(index_deals(old_data), new_data):
+        events.append(event)
+        _accumulate(segments, event)
+
+    rows = []
+    for key, totals in sorted(segments.items(), key=lambda item: tuple(v or "" for v in item[0])):
+        for measure in ACV_MEASURES:
+            totals[measure] = sql_round(totals[measure], 2)
+        rows.append(dict(zip(SEGMENT_FIELDS, key), **totals))
+    overall = {measure: sum(row[measure] for row in rows) for measure in SEGMENT_MEASURES}
+    for measure in ACV_MEASURES:
+        overall[measure] = sql_round(overall[measure], 2)
+    overall["events"] = len(events)
+
+    events.sort(key=lambda e: (e["type"], -(e["acv"] or 0), e["opportunity_id"]))
+    return {
+        "base": old_data.get("generated_at_utc"),
+        "target": new_data.get("generated_at_utc"),
+        "totals": overall,
+        "segments": rows,
+        "events": events,
+    }
+
+
+def write_movements(old_data, new_data, path=MOVEMENTS_PATH):
+    """Write the change feed between two reports. Returns the feed."""
+    feed = change_feed(old_data, new_data)
+    atomic_write_json(Path(path), feed)
+    return feed
+
+
+def print_feed(feed, limit=DEFAULT_EVENTS):
+    totals = feed["totals"]
+    print(f"Deal movements {feed['base']} -> {feed['target']}: {totals['events']} events")
+    print(f"  New {totals['new_deals']} (${totals['new_acv']:,.0f})  Won {totals['won_deals']} "
+          f"(${totals['won_acv']:,.0f})  Lost {totals['lost_deals']} (${totals['lost_acv']:,.0f})")
+    print(f"  Stage advances {totals['stage_advances']}, regressions {totals['stage_regressions']}, "
+          f"ACV change ${totals['acv_change']:,.0f}")
+    print(f"  Slipped {totals['slipped_deals']} deals (${totals['slipped_acv']:,.0f}, "
+          f"${totals['slipped_out_acv']:,.0f} out of quarter)")
+
+    slipped = sorted((row for row in feed["segments"] if row["slipped_acv"]), key=lambda row: -row["slipped_acv"])
+    if slipped:
+        print("\nSlipped ACV by segment:")
+        for row in slipped:
+            name = " / ".join(str(row[field]) for field in SEGMENT_FIELDS)
+            print(f"  {name:<32} {row['slipped_deals']:>4} deals  ${row['slipped_acv']:>12,.0f}  "
+                  f"(${row['slipped_out_acv']:,.0f} out of quarter)")
+
+    if limit and feed["events"]:
+        largest = sorted(feed["events"], key=lambda e: -(e["acv"] or 0))[:limit]
+        print(f"\nLargest {len(largest)} movements:")
+        for event in largest:
+            detail = ""
+            if "previous_stage" in event and event["type"].startswith("stage"):
+                detail = f"{event['previous_stage']} -> {event['stage']}"
+            elif "days" in event:
+                detail = f"{event['previous_close_date']} -> {event['close_date']} ({event['days']:+d} days)"
+            elif "delta" in event:
+                detail = f"{event['delta']:+,.2f}"
+            print(f"  {event['type']:<16} {event['opportunity_id']:<20} {event['product']:<5} "
+                  f"{event['region'] or '-':<5} ${event['acv']:>12,.0f}  {detail}")
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Deal movements between two report snapshots")
+    parser.add_argument("old", nargs="?", help="Previous report (default: the second newest generation)")
+    parser.add_argument("new", nargs="?", help="New report (default: the newest generation)")
+    parser.add_argument("--snapshots", default=str(SNAPSHOT_ROOT))
+    parser.add_argument("-o", "--output", help="Write the change feed here as JSON")
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="Events to print (0 for none)")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    if args.old and args.new:
+        with open(args.old, "r") as f:
+            old = json.load(f)
+        with open(args.new, "r") as f:
+            new = json.load(f)
+    elif args.old or args.new:
+        print("Error: give both OLD and NEW reports, or neither to use the snapshot generations")
+        return 1
+    else:
+        generations = list_generations(args.snapshots)
+        if len(generations) < 2:
+            print(f"Error: need two snapshot generations under {args.snapshots}, found {len(generations)}")
+            return 1
+        old = load_generation(generations[-2], args.snapshots)
+        new = load_generation(generations[-1], args.snapshots)
+
+    feed = write_movements(old, new, args.output) if args.output else change_feed(old, new)
+    print_feed(feed, args.events)
+    if args.output:
+        print(f"\nChange feed saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Fake bq Command
+
+Stands in for `bq query --format=json` so the generator scripts can be run,
+load-tested and benchmarked end to end without network access or Google
+Cloud credentials. The SQL is read from stdin like the real command; the
+result column is taken from its final `AS <name>_json` alias, and the single
+result row is either replayed from a JSON file or synthesized at the
+requested scale (scripts/synthetic_data.py). The per-percentile SOP targets
+query (sop_targets_json) is answered from that same report, with its targets
+as P50, and the daily funnel counts query (daily_funnel_json) by spreading
+its funnel actuals over the elapsed days. The trend analysis query
+(trend_analysis_json) is synthesized from the deal lists and daily funnel
+counts of a synthetic report, for the windows and filters substituted into
+its SQL.
+
+Behavior is configured through environment variables:
+
+    FAKE_BQ_DATA          JSON file to replay (default: synthesize)
+    FAKE_BQ_DEALS         synthetic pipeline deals per product (default: 250)
+    FAKE_BQ_DETAILS       synthetic MQL detail rows per product (default: 0)
+    FAKE_BQ_PRODUCTS      comma-separated products (default: POR,R360)
+    FAKE_BQ_REGIONS       comma-separated regions (default: AMER,EMEA,APAC)
+    FAKE_BQ_SEED          synthetic data seed (default: 42)
+    FAKE_BQ_LATENCY       seconds to wait before answering, or a MIN-MAX range
+    FAKE_BQ_FAILURE_RATE  probability (0-1) that the query fails
+    FAKE_BQ_FAIL_MODE     error (stderr, exit 1), empty ([]), garbage
+                          (truncated JSON) or timeout (hangs) (default: error)
+
+Usage:
+    python scripts/fake_bq.py --install /tmp/fakebin
+    PATH=/tmp/fakebin:$PATH FAKE_BQ_DEALS=20000 FAKE_BQ_LATENCY=2-5 \\
+        python scripts/generate-data.py
+    python scripts/fake_bq.py query --format=json < sql/reports/query_comprehensive_risk_analysis.sql
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import stat
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from synthetic_data import (PRODUCTS, REGIONS, generate_daily_funnel, generate_report, generate_sop_targets,
+                            generate_trend_analysis)
+
+
+DEFAULT_COLUMN = "comprehensive_risk_analysis_json"
+SOP_TARGETS_COLUMN = "sop_targets_json"
+DAILY_FUNNEL_COLUMN = "daily_funnel_json"
+TREND_ANALYSIS_COLUMN = "trend_analysis_json"
+FAIL_MODES = ("error", "empty", "garbage", "timeout")
+
+
+def result_column(sql):
+    """Return the result column name aliased at the end of the query."""
+    aliases = re.findall(r"\bAS\s+(\w+_json)\b", sql, re.IGNORECASE)
+    return aliases[-1] if aliases else DEFAULT_COLUMN
+
+
+def parse_latency(value):
+    """Return seconds to sleep for "SECONDS" or "MIN-MAX" (uniformly drawn)."""
+    if not value:
+        return 0.0
+    low, _, high = value.partition("-")
+    return random.uniform(float(low), float(high)) if high else float(low)
+
+
+def trend_params(sql, report):
+    """
+    Return the trend query's windows and filters from its substituted parameters.
+
+    Parameters still left as @names default to the report's trailing two weeks
+    and all of its products and regions.
+    """
+    dates = dict((name, value) for value, name in re.findall(r"DATE\('([\d-]+)'\)\s+AS\s+(\w+)", sql))
+    filters = dict((name, value) for value, name in re.findall(r"SPLIT\('([^']*)',\s*','\)\s+AS\s+(\w+)", sql))
+    end = date.fromisoformat(report["period"]["as_of_date"])
+    return {
+        "current": (dates.get("current_start", (end - timedelta(days=6)).isoformat()),
+                    dates.get("current_end", end.isoformat())),
+        "previous": (dates.get("prev_start", (end - timedelta(days=13)).isoformat()),
+                     dates.get("prev_end", (end - timedelta(days=7)).isoformat())),
+        "products": tuple(p for p in filters.get("product_filter", ",".join(PRODUCTS)).split(",") if p),
+        "regions": tuple(r for r in filters.get("region_filter", ",".join(REGIONS)).split(",") if r),
+    }
+
+
+def build_payload(column, env, sql=""):
+    """Return the inner JSON document for the result row."""
+    replay = env.get("FAKE_BQ_DATA")
+    if column in (SOP_TARGETS_COLUMN, DAILY_FUNNEL_COLUMN):
+        report = json.loads(Path(replay).read_text()) if replay else json.loads(build_payload(DEFAULT_COLUMN, env))
+        if column == SOP_TARGETS_COLUMN:
+            return json.dumps(generate_sop_targets(report))
+        return json.dumps(generate_daily_funnel(report))
+    if replay:
+        return Path(replay).read_text()
+    if column == TREND_ANALYSIS_COLUMN:
+        report = json.loads(build_payload(DEFAULT_COLUMN, env))
+        return json.dumps(generate_trend_analysis(report, **trend_params(sql, report)))
+    if column != DEFAULT_COLUMN:
+        raise ValueError(f"no synthetic data for {column}; set FAKE_BQ_DATA to a file to replay")
+    report = generate_report(
+        seed=int(env.get("FAKE_BQ_SEED", "42")),
+        products=tuple(p for p in env.get("FAKE_BQ_PRODUCTS", ",".join(PRODUCTS)).split(",") if p),
+        regions=tuple(r for r in env.get("FAKE_BQ_REGIONS", ",".join(REGIONS)).split(",") if r),
+        deals=int(env.get("FAKE_BQ_DEALS", "250")),
+        details=int(env.get("FAKE_BQ_DETAILS", "0")),
+    )
+    return json.dumps(report)
+
+
+def run_query(sql, env, stdout, stderr):
+    """Answer one query like `bq query --format=json`. Returns the exit code."""
+    time.sleep(parse_latency(env.get("FAKE_BQ_LATENCY")))
+
+    if random.random() < float(env.get("FAKE_BQ_FAILURE_RATE", "0")):
+        mode = env.get("FAKE_BQ_FAIL_MODE", "error")
+        if mode == "empty":
+            stdout.write("[]")
+            return 0
+        if mode == "garbage":
+            stdout.write('[{"' + DEFAULT_COLUMN + '": "{\\"generated_at')
+            return 0
+        if mode == "timeout":
+            while True:
+                time.sleep(60)
+        stderr.write("BigQuery error in query operation: Error processing job: "
+                     "Internal error encountered. (injected by fake_bq)\n")
+        return 1
+
+    column = result_column(sql)
+    try:
+        payload = build_payload(column, env, sql)
+    except (OSError, ValueError) as e:
+        stderr.write(f"fake_bq: {e}\n")
+        return 1
+    stdout.write(json.dumps([{column: payload}]))
+    return 0
+
+
+def install(directory):
+    """Write an executable `bq` shim into directory that runs this script."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    shim = directory / "bq"
+    shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{Path(__file__).resolve()}" "$@"\n')
+    shim.chmod(shim.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return shim
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Fake `bq` command for offline load testing")
+    parser.add_argument("command", nargs="?", help="bq subcommand (only `query` is supported)")
+    parser.add_argument("--install", metavar="DIR", help="Write a `bq` shim into DIR and exit")
+    args, _bq_flags = parser.parse_known_args()
+
+    if args.install:
+        shim = install(args.install)
+        print(f"Installed {shim}; put {shim.parent} first on PATH to use it")
+        return 0
+    if args.command != "query":
+        sys.stderr.write(f"fake_bq: unsupported command {args.command!r}\n")
+        return 1
+    if os.environ.get("FAKE_BQ_FAIL_MODE", "error") not in FAIL_MODES:
+        sys.stderr.write(f"fake_bq: FAKE_BQ_FAIL_MODE must be one of {', '.join(FAIL_MODES)}\n")
+        return 1
+    return run_query(sys.stdin.read(), os.environ, sys.stdout, sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Local Funnel Pacing Engine
+
+Recomputes funnel_pacing, funnel_health, funnel_by_category and
+funnel_by_source from funnel actuals and plan targets, with the formulas of
+query_comprehensive_risk_analysis.sql: pacing percentages, gaps, RAG per
+stage, stage conversion rates and their gaps to plan, the primary
+bottleneck and weighted_tof_score. Stage weights for weighted_tof_score are
+configurable (the query uses MQL 10%, SQL 20%, SAL 30%, SQO 40%), so the
+funnel can be rescored or re-sliced without querying InboundFunnel and
+R360InboundFunnel again.
+
+Inputs are plain rows of counts (see inputs_from_report, which takes them
+from an existing report):
+
+    regions   product x region INBOUND actuals, QTD and Q1 targets, target
+              conversion rates and inbound_target_acv (funnel_pacing and
+              funnel_health)
+    sources   product x region x category x source actuals and targets
+              (funnel_by_source)
+    categories  product x region x category (funnel_by_category)
+
+Every output row is computed in one pass over its input row, all four stages
+at once. When sources are filtered, funnel_by_category is rolled up from the
+remaining source rows.
+
+Usage:
+    python scripts/funnel_engine.py                          # verify against the SQL numbers
+    python scripts/funnel_engine.py --weights mql=0.25,sql=0.25,sal=0.25,sqo=0.25
+    python scripts/funnel_engine.py --sources INBOUND,OUTBOUND -o funnel.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from aggregation_engine import compare, rag_status, safe_divide, sql_round
+
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+
+STAGES = ("mql", "sql", "sal", "sqo")
+CONVERSIONS = (("mql", "sql"), ("sql", "sal"), ("sal", "sqo"))
+DEFAULT_WEIGHTS = {"mql": 0.10, "sql": 0.20, "sal": 0.30, "sqo": 0.40}
+
+# Row order within each product, as the query's ORDER BY clauses have it
+SECTION_ORDER = {
+    "funnel_pacing": ("region",),
+    "funnel_health": ("region",),
+    "funnel_by_category": ("category", "region"),
+    "funnel_by_source": ("category", "source", "region"),
+}
+
+COUNT_FIELDS = tuple(f"{prefix}_{stage}" for prefix in ("q1_target", "qtd_target", "actual") for stage in STAGES)
+
+
+def parse_weights(spec):
+    """Parse "mql=0.1,sql=0.2,sal=0.3,sqo=0.4"; unnamed stages keep their default weight."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in filter(None, spec.split(",")):
+        stage, _, value = part.partition("=")
+        if stage.strip() not in weights:
+            raise ValueError(f"unknown funnel stage: {stage!r}")
+        weights[stage.strip()] = float(value)
+    return weights
+
+
+def weighted_tof_score(actual, target, weights=DEFAULT_WEIGHTS):
+    """
+    Return the down-funnel weighted attainment score (percent, rounded).
+
+    Only stages with a QTD target count, and their weights are renormalized
+    to sum to one; with no targeted stage the score is 100.
+    """
+    score = 0.0
+    total = 0.0
+    for stage in STAGES:
+        if target[stage] > 0:
+            score += weights[stage] * actual[stage] / target[stage]
+            total += weights[stage]
+    ratio = safe_divide(score, total)
+    return sql_round(ratio * 100) if ratio is not None else 100
+
+
+def _pacing(actual, target):
+    ratio = safe_divide(actual, target)
+    return sql_round(ratio * 100) if ratio is not None else None
+
+
+def _rate(numerator, denominator):
+    ratio = safe_divide(numerator, denominator)
+    return sql_round(ratio * 100, 1) if ratio is not None else None
+
+
+def primary_bottleneck(actual, target):
+    """Return the stage pacing furthest behind (earliest stage wins ties; untargeted stages never do)."""
+    ratios = [safe_divide(actual[stage], target[stage]) for stage in STAGES]
+    for i, ratio in enumerate(ratios[:-1]):
+        later = min(999 if r is None else r for r in ratios[i + 1:])
+        if ratio is not None and ratio <= later:
+            return STAGES[i].upper()
+    return STAGES[-1].upper()
+
+
+def _counts(row, prefix):
+    return {stage: row.get(f"{prefix}_{stage}") or 0 for stage in STAGES}
+
+
+def pacing_row(row):
+    """
+    Return a funnel_pacing row for one product x region input.
+
+    An actual of None (no funnel records for the stage) is shown as 0 but,
+    as in the query, leaves that stage's pacing and conversion rates NULL.
+    """
+    raw, target = {stage: row.get(f"actual_{stage}") for stage in STAGES}, _counts(row, "qtd_target")
+    out = {"product": row["product"], "region": row["region"], "source_channel": "INBOUND"}
+    for stage in STAGES:
+        actual = raw[stage]
+        out[f"actual_{stage}"] = actual or 0
+        out[f"target_{stage}"] = target[stage]
+        out[f"{stage}_pacing_pct"] = _pacing(actual, target[stage]) if actual is not None else None
+        out[f"{stage}_rag"] = rag_status(actual or 0, target[stage])
+    out["inbound_target_acv"] = row.get("inbound_target_acv") or 0
+    for src, dst in CONVERSIONS:
+        missing = raw[src] is None or raw[dst] is None
+        out[f"{src}_to_{dst}_rate"] = None if missing else _rate(raw[dst], raw[src])
+    return out
+
+
+def health_row(row):
+    """Return a funnel_health row for one product x region input."""
+    actual, target, q1 = _counts(row, "actual"), _counts(row, "qtd_target"), _counts(row, "q1_target")
+    rates = {f"{src}_to_{dst}": _rate(actual[dst], actual[src]) or 0 for src, dst in CONVERSIONS}
+    plan = {}
+    for src, dst in CONVERSIONS:
+        name = f"{src}_to_{dst}"
+        given = row.get(f"target_{name}_rate")
+        plan[name] = given if given is not None else _rate(q1[dst], q1[src]) or 0
+
+    out = {"product": row["product"], "region": row["region"]}
+    out.update({f"actual_{stage}": actual[stage] for stage in STAGES})
+    out.update({f"q1_target_{stage}": q1[stage] for stage in STAGES})
+    out.update({f"qtd_target_{stage}": target[stage] for stage in STAGES})
+    out.update({f"{stage}_gap": actual[stage] - target[stage] for stage in STAGES})
+    out.update({f"{stage}_pacing_pct": _pacing(actual[stage], target[stage]) for stage in STAGES})
+    out.update({f"actual_{name}_rate": rate for name, rate in rates.items()})
+    out.update({f"target_{name}_rate": rate for name, rate in plan.items()})
+    out.update({f"{name}_rate_gap": rates[name] - plan[name] for name in rates})
+    out.update({f"{stage}_rag": rag_status(actual[stage], target[stage]) for stage in STAGES})
+    out["primary_bottleneck"] = primary_bottleneck(actual, target)
+    return out
+
+
+def attainment_row(row, keys, weights=DEFAULT_WEIGHTS):
+    """Return a funnel_by_category / funnel_by_source row; untargeted stages pace at 100%."""
+    actual, target, q1 = _counts(row, "actual"), _counts(row, "qtd_target"), _counts(row, "q1_target")
+    out = {key: row[key] for key in keys}
+    out.update({f"q1_target_{stage}": q1[stage] for stage in STAGES})
+    out.update({f"qtd_target_{stage}": target[stage] for stage in STAGES})
+    out.update({f"actual_{stage}": actual[stage] for stage in STAGES})
+    out.update({f"{stage}_pacing_pct": _pacing(actual[stage], target[stage]) if target[stage] else 100
+                for stage in STAGES})
+    out.update({f"{stage}_gap": actual[stage] - target[stage] for stage in STAGES})
+    out["weighted_tof_score"] = weighted_tof_score(actual, target, weights)
+    return out
+
+
+def rollup(rows, keys):
+    """Sum the target and actual counts of rows grouped by keys."""
+    groups = {}
+    for row in rows:
+        group = groups.get(tuple(row[key] for key in keys))
+        if group is None:
+            group = groups[tuple(row[key] for key in keys)] = dict({key: row[key] for key in keys},
+                                                                  **dict.fromkeys(COUNT_FIELDS, 0))
+        for field in COUNT_FIELDS:
+            group[field] += row.get(field) or 0
+    return list(groups.values())
+
+
+def inputs_from_report(data):
+    """Return funnel input rows (actuals and targets) taken from a report."""
+    pacing = {(r["product"], r["region"]): r for rows in (data.get("funnel_pacing") or {}).values() for r in rows}
+    regions = []
+    for rows in (data.get("funnel_health") or {}).values():
+        for r in rows:
+            row = {key: r.get(key) for key in ("product", "region") + COUNT_FIELDS}
+            row.update({f"target_{src}_to_{dst}_rate": r.get(f"target_{src}_to_{dst}_rate") for src, dst in CONVERSIONS})
+            shown = pacing.get((r["product"], r["region"]), {})
+            row["inbound_target_acv"] = shown.get("inbound_target_acv")
+            for stage in STAGES:
+                # A NULL pacing against a real target means the stage had no funnel records
+                if shown.get(f"{stage}_pacing_pct") is None and shown.get(f"target_{stage}"):
+                    row[f"actual_{stage}"] = None
+            regions.append(row)
+
+    def counts(section, keys):
+        return [{key: r.get(key) for key in keys + COUNT_FIELDS}
+                for rows in (data.get(section) or {}).values() for r in rows]
+
+    return {
+        "regions": regions,
+        "categories": counts("funnel_by_category", ("product", "region", "category")),
+        "sources": counts("funnel_by_source", ("product", "region", "category", "source")),
+    }
+
+
+def _group(rows, order):
+    grouped = {}
+    for row in sorted(rows, key=lambda r: tuple(r[key] for key in order)):
+        grouped.setdefault(row["product"], []).append(row)
+    return grouped
+
+
+def compute(inputs, weights=DEFAULT_WEIGHTS, products=None, regions=None, categories=None, sources=None):
+    """
+    Return the four funnel sections for the (filtered) inputs.
+
+    Filters are collections of allowed values (None means any). The INBOUND
+    product x region sections honor only the product and region filters. A
+    source filter rolls funnel_by_category up from the matching source rows;
+    without one, category rows are computed from their own inputs, as the
+    query does.
+    """
+    def keep(row, *dims):
+        allowed = {"product": products, "region": regions, "category": categories, "source": sources}
+        return all(allowed[dim] is None or row[dim] in allowed[dim] for dim in dims)
+
+    region_inputs = [r for r in inputs["regions"] if keep(r, "product", "region")]
+    source_inputs = [r for r in inputs["sources"] if keep(r, "product", "region", "category", "source")]
+    if sources is None:
+        category_inputs = [r for r in inputs["categories"] if keep(r, "product", "region", "category")]
+    else:
+        category_inputs = rollup(source_inputs, ("product", "region", "category"))
+
+    return {
+        "funnel_pacing": _group([pacing_row(r) for r in region_inputs], SECTION_ORDER["funnel_pacing"]),
+        "funnel_health": _group([health_row(r) for r in region_inputs], SECTION_ORDER["funnel_health"]),
+        "funnel_by_category": _group([attainment_row(r, ("product", "region", "category"), weights)
+                                      for r in category_inputs], SECTION_ORDER["funnel_by_category"]),
+        "funnel_by_source": _group([attainment_row(r, ("product", "region", "category", "source"), weights)
+                                    for r in source_inputs], SECTION_ORDER["funnel_by_source"]),
+    }
+
+
+def _csv(value):
+    return {v for v in value.split(",") if v} if value else None
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Recompute funnel pacing sections locally")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--weights", default="", help="Stage weights, e.g. mql=0.1,sql=0.2,sal=0.3,sqo=0.4")
+    parser.add_argument("--products")
+    parser.add_argument("--regions")
+    parser.add_argument("--categories")
+    parser.add_argument("--sources")
+    parser.add_argument("-o", "--output", help="Write the recomputed sections here as JSON")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs (best is reported)")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    try:
+        weights = parse_weights(args.weights)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    with open(args.data, "r") as f:
+        data = json.load(f)
+
+    inputs = inputs_from_report(data)
+    filters = dict(products=_csv(args.products), regions=_csv(args.regions),
+                   categories=_csv(args.categories), sources=_csv(args.sources))
+
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        sections = compute(inputs, weights, **filters)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    rows = sum(len(rows) for section in sections.values() for rows in section.values())
+    print(f"Computed {rows} funnel rows in {best * 1000:.2f} ms")
+    for product, product_rows in sections["funnel_by_category"].items():
+        scores = ", ".join(f"{r['region']} {r['category']} {r['weighted_tof_score']}" for r in product_rows)
+        print(f"  {product} weighted TOF: {scores}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(sections, indent=2))
+        print(f"Sections saved to: {args.output}")
+
+    if weights == DEFAULT_WEIGHTS and not any(filters.values()):
+        diffs = [diff for name, value in sections.items() for diff in compare(data.get(name), value, name, 1e-9)]
+        for diff in diffs[:20]:
+            print(f"  MISMATCH {diff}")
+        print(f"{len(diffs)} difference(s) from the SQL-computed sections")
+        return 1 if diffs else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
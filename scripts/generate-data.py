@@ -7,25 +7,45 @@ the results to data/report-data.json for the Next.js app.
 
 Usage:
     python scripts/generate-data.py
+    python scripts/generate-data.py --summary-only   # summarize the existing artifact
+    python scripts/generate-data.py --no-risk-profiles   # skip the per-percentile targets query
+    python scripts/generate-data.py --rules rules.json   # RCA/action items from locally edited rules
 
 Requirements:
     - Google Cloud SDK (bq command)
     - Authenticated with BigQuery access
 """
 
+import argparse
 import json
 import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from data_cube import CUBE_PATH, write_cube
+from deal_indexes import INDEX_PATH as DEAL_INDEX_PATH, write_deal_indexes
+from deal_movements import MOVEMENTS_PATH, write_movements
+from history_store import connect as connect_history, ingest as ingest_history
+from loss_analytics import load_store as load_loss_store, save_store as save_loss_store
+from loss_analytics import sections as loss_sections
+from loss_analytics import update as update_loss_store
+from report_data import REPORT_PATH, ReportData, write_report
+from report_delta import DELTA_PATH, write_delta
+from report_models import ReportValidationError, load_model
+from risk_profiles import add_risk_profiles, run_targets_query
+from rule_engine import compile_rules, evaluate as evaluate_rules, load_rules
+from snapshot_store import SNAPSHOT_ROOT, current_generation, load_generation, publish
+from time_series import load_store as load_time_series, new_store as new_time_series, run_funnel_query
+from time_series import save_store as save_time_series, update as update_time_series
+
 
 def run_bigquery():
     """Execute the comprehensive risk analysis query and return JSON result."""
     # Get the path to the SQL file relative to this script
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
-    query_path = project_root / "query_comprehensive_risk_analysis.sql"
+    query_path = project_root / "sql" / "reports" / "query_comprehensive_risk_analysis.sql"
 
     if not query_path.exists():
         print(f"Error: SQL file not found at {query_path}")
@@ -53,12 +73,17 @@ def run_bigquery():
         print(f"Error running BigQuery: {result.stderr}")
         sys.exit(1)
 
+    return parse_query_output(result.stdout)
+
+
+def parse_query_output(stdout):
+    """Parse and validate `bq query --format=json` output into report data."""
     # Parse the outer JSON array
     try:
-        rows = json.loads(result.stdout)
+        rows = json.loads(stdout)
     except json.JSONDecodeError as e:
         print(f"Error parsing BigQuery output: {e}")
-        print(f"Output was: {result.stdout[:500]}...")
+        print(f"Output was: {stdout[:500]}...")
         sys.exit(1)
 
     if not rows:
@@ -72,28 +97,75 @@ def run_bigquery():
         print(f"Error parsing JSON result: {e}")
         sys.exit(1)
 
+    # Fail before anything is published if a row-level section is malformed
+    try:
+        load_model(data)
+    except ReportValidationError as e:
+        print(f"Error validating query output: {e}")
+        sys.exit(1)
+
     return data
 
 
-def save_data(data):
-    """Save the data to report-data.json."""
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    output_path = project_root / "data" / "report-data.json"
-
-    # Ensure data directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+def save_data(data, data_dir=None):
+    """
+    Save the data to report-data.json.
+
+    The data is first published as a new snapshot generation (unchanged
+    sections are shared with earlier generations), then report-data.json and
+    its section index are replaced by atomic rename so readers never see a
+    partially written file. When a previous generation exists, a compact
+    delta against it is written to report-data.delta.json and the deal
+    movements since it to report-data.movements.json as well.
+
+    data_dir redirects every artifact (same file names) away from data/,
+    e.g. for benchmarks.
+    """
+    data_dir = Path(data_dir) if data_dir else REPORT_PATH.parent
+    output_path = data_dir / REPORT_PATH.name
+    snapshot_root = data_dir / SNAPSHOT_ROOT.name
+    index_path = data_dir / DEAL_INDEX_PATH.name
+    cube_path = data_dir / CUBE_PATH.name
+    delta_path = data_dir / DELTA_PATH.name
+    movements_path = data_dir / MOVEMENTS_PATH.name
 
     # Add generation timestamp
     data["generated_at_utc"] = datetime.utcnow().isoformat()
 
-    with open(output_path, "w") as f:
-        json.dump(data, f, indent=2)
+    previous = load_generation(root=snapshot_root) if current_generation(snapshot_root) else None
+
+    generation, stats = publish(data, snapshot_root)
+    print(f"Snapshot generation: {generation} "
+          f"({stats['sections_written']} sections written, {stats['sections_reused']} reused)")
+
+    write_report(output_path, data)
 
     print(f"Data saved to: {output_path}")
+
+    index_size = write_deal_indexes(data, index_path)
+    print(f"Deal indexes saved to: {index_path} ({index_size:,} bytes)")
+
+    cube_size = write_cube(data, cube_path)
+    print(f"Data cube saved to: {cube_path} ({cube_size:,} bytes)")
+
+    if previous is not None:
+        delta_size = write_delta(previous, data, delta_path)
+        print(f"Delta saved to: {delta_path} ({delta_size:,} bytes)")
+        totals = write_movements(previous, data, movements_path)["totals"]
+        print(f"Deal movements saved to: {movements_path} ({totals['events']} events, "
+              f"${totals['slipped_acv']:,.0f} slipped ACV)")
     return output_path
 
 
+def count_rows(data, section):
+    """Count POR + R360 rows of a deal section (from the index when data is a ReportData)."""
+    if isinstance(data, ReportData):
+        counts = data.row_counts(section)
+    else:
+        counts = {key: len(rows) for key, rows in data.get(section, {}).items()}
+    return counts.get("POR", 0) + counts.get("R360", 0)
+
+
 def print_summary(data):
     """Print a summary of the generated data."""
     print("\n" + "=" * 60)
@@ -113,13 +185,9 @@ def print_summary(data):
     print()
 
     # Count deals
-    won_deals = data.get("won_deals", {})
-    lost_deals = data.get("lost_deals", {})
-    pipeline_deals = data.get("pipeline_deals", {})
-
-    won_count = len(won_deals.get("POR", [])) + len(won_deals.get("R360", []))
-    lost_count = len(lost_deals.get("POR", [])) + len(lost_deals.get("R360", []))
-    pipeline_count = len(pipeline_deals.get("POR", [])) + len(pipeline_deals.get("R360", []))
+    won_count = count_rows(data, "won_deals")
+    lost_count = count_rows(data, "lost_deals")
+    pipeline_count = count_rows(data, "pipeline_deals")
 
     print(f"Won Deals: {won_count}")
     print(f"Lost Deals: {lost_count}")
@@ -127,8 +195,28 @@ def print_summary(data):
     print("=" * 60)
 
 
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate report-data.json from BigQuery")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="Print the summary of the existing report-data.json without querying BigQuery")
+    parser.add_argument("--no-risk-profiles", action="store_true",
+                        help="Do not compute attainment for every SOP percentile (risk_profiles)")
+    parser.add_argument("--rules", metavar="FILE",
+                        help="Re-evaluate the RCA sections and action items with this rule set (rule_engine)")
+    return parser.parse_args()
+
+
 def main():
     """Main entry point."""
+    args = parse_args()
+
+    if args.summary_only:
+        # Only the summary sections are decoded; deal lists stay unparsed on disk
+        with ReportData(REPORT_PATH) as data:
+            print_summary(data)
+        return 0
+
     print("=" * 60)
     print("Q1 2026 Risk Report Data Generator")
     print("=" * 60)
@@ -136,8 +224,56 @@ def main():
     # Run the query
     data = run_bigquery()
 
+    # Join the same actuals against every percentile's targets; the report
+    # is still usable without them, so a failed targets query only warns
+    if not args.no_risk_profiles:
+        try:
+            profiles = add_risk_profiles(data, run_targets_query())
+            print(f"Risk profiles computed: {', '.join(profiles) or 'none'}")
+        except RuntimeError as e:
+            print(f"Warning: risk profiles skipped: {e}")
+
+    # Locally edited RCA rules replace the query's CASE output
+    if args.rules:
+        try:
+            data.update(evaluate_rules(compile_rules(load_rules(args.rules)), data))
+            print(f"RCA sections and action items re-evaluated with {args.rules}")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error applying rules from {args.rules}: {e}")
+            return 1
+
+    # Fold newly closed-lost deals into the running loss aggregates and publish
+    # the loss sections rebuilt from them
+    loss_store = load_loss_store()
+    counts = update_loss_store(loss_store, data)
+    data.update(loss_sections(loss_store, [data["period"]["quarter_start"]]))
+    print(f"Loss analytics updated: {counts['added']} added, {counts['changed']} changed, "
+          f"{counts['removed']} removed")
+
     # Save the data
     save_data(data)
+    save_loss_store(loss_store)
+
+    # Record the snapshot in the local history store
+    conn = connect_history()
+    try:
+        print(f"History snapshot recorded: {ingest_history(data, conn)}")
+    except ValueError as e:
+        print(f"Warning: history snapshot not recorded: {e}")
+    finally:
+        conn.close()
+
+    # Fold today's funnel and deal counts into the prefix-sum time series; the
+    # stage counts need their own query, and without it only deal measures move
+    try:
+        funnel = run_funnel_query()
+    except RuntimeError as e:
+        funnel = None
+        print(f"Warning: funnel stage series not updated: {e}")
+    time_series = load_time_series() or new_time_series(data["period"]["quarter_start"])
+    changed = update_time_series(time_series, data, funnel)
+    save_time_series(time_series)
+    print(f"Time series updated through {time_series['last_date']} ({changed} series changed)")
 
     # Print summary
     print_summary(data)
@@ -54,7 +54,7 @@ def run_bigquery(args):
     # Get the path to the SQL file
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
-    query_path = project_root / "query_trend_analysis.sql"
+    query_path = project_root / "sql" / "reports" / "query_trend_analysis.sql"
 
     if not query_path.exists():
         print(f"Error: SQL file not found at {query_path}")
@@ -14,19 +14,56 @@ Structure:
 6. Google Ads Performance - Metrics + insights
 
 Usage:
-    python generate_html_report.py
-"""
-
+    python generate_html_report.py                      # query BigQuery
+    python generate_html_report.py --from-json          # render data/report-data.json
+    python generate_html_report.py --from-json path/to/report-data.json
+    python generate_html_report.py --snapshot current   # render a snapshot generation
+    python generate_html_report.py --from-json --watch  # re-render when the artifact changes
+    python generate_html_report.py --no-render-cache    # re-render every section
+    python generate_html_report.py --linked-css --minify  # shared hashed stylesheet, minified HTML
+"""
+
+import argparse
+import hashlib
+import html
+import io
 import json
+import re
 import subprocess
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
+from render_cache import RenderCache, prune as prune_render_cache
+from report_data import REPORT_PATH, ReportData
+from report_models import load_model
+from snapshot_store import SNAPSHOT_ROOT, atomic_open, atomic_write, current_generation, load_generation
+from svg_charts import change_bars, pacing_bar, sparkline
+
+
+# Output buffer for streaming the report to disk
+RENDER_BUFFER_BYTES = 1 << 16
+
+# Tables with at least this many rows are embedded as JSON and paged client-side
+LAZY_TABLE_MIN_ROWS = 100
+LAZY_TABLE_PAGE_SIZE = 50
+
+# Cached section fragments are only reused by identical renderer code: this
+# file and every module the renderers call into
+RENDER_MODULES = ("generate_html_report.py", "report_models.py", "svg_charts.py")
+RENDER_TEMPLATE_VERSION = hashlib.sha256(
+    b"".join((Path(__file__).parent / name).read_bytes() for name in RENDER_MODULES)
+).hexdigest()[:16]
+
 
 def run_bigquery():
     """Execute the comprehensive risk analysis query and return JSON result."""
-    query_path = Path(__file__).parent / "query_comprehensive_risk_analysis.sql"
+    query_path = Path(__file__).parent.parent / "sql" / "reports" / "query_comprehensive_risk_analysis.sql"
+
+    if not query_path.exists():
+        print(f"Error: SQL file not found at {query_path}")
+        sys.exit(1)
 
     print(f"Running BigQuery query from: {query_path}")
 
@@ -89,100 +126,75 @@ def get_rag_from_pct(pct):
 
 
 def generate_html(data):
-    """Generate the HTML report from query data."""
-
-    period = data["period"]
-    grand_total = data["grand_total"]
-    product_totals = data["product_totals"]
-    attainment_detail = data["attainment_detail"]
-    top_risk_pockets = data["top_risk_pockets"]
-    funnel_pacing = data["funnel_pacing"]
-    funnel_health = data.get("funnel_health", {"POR": [], "R360": []})
-    funnel_rca_insights = data.get("funnel_rca_insights", {"POR": [], "R360": []})
-    funnel_trends = data.get("funnel_trends", {"POR": [], "R360": []})
-    loss_reason_rca = data.get("loss_reason_rca", {"POR": [], "R360": []})
-    loss_reasons = data["loss_reasons"]
-    google_ads = data["google_ads"]
-    quarterly_targets = data["quarterly_targets"]
+    """Generate the HTML report from query data and return it as a string."""
+    buffer = io.StringIO()
+    render_html(data, buffer)
+    return buffer.getvalue()
 
-    # NEW in v2.5.0
-    executive_counts = data.get("executive_counts", {})
-    wins_bright_spots = data.get("wins_bright_spots", {"POR": [], "R360": []})
-    momentum_indicators = data.get("momentum_indicators", {"POR": [], "R360": []})
-    pipeline_rca = data.get("pipeline_rca", {"POR": [], "R360": []})
-    trend_rca = data.get("trend_rca", {"POR": [], "R360": []})
-    google_ads_rca = data.get("google_ads_rca", {"POR": {}, "R360": {}})
-    action_items = data.get("action_items", {"immediate": [], "short_term": [], "strategic": []})
-    query_version = data.get("query_version", "2.5.0")
 
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Q1 2026 Bookings Risk Analysis Report</title>
-    <style>
-        * {{
+# Report stylesheet; inlined by default, or written once as a shared asset (write_stylesheet)
+REPORT_CSS = """\
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             font-size: 14px;
             line-height: 1.5;
             color: #333;
             background: #f8f9fa;
             padding: 20px;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             padding: 30px;
             border-radius: 8px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
+        }
 
-        h1 {{
+        h1 {
             font-size: 24px;
             color: #1a1a2e;
             margin-bottom: 10px;
             border-bottom: 3px solid #4361ee;
             padding-bottom: 10px;
-        }}
+        }
 
-        h2 {{
+        h2 {
             font-size: 18px;
             color: #1a1a2e;
             margin: 25px 0 15px 0;
             padding-bottom: 8px;
             border-bottom: 2px solid #e9ecef;
-        }}
+        }
 
-        h3 {{
+        h3 {
             font-size: 16px;
             color: #495057;
             margin: 20px 0 10px 0;
-        }}
+        }
 
-        .metadata {{
+        .metadata {
             color: #6c757d;
             font-size: 13px;
             margin-bottom: 20px;
-        }}
+        }
 
-        .metadata span {{
+        .metadata span {
             display: inline-block;
             margin-right: 20px;
             padding: 4px 8px;
             background: #e9ecef;
             border-radius: 4px;
-        }}
+        }
 
-        .note {{
+        .note {
             background: #fff3cd;
             border: 1px solid #ffc107;
             color: #856404;
@@ -190,9 +202,9 @@ def generate_html(data):
             border-radius: 4px;
             margin: 10px 0;
             font-size: 13px;
-        }}
+        }
 
-        .filter-note {{
+        .filter-note {
             background: #e7f5ff;
             border: 1px solid #74c0fc;
             color: #1c7ed6;
@@ -200,296 +212,321 @@ def generate_html(data):
             border-radius: 4px;
             margin: 8px 0;
             font-size: 12px;
-        }}
+        }
 
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 15px 0;
             font-size: 13px;
-        }}
+        }
 
-        th, td {{
+        th, td {
             padding: 10px 12px;
             text-align: right;
             border: 1px solid #dee2e6;
-        }}
+        }
 
-        th {{
+        th {
             background: #f8f9fa;
             font-weight: 600;
             color: #495057;
             text-transform: uppercase;
             font-size: 11px;
             letter-spacing: 0.5px;
-        }}
+        }
 
-        td:first-child, th:first-child {{
+        td:first-child, th:first-child {
             text-align: left;
-        }}
+        }
 
-        tr:nth-child(even) {{
+        tr:nth-child(even) {
             background: #f8f9fa;
-        }}
+        }
 
-        tr:hover {{
+        tr:hover {
             background: #e9ecef;
-        }}
+        }
 
-        .rag-green {{
+        .rag-green {
             background-color: #d4edda !important;
             color: #155724;
             font-weight: 600;
-        }}
+        }
 
-        .rag-yellow {{
+        .rag-yellow {
             background-color: #fff3cd !important;
             color: #856404;
             font-weight: 600;
-        }}
+        }
 
-        .rag-red {{
+        .rag-red {
             background-color: #f8d7da !important;
             color: #721c24;
             font-weight: 600;
-        }}
+        }
 
-        .summary-cards {{
+        .summary-cards {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 15px;
             margin: 20px 0;
-        }}
+        }
 
-        .summary-card {{
+        .summary-card {
             background: #f8f9fa;
             border: 1px solid #dee2e6;
             border-radius: 8px;
             padding: 15px;
-        }}
+        }
 
-        .summary-card.green {{
+        .summary-card.green {
             border-left: 4px solid #28a745;
-        }}
+        }
 
-        .summary-card.yellow {{
+        .summary-card.yellow {
             border-left: 4px solid #ffc107;
-        }}
+        }
 
-        .summary-card.red {{
+        .summary-card.red {
             border-left: 4px solid #dc3545;
-        }}
+        }
 
-        .summary-card h4 {{
+        .summary-card h4 {
             font-size: 12px;
             color: #6c757d;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
+        }
 
-        .summary-card .value {{
+        .summary-card .value {
             font-size: 24px;
             font-weight: 700;
             color: #1a1a2e;
-        }}
+        }
 
-        .summary-card .detail {{
+        .summary-card .detail {
             font-size: 12px;
             color: #6c757d;
             margin-top: 5px;
-        }}
+        }
 
-        .product-section {{
+        .product-section {
             margin: 20px 0;
             padding: 15px;
             background: #f8f9fa;
             border-radius: 8px;
-        }}
+        }
 
-        .product-header {{
+        .product-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
 
-        .product-title {{
+        .product-title {
             font-size: 16px;
             font-weight: 600;
             color: #1a1a2e;
-        }}
+        }
 
-        .product-badge {{
+        .product-badge {
             padding: 4px 12px;
             border-radius: 20px;
             font-size: 12px;
             font-weight: 600;
-        }}
+        }
 
-        .badge-por {{
+        .badge-por {
             background: #4361ee;
             color: white;
-        }}
+        }
 
-        .badge-r360 {{
+        .badge-r360 {
             background: #7209b7;
             color: white;
-        }}
+        }
 
-        .two-col {{
+        .two-col {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 20px;
-        }}
+        }
 
-        @media (max-width: 900px) {{
-            .two-col {{
+        @media (max-width: 900px) {
+            .two-col {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
+
+        /* Inline SVG charts (scripts/svg_charts.py) */
+        .spark, .pacing-bar, .change-bars {
+            vertical-align: middle;
+        }
+
+        /* Deal lists (large tables are paged client-side) */
+        .lazy-table-controls {
+            display: flex;
+            gap: 8px;
+            align-items: center;
+            margin-top: 10px;
+            font-size: 12px;
+            color: #6c757d;
+        }
+
+        .lazy-table-controls input {
+            padding: 4px 8px;
+            border: 1px solid #dee2e6;
+            border-radius: 4px;
+        }
 
-        .footer {{
+        .lazy-table th {
+            cursor: pointer;
+        }
+
+        .footer {
             margin-top: 30px;
             padding-top: 20px;
             border-top: 1px solid #dee2e6;
             color: #6c757d;
             font-size: 12px;
             text-align: center;
-        }}
+        }
 
         /* Copy-paste friendly styles */
-        table {{
+        table {
             border-spacing: 0;
-        }}
+        }
 
-        .copy-friendly {{
+        .copy-friendly {
             font-family: 'SF Mono', 'Monaco', 'Consolas', monospace;
-        }}
+        }
 
         /* Severity badges */
-        .severity-critical {{
+        .severity-critical {
             background: #dc3545;
             color: white;
             padding: 2px 8px;
             border-radius: 12px;
             font-size: 11px;
             font-weight: 600;
-        }}
+        }
 
-        .severity-high {{
+        .severity-high {
             background: #fd7e14;
             color: white;
             padding: 2px 8px;
             border-radius: 12px;
             font-size: 11px;
             font-weight: 600;
-        }}
+        }
 
-        .severity-medium {{
+        .severity-medium {
             background: #ffc107;
             color: #333;
             padding: 2px 8px;
             border-radius: 12px;
             font-size: 11px;
             font-weight: 600;
-        }}
+        }
 
-        .severity-low {{
+        .severity-low {
             background: #28a745;
             color: white;
             padding: 2px 8px;
             border-radius: 12px;
             font-size: 11px;
             font-weight: 600;
-        }}
+        }
 
         /* RCA insights */
-        .rca-section {{
+        .rca-section {
             background: #f8f9fa;
             border-radius: 8px;
             padding: 15px;
             margin: 15px 0;
-        }}
+        }
 
-        .rca-item {{
+        .rca-item {
             padding: 12px;
             margin: 8px 0;
             border-left: 4px solid #6c757d;
             background: white;
             border-radius: 0 4px 4px 0;
-        }}
+        }
 
-        .rca-item.critical {{
+        .rca-item.critical {
             border-left-color: #dc3545;
-        }}
+        }
 
-        .rca-item.high {{
+        .rca-item.high {
             border-left-color: #fd7e14;
-        }}
+        }
 
-        .rca-item.medium {{
+        .rca-item.medium {
             border-left-color: #ffc107;
-        }}
+        }
 
-        .rca-item.low {{
+        .rca-item.low {
             border-left-color: #28a745;
-        }}
+        }
 
-        .rca-header {{
+        .rca-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 8px;
-        }}
+        }
 
-        .rca-region {{
+        .rca-region {
             font-weight: 600;
             font-size: 14px;
-        }}
+        }
 
-        .rca-bottleneck {{
+        .rca-bottleneck {
             font-size: 12px;
             color: #6c757d;
-        }}
+        }
 
-        .rca-commentary {{
+        .rca-commentary {
             font-size: 13px;
             color: #333;
             margin-bottom: 8px;
-        }}
+        }
 
-        .rca-action {{
+        .rca-action {
             font-size: 12px;
             color: #0066cc;
             font-style: italic;
-        }}
+        }
 
         /* Funnel health visual */
-        .funnel-stage {{
+        .funnel-stage {
             display: inline-block;
             padding: 4px 12px;
             margin: 2px;
             border-radius: 4px;
             font-size: 12px;
             font-weight: 500;
-        }}
+        }
 
-        .stage-green {{
+        .stage-green {
             background: #d4edda;
             color: #155724;
-        }}
+        }
 
-        .stage-yellow {{
+        .stage-yellow {
             background: #fff3cd;
             color: #856404;
-        }}
+        }
 
-        .stage-red {{
+        .stage-red {
             background: #f8d7da;
             color: #721c24;
-        }}
+        }
 
-        .funnel-visual {{
+        .funnel-visual {
             display: flex;
             align-items: center;
             gap: 8px;
@@ -497,223 +534,276 @@ def generate_html(data):
             background: #f8f9fa;
             border-radius: 4px;
             margin: 5px 0;
-        }}
+        }
 
-        .funnel-arrow {{
+        .funnel-arrow {
             color: #6c757d;
             font-size: 16px;
-        }}
+        }
 
         /* NEW in v2.5.0 - Success/Wins styles */
-        .wins-section {{
+        .wins-section {
             background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
             border-radius: 8px;
             padding: 20px;
             margin: 20px 0;
             border-left: 5px solid #28a745;
-        }}
+        }
 
-        .wins-section h2 {{
+        .wins-section h2 {
             color: #155724;
             margin-bottom: 15px;
             border-bottom: 2px solid #28a745;
             padding-bottom: 8px;
-        }}
+        }
 
-        .win-card {{
+        .win-card {
             background: white;
             border-radius: 8px;
             padding: 15px;
             margin: 10px 0;
             border-left: 4px solid #28a745;
             box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }}
+        }
 
-        .win-card.exceptional {{
+        .win-card.exceptional {
             border-left-color: #0d6efd;
             background: linear-gradient(90deg, #e7f1ff 0%, white 100%);
-        }}
+        }
 
-        .win-header {{
+        .win-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 8px;
-        }}
+        }
 
-        .win-title {{
+        .win-title {
             font-weight: 600;
             font-size: 14px;
             color: #155724;
-        }}
+        }
 
-        .win-pct {{
+        .win-pct {
             font-size: 20px;
             font-weight: 700;
             color: #28a745;
-        }}
+        }
 
-        .win-commentary {{
+        .win-commentary {
             font-size: 13px;
             color: #333;
             margin-top: 8px;
-        }}
+        }
 
-        .momentum-badge {{
+        .momentum-badge {
             display: inline-block;
             padding: 4px 10px;
             border-radius: 20px;
             font-size: 11px;
             font-weight: 600;
-        }}
+        }
 
-        .momentum-strong {{
+        .momentum-strong {
             background: #28a745;
             color: white;
-        }}
+        }
 
-        .momentum-moderate {{
+        .momentum-moderate {
             background: #20c997;
             color: white;
-        }}
+        }
 
-        .momentum-some {{
+        .momentum-some {
             background: #6c757d;
             color: white;
-        }}
+        }
 
         /* Action Items styles */
-        .action-section {{
+        .action-section {
             margin: 20px 0;
-        }}
+        }
 
-        .action-group {{
+        .action-group {
             margin: 15px 0;
-        }}
+        }
 
-        .action-group h4 {{
+        .action-group h4 {
             font-size: 14px;
             font-weight: 600;
             margin-bottom: 10px;
             padding: 8px 12px;
             border-radius: 4px;
-        }}
+        }
 
-        .action-group.immediate h4 {{
+        .action-group.immediate h4 {
             background: #f8d7da;
             color: #721c24;
-        }}
+        }
 
-        .action-group.short-term h4 {{
+        .action-group.short-term h4 {
             background: #fff3cd;
             color: #856404;
-        }}
+        }
 
-        .action-group.strategic h4 {{
+        .action-group.strategic h4 {
             background: #cce5ff;
             color: #004085;
-        }}
+        }
 
-        .action-item {{
+        .action-item {
             padding: 12px;
             margin: 8px 0;
             background: #f8f9fa;
             border-radius: 4px;
             border-left: 3px solid #6c757d;
-        }}
+        }
 
-        .action-item.critical {{
+        .action-item.critical {
             border-left-color: #dc3545;
-        }}
+        }
 
-        .action-item.high {{
+        .action-item.high {
             border-left-color: #fd7e14;
-        }}
+        }
 
-        .action-item.medium {{
+        .action-item.medium {
             border-left-color: #ffc107;
-        }}
+        }
 
-        .action-meta {{
+        .action-meta {
             display: flex;
             gap: 10px;
             margin-bottom: 6px;
             font-size: 11px;
             color: #6c757d;
-        }}
+        }
 
-        .action-meta span {{
+        .action-meta span {
             padding: 2px 6px;
             background: #e9ecef;
             border-radius: 3px;
-        }}
+        }
 
-        .action-issue {{
+        .action-issue {
             font-size: 13px;
             color: #333;
             margin-bottom: 6px;
-        }}
+        }
 
-        .action-text {{
+        .action-text {
             font-size: 12px;
             color: #0066cc;
             font-style: italic;
-        }}
+        }
 
         /* Executive summary enhancements */
-        .exec-summary-row {{
+        .exec-summary-row {
             display: flex;
             gap: 15px;
             margin: 15px 0;
-        }}
+        }
 
-        .exec-stat {{
+        .exec-stat {
             flex: 1;
             padding: 15px;
             border-radius: 8px;
             text-align: center;
-        }}
+        }
 
-        .exec-stat.wins {{
+        .exec-stat.wins {
             background: #d4edda;
             border: 1px solid #28a745;
-        }}
+        }
 
-        .exec-stat.risks {{
+        .exec-stat.risks {
             background: #f8d7da;
             border: 1px solid #dc3545;
-        }}
+        }
 
-        .exec-stat.attention {{
+        .exec-stat.attention {
             background: #fff3cd;
             border: 1px solid #ffc107;
-        }}
+        }
 
-        .exec-stat.momentum {{
+        .exec-stat.momentum {
             background: #cce5ff;
             border: 1px solid #0d6efd;
-        }}
+        }
 
-        .exec-stat-value {{
+        .exec-stat-value {
             font-size: 28px;
             font-weight: 700;
-        }}
+        }
 
-        .exec-stat-label {{
+        .exec-stat-label {
             font-size: 12px;
             color: #6c757d;
             margin-top: 4px;
-        }}
+        }
 
-        .trend-arrow-up {{
+        .trend-arrow-up {
             color: #28a745;
-        }}
+        }
 
-        .trend-arrow-down {{
+        .trend-arrow-down {
             color: #dc3545;
-        }}
-    </style>
-</head>
+        }
+"""
+
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(fragment):
+    """Drop comments, indentation and blank lines from a rendered fragment."""
+    fragment = re.sub(r"<!--.*?-->", "", fragment, flags=re.S)
+    fragment = re.sub(r"^[ \t]+", "", fragment, flags=re.M)
+    return re.sub(r"\n{2,}", "\n", fragment)
+
+
+def write_stylesheet(directory):
+    """
+    Write the minified stylesheet as a content-hashed asset under directory/assets.
+
+    The file name changes only when the CSS does, so every report rendered with
+    the same stylesheet shares one cacheable file. Returns the href relative to
+    directory.
+    """
+    css = minify_css(REPORT_CSS).encode("utf-8")
+    href = f"assets/report.{hashlib.sha256(css).hexdigest()[:12]}.css"
+    path = Path(directory) / href
+    if not path.exists():
+        atomic_write(path, css)
+    return href
+
+
+def _style_block(stylesheet=None, minify=False):
+    """Return the <style> or <link> markup for the document head."""
+    if stylesheet:
+        return f'    <link rel="stylesheet" href="{stylesheet}">\n'
+    if minify:
+        return f"    <style>{minify_css(REPORT_CSS)}</style>\n"
+    return f"    <style>\n{REPORT_CSS}    </style>\n"
+
+
+def _render_document_head(out, data, model, style_block):
+    """Document head, stylesheet and report metadata."""
+    period = data["period"]
+
+    out.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Q1 2026 Bookings Risk Analysis Report</title>
+{style_block}</head>
 <body>
     <div class="container">
         <h1>Q1 2026 Bookings Risk Analysis Report</h1>
@@ -722,10 +812,20 @@ def generate_html(data):
             <span>Generated: {data.get('generated_at_utc', 'N/A')[:19]} UTC</span>
             <span>Report Date: {data.get('report_date', 'N/A')}</span>
             <span>Quarter Progress: {period.get('quarter_pct_complete', 0):.1f}% ({period.get('days_elapsed', 0)}/{period.get('total_days', 90)} days)</span>
-            <span>Percentile: {data.get('percentile', 'P50')}</span>
+            <span>Percentile: {data.get('percentile', 'P50')}</span>{f'''
+            <span>Audience: {data["audience"]}</span>''' if data.get('audience') else ''}
         </div>
 
-        <!-- Executive Summary (Enhanced in v2.5.0) -->
+""")
+
+
+def _render_executive_summary(out, data, model):
+    """Executive summary status counts and headline cards."""
+    grand_total = data["grand_total"]
+    quarterly_targets = data["quarterly_targets"]
+    executive_counts = data.get("executive_counts", {})
+
+    out.write(f"""        <!-- Executive Summary (Enhanced in v2.5.0) -->
         <h2>Executive Summary</h2>
 
         <!-- NEW: Quick Status Indicators -->
@@ -790,13 +890,18 @@ def generate_html(data):
         <h2>Product Performance</h2>
 
         <div class="two-col">
-"""
+""")
+
+
+def _render_product_performance(out, data, model):
+    """POR and R360 product performance cards."""
+    product_totals = data["product_totals"]
 
     # POR Performance Card
     por = product_totals.get("POR", {})
     por_rag = get_rag_from_pct(por.get("total_qtd_attainment_pct"))
 
-    html += f"""
+    out.write(f"""
             <div class="product-section">
                 <div class="product-header">
                     <span class="product-title">Point of Rental (POR)</span>
@@ -841,13 +946,13 @@ def generate_html(data):
                     </tr>
                 </table>
             </div>
-"""
+""")
 
     # R360 Performance Card
     r360 = product_totals.get("R360", {})
     r360_rag = get_rag_from_pct(r360.get("total_qtd_attainment_pct"))
 
-    html += f"""
+    out.write(f"""
             <div class="product-section">
                 <div class="product-header">
                     <span class="product-title">Record360 (R360)</span>
@@ -893,22 +998,27 @@ def generate_html(data):
                 </table>
             </div>
         </div>
-"""
+""")
+
+
+def _render_wins_bright_spots(out, data, model):
+    """Areas pacing at or above target."""
+    wins_bright_spots = data.get("wins_bright_spots", {"POR": [], "R360": []})
 
     # ==========================================================================
     # WINS & BRIGHT SPOTS SECTION (NEW in v2.5.0)
     # ==========================================================================
     all_wins = wins_bright_spots.get("POR", []) + wins_bright_spots.get("R360", [])
     if all_wins:
-        html += """
+        out.write("""
         <div class="wins-section">
             <h2>Wins & Bright Spots</h2>
             <p style="color: #155724; margin-bottom: 15px;">Areas pacing at or above 100% of target - celebrating strong performance!</p>
-"""
+""")
         for win in all_wins:
             tier_class = "exceptional" if win.get("performance_tier") == "EXCEPTIONAL" else ""
             commentary = win.get("success_commentary", "")
-            html += f"""
+            out.write(f"""
             <div class="win-card {tier_class}">
                 <div class="win-header">
                     <span class="win-title">{win.get('product', '')} - {win.get('region', '')} {win.get('category', '')}</span>
@@ -922,10 +1032,15 @@ def generate_html(data):
                 </div>
                 {f'<div class="win-commentary">{commentary}</div>' if commentary else ''}
             </div>
-"""
-        html += """
+""")
+        out.write("""
         </div>
-"""
+""")
+
+
+def _render_momentum_indicators(out, data, model):
+    """Areas with improving week-over-week trends."""
+    momentum_indicators = data.get("momentum_indicators", {"POR": [], "R360": []})
 
     # ==========================================================================
     # MOMENTUM INDICATORS SECTION (NEW in v2.5.0)
@@ -933,7 +1048,7 @@ def generate_html(data):
     all_momentum = momentum_indicators.get("POR", []) + momentum_indicators.get("R360", [])
     strong_momentum = [m for m in all_momentum if m.get("momentum_tier") in ["STRONG_MOMENTUM", "MODERATE_MOMENTUM"]]
     if strong_momentum:
-        html += """
+        out.write("""
         <h2>Momentum Indicators</h2>
         <div class="note" style="background: #cce5ff; border-color: #0d6efd; color: #004085;">
             <strong>Positive Trends:</strong> Areas showing improving week-over-week performance even if not yet at target.
@@ -943,11 +1058,12 @@ def generate_html(data):
                 <th>Product</th>
                 <th>Region</th>
                 <th>Momentum</th>
+                <th>Attainment</th>
                 <th>MQL Trend</th>
                 <th>SQL Trend</th>
                 <th>Commentary</th>
             </tr>
-"""
+""")
         for m in strong_momentum:
             tier = m.get("momentum_tier", "").replace("_", " ").title()
             tier_class = "momentum-strong" if m.get("momentum_tier") == "STRONG_MOMENTUM" else "momentum-moderate"
@@ -956,22 +1072,28 @@ def generate_html(data):
             sql_arrow = "↑" if m.get("sql_trend") == "UP" else "↓" if m.get("sql_trend") == "DOWN" else "→"
             sql_color = "#28a745" if m.get("sql_trend") == "UP" else "#dc3545" if m.get("sql_trend") == "DOWN" else "#6c757d"
 
-            html += f"""
+            out.write(f"""
             <tr>
                 <td>{m.get('product', '')}</td>
                 <td>{m.get('region', '')}</td>
                 <td><span class="momentum-badge {tier_class}">{tier}</span></td>
+                <td>{pacing_bar(m.get('current_attainment_pct'))} {format_percent(m.get('current_attainment_pct'))}</td>
                 <td style="color: {mql_color}; font-weight: bold;">{mql_arrow} {m.get('mql_wow_pct', 0) or 0}%</td>
                 <td style="color: {sql_color}; font-weight: bold;">{sql_arrow} {m.get('sql_wow_pct', 0) or 0}%</td>
                 <td style="font-size: 12px;">{m.get('momentum_commentary', '') or ''}</td>
             </tr>
-"""
-        html += """
+""")
+        out.write("""
         </table>
-"""
+""")
+
+
+def _render_top_risk_pockets(out, data, model):
+    """Largest gaps to QTD target."""
+    top_risk_pockets = data["top_risk_pockets"]
 
     # Top Risk Pockets
-    html += """
+    out.write("""
         <h2>Top Risk Pockets</h2>
         <p class="note">Areas requiring immediate attention, sorted by gap to QTD target.</p>
 
@@ -989,11 +1111,11 @@ def generate_html(data):
                 <th>Coverage</th>
                 <th>Status</th>
             </tr>
-"""
+""")
 
     for pocket in top_risk_pockets:
         rag = pocket.get("rag_status", "RED")
-        html += f"""
+        out.write(f"""
             <tr>
                 <td>{pocket.get('product', '')}</td>
                 <td>{pocket.get('region', '')}</td>
@@ -1007,14 +1129,19 @@ def generate_html(data):
                 <td>{pocket.get('pipeline_coverage_x', 0):.1f}x</td>
                 <td class="{get_rag_class(rag)}">{rag}</td>
             </tr>
-"""
+""")
 
-    html += """
+    out.write("""
         </table>
-"""
+""")
+
+
+def _render_funnel_pacing(out, data, model):
+    """Inbound funnel pacing tables (POR and R360)."""
+    funnel_pacing = model.funnel_pacing
 
     # Funnel Pacing Section
-    html += """
+    out.write("""
         <h2>Inbound Funnel Pacing</h2>
         <div class="note">
             <strong>Important:</strong> MQL targets are INBOUND channel only.
@@ -1023,10 +1150,10 @@ def generate_html(data):
                 <li>APAC is INBOUND-heavy: 63% of NEW LOGO ACV from INBOUND</li>
             </ul>
         </div>
-"""
+""")
 
     # POR Funnel
-    html += """
+    out.write("""
         <h3>POR Funnel Pacing</h3>
         <table>
             <tr>
@@ -1044,38 +1171,38 @@ def generate_html(data):
                 <th>SQO Target</th>
                 <th>SQO %</th>
             </tr>
-"""
+""")
 
-    for row in funnel_pacing.get("POR", []):
-        mql_rag = row.get("mql_rag", "RED")
-        sql_rag = row.get("sql_rag", "RED")
-        sal_rag = row.get("sal_rag", "RED")
-        sqo_rag = row.get("sqo_rag", "RED")
+    for row in funnel_pacing["POR"]:
+        mql_rag = row.mql_rag
+        sql_rag = row.sql_rag
+        sal_rag = row.sal_rag
+        sqo_rag = row.sqo_rag
 
-        html += f"""
+        out.write(f"""
             <tr>
-                <td>{row.get('region', '')}</td>
-                <td>{row.get('actual_mql', 0)}</td>
-                <td>{row.get('target_mql', 0)}</td>
-                <td class="{get_rag_class(mql_rag)}">{row.get('mql_pacing_pct', 0) or 0}%</td>
-                <td>{row.get('actual_sql', 0)}</td>
-                <td>{row.get('target_sql', 0)}</td>
-                <td class="{get_rag_class(sql_rag)}">{row.get('sql_pacing_pct', 0) or 0}%</td>
-                <td>{row.get('actual_sal', 0)}</td>
-                <td>{row.get('target_sal', 0)}</td>
-                <td class="{get_rag_class(sal_rag)}">{row.get('sal_pacing_pct', 0) or 0}%</td>
-                <td>{row.get('actual_sqo', 0)}</td>
-                <td>{row.get('target_sqo', 0)}</td>
-                <td class="{get_rag_class(sqo_rag)}">{row.get('sqo_pacing_pct', 0) or 0}%</td>
+                <td>{row.region}</td>
+                <td>{row.actual_mql}</td>
+                <td>{row.target_mql}</td>
+                <td class="{get_rag_class(mql_rag)}">{row.mql_pacing_pct or 0}%</td>
+                <td>{row.actual_sql}</td>
+                <td>{row.target_sql}</td>
+                <td class="{get_rag_class(sql_rag)}">{row.sql_pacing_pct or 0}%</td>
+                <td>{row.actual_sal}</td>
+                <td>{row.target_sal}</td>
+                <td class="{get_rag_class(sal_rag)}">{row.sal_pacing_pct or 0}%</td>
+                <td>{row.actual_sqo}</td>
+                <td>{row.target_sqo}</td>
+                <td class="{get_rag_class(sqo_rag)}">{row.sqo_pacing_pct or 0}%</td>
             </tr>
-"""
+""")
 
-    html += """
+    out.write("""
         </table>
-"""
+""")
 
     # R360 Funnel
-    html += """
+    out.write("""
         <h3>R360 Funnel Pacing</h3>
         <table>
             <tr>
@@ -1093,49 +1220,54 @@ def generate_html(data):
                 <th>SQO Target</th>
                 <th>SQO %</th>
             </tr>
-"""
+""")
 
-    for row in funnel_pacing.get("R360", []):
-        mql_rag = row.get("mql_rag", "RED")
-        sql_rag = row.get("sql_rag", "RED")
-        sal_rag = row.get("sal_rag", "RED")
-        sqo_rag = row.get("sqo_rag", "RED")
+    for row in funnel_pacing["R360"]:
+        mql_rag = row.mql_rag
+        sql_rag = row.sql_rag
+        sal_rag = row.sal_rag
+        sqo_rag = row.sqo_rag
 
-        html += f"""
+        out.write(f"""
             <tr>
-                <td>{row.get('region', '')}</td>
-                <td>{row.get('actual_mql', 0)}</td>
-                <td>{row.get('target_mql', 0)}</td>
-                <td class="{get_rag_class(mql_rag)}">{row.get('mql_pacing_pct', 0) or 0}%</td>
-                <td>{row.get('actual_sql', 0)}</td>
-                <td>{row.get('target_sql', 0)}</td>
-                <td class="{get_rag_class(sql_rag)}">{row.get('sql_pacing_pct', 0) or 0}%</td>
-                <td>{row.get('actual_sal', 0)}</td>
-                <td>{row.get('target_sal', 0)}</td>
-                <td class="{get_rag_class(sal_rag)}">{row.get('sal_pacing_pct', 0) or 0}%</td>
-                <td>{row.get('actual_sqo', 0)}</td>
-                <td>{row.get('target_sqo', 0)}</td>
-                <td class="{get_rag_class(sqo_rag)}">{row.get('sqo_pacing_pct', 0) or 0}%</td>
+                <td>{row.region}</td>
+                <td>{row.actual_mql}</td>
+                <td>{row.target_mql}</td>
+                <td class="{get_rag_class(mql_rag)}">{row.mql_pacing_pct or 0}%</td>
+                <td>{row.actual_sql}</td>
+                <td>{row.target_sql}</td>
+                <td class="{get_rag_class(sql_rag)}">{row.sql_pacing_pct or 0}%</td>
+                <td>{row.actual_sal}</td>
+                <td>{row.target_sal}</td>
+                <td class="{get_rag_class(sal_rag)}">{row.sal_pacing_pct or 0}%</td>
+                <td>{row.actual_sqo}</td>
+                <td>{row.target_sqo}</td>
+                <td class="{get_rag_class(sqo_rag)}">{row.sqo_pacing_pct or 0}%</td>
             </tr>
-"""
+""")
 
-    html += """
+    out.write("""
         </table>
-"""
+""")
+
+
+def _render_funnel_health(out, data, model):
+    """Funnel health by region and conversion rate comparison."""
+    funnel_health = data.get("funnel_health", {"POR": [], "R360": []})
 
     # Funnel Health Analysis Section (NEW in v2.4.0)
-    html += """
+    out.write("""
         <h2>Funnel Health Analysis</h2>
         <div class="note">
             <strong>NEW:</strong> Stage-by-stage gap analysis with target conversion rates. Identifies bottleneck at each funnel stage.
         </div>
-"""
+""")
 
     # Generate Funnel Health Visual for each product
     for product_name, badge_class in [("POR", "badge-por"), ("R360", "badge-r360")]:
         health_data = funnel_health.get(product_name, [])
         if health_data:
-            html += f"""
+            out.write(f"""
         <h3>{product_name} Funnel Health by Region</h3>
         <table>
             <tr>
@@ -1150,14 +1282,14 @@ def generate_html(data):
                 <th>SQO Gap</th>
                 <th>Bottleneck</th>
             </tr>
-"""
+""")
             for row in health_data:
                 mql_rag = row.get("mql_rag", "RED")
                 sql_rag = row.get("sql_rag", "RED")
                 sal_rag = row.get("sal_rag", "RED")
                 sqo_rag = row.get("sqo_rag", "RED")
 
-                html += f"""
+                out.write(f"""
             <tr>
                 <td>{row.get('region', '')}</td>
                 <td class="{get_rag_class(mql_rag)}">{row.get('actual_mql', 0)} / {row.get('qtd_target_mql', 0)} ({row.get('mql_pacing_pct', 0) or 0}%)</td>
@@ -1170,13 +1302,13 @@ def generate_html(data):
                 <td style="color: {'#dc3545' if row.get('sqo_gap', 0) < 0 else '#28a745'}">{row.get('sqo_gap', 0):+d}</td>
                 <td><strong>{row.get('primary_bottleneck', 'N/A')}</strong></td>
             </tr>
-"""
-            html += """
+""")
+            out.write("""
         </table>
-"""
+""")
 
     # Conversion Rate Comparison
-    html += """
+    out.write("""
         <h3>Conversion Rate Analysis: Actual vs Target</h3>
         <table>
             <tr>
@@ -1192,7 +1324,7 @@ def generate_html(data):
                 <th>SAL→SQO Target</th>
                 <th>Gap</th>
             </tr>
-"""
+""")
     for product_name in ["POR", "R360"]:
         health_data = funnel_health.get(product_name, [])
         for row in health_data:
@@ -1200,7 +1332,7 @@ def generate_html(data):
             sql_sal_gap = row.get('actual_sql_to_sal_rate', 0) - row.get('target_sql_to_sal_rate', 0)
             sal_sqo_gap = row.get('actual_sal_to_sqo_rate', 0) - row.get('target_sal_to_sqo_rate', 0)
 
-            html += f"""
+            out.write(f"""
             <tr>
                 <td>{product_name}</td>
                 <td>{row.get('region', '')}</td>
@@ -1214,31 +1346,36 @@ def generate_html(data):
                 <td>{row.get('target_sal_to_sqo_rate', 0):.1f}%</td>
                 <td style="color: {'#dc3545' if sal_sqo_gap < -5 else '#28a745' if sal_sqo_gap > 0 else '#333'}">{sal_sqo_gap:+.1f}%</td>
             </tr>
-"""
-    html += """
+""")
+    out.write("""
         </table>
-"""
+""")
+
+
+def _render_funnel_rca_insights(out, data, model):
+    """Funnel root cause commentary."""
+    funnel_rca_insights = data.get("funnel_rca_insights", {"POR": [], "R360": []})
 
     # RCA Commentary Section (NEW in v2.4.0)
-    html += """
+    out.write("""
         <h2>Root Cause Analysis Commentary</h2>
         <div class="note">
             <strong>Auto-generated insights</strong> based on funnel gaps and conversion rate analysis. Sorted by severity.
         </div>
-"""
+""")
 
     # POR RCA
     por_rca = funnel_rca_insights.get("POR", [])
     if por_rca:
-        html += """
+        out.write("""
         <h3>POR Funnel RCA</h3>
         <div class="rca-section">
-"""
+""")
         for insight in por_rca:
             severity = insight.get("severity", "MEDIUM").lower()
             severity_class = f"severity-{severity}"
 
-            html += f"""
+            out.write(f"""
             <div class="rca-item {severity}">
                 <div class="rca-header">
                     <span class="rca-region">{insight.get('region', '')} - Bottleneck: {insight.get('primary_bottleneck', 'N/A')}</span>
@@ -1250,23 +1387,23 @@ def generate_html(data):
                     Pacing: MQL {insight.get('mql_pacing_pct', 0) or 0}% | SQL {insight.get('sql_pacing_pct', 0) or 0}% | SAL {insight.get('sal_pacing_pct', 0) or 0}% | SQO {insight.get('sqo_pacing_pct', 0) or 0}%
                 </div>
             </div>
-"""
-        html += """
+""")
+        out.write("""
         </div>
-"""
+""")
 
     # R360 RCA
     r360_rca = funnel_rca_insights.get("R360", [])
     if r360_rca:
-        html += """
+        out.write("""
         <h3>R360 Funnel RCA</h3>
         <div class="rca-section">
-"""
+""")
         for insight in r360_rca:
             severity = insight.get("severity", "MEDIUM").lower()
             severity_class = f"severity-{severity}"
 
-            html += f"""
+            out.write(f"""
             <div class="rca-item {severity}">
                 <div class="rca-header">
                     <span class="rca-region">{insight.get('region', '')} - Bottleneck: {insight.get('primary_bottleneck', 'N/A')}</span>
@@ -1278,13 +1415,18 @@ def generate_html(data):
                     Pacing: MQL {insight.get('mql_pacing_pct', 0) or 0}% | SQL {insight.get('sql_pacing_pct', 0) or 0}% | SAL {insight.get('sal_pacing_pct', 0) or 0}% | SQO {insight.get('sqo_pacing_pct', 0) or 0}%
                 </div>
             </div>
-"""
-        html += """
+""")
+        out.write("""
         </div>
-"""
+""")
+
+
+def _render_funnel_trends(out, data, model):
+    """Week-over-week funnel trend table."""
+    funnel_trends = data.get("funnel_trends", {"POR": [], "R360": []})
 
     # Funnel Trend Analysis (WoW) Section
-    html += """
+    out.write("""
         <h2>Funnel Trend Analysis (Week-over-Week)</h2>
         <div class="note">
             <strong>Historical comparison:</strong> Current 7-day period vs prior 7-day period to identify momentum shifts.
@@ -1293,6 +1435,7 @@ def generate_html(data):
             <tr>
                 <th>Product</th>
                 <th>Region</th>
+                <th>Funnel vs Prior</th>
                 <th>MQL (7d)</th>
                 <th>MQL Prior</th>
                 <th>MQL WoW</th>
@@ -1306,7 +1449,7 @@ def generate_html(data):
                 <th>SQO Prior</th>
                 <th>SQO WoW</th>
             </tr>
-"""
+""")
     for product_name in ["POR", "R360"]:
         trend_data = funnel_trends.get(product_name, [])
         for row in trend_data:
@@ -1320,10 +1463,18 @@ def generate_html(data):
             sal_arrow = '↑' if row.get('sal_trend') == 'UP' else '↓' if row.get('sal_trend') == 'DOWN' else '→'
             sqo_arrow = '↑' if row.get('sqo_trend') == 'UP' else '↓' if row.get('sqo_trend') == 'DOWN' else '→'
 
-            html += f"""
+            # MQL -> SQO shape for the current 7 days over the prior 7 days (dashed)
+            funnel_chart = sparkline(
+                [row.get(f'{stage}_current_7d') or 0 for stage in ('mql', 'sql', 'sal', 'sqo')],
+                [row.get(f'{stage}_prior_7d') or 0 for stage in ('mql', 'sql', 'sal', 'sqo')],
+                title="MQL, SQL, SAL, SQO: current 7d (solid) vs prior 7d (dashed)",
+            )
+
+            out.write(f"""
             <tr>
                 <td>{product_name}</td>
                 <td>{row.get('region', '')}</td>
+                <td>{funnel_chart}</td>
                 <td>{row.get('mql_current_7d', 0)}</td>
                 <td>{row.get('mql_prior_7d', 0)}</td>
                 <td style="color: {mql_color}; font-weight: bold;">{mql_arrow} {row.get('mql_wow_change', 0):+d} ({row.get('mql_wow_pct', 0) or 0}%)</td>
@@ -1337,32 +1488,37 @@ def generate_html(data):
                 <td>{row.get('sqo_prior_7d', 0)}</td>
                 <td style="color: {sqo_color}; font-weight: bold;">{sqo_arrow} {row.get('sqo_wow_change', 0):+d} ({row.get('sqo_wow_pct', 0) or 0}%)</td>
             </tr>
-"""
-    html += """
+""")
+    out.write("""
         </table>
-"""
+""")
+
+
+def _render_loss_reason_rca(out, data, model):
+    """Loss reason root cause commentary."""
+    loss_reason_rca = data.get("loss_reason_rca", {"POR": [], "R360": []})
 
     # Loss Reason RCA Section
-    html += """
+    out.write("""
         <h2>Loss Reason Root Cause Analysis</h2>
         <div class="note">
             <strong>Auto-generated insights</strong> based on top close-lost reasons by ACV. Sorted by severity.
         </div>
-"""
+""")
 
     # POR Loss Reason RCA
     por_loss_rca = loss_reason_rca.get("POR", [])
     if por_loss_rca:
-        html += """
+        out.write("""
         <h3>POR Loss Reason RCA</h3>
         <div class="rca-section">
-"""
+""")
         for insight in por_loss_rca:
             severity = insight.get("severity", "MEDIUM").lower()
             severity_class = f"severity-{severity}"
             action_cat = insight.get("action_category", "PROCESS_REVIEW")
 
-            html += f"""
+            out.write(f"""
             <div class="rca-item {severity}">
                 <div class="rca-header">
                     <span class="rca-region">{insight.get('region', '')} - {insight.get('loss_reason', 'Unknown')}</span>
@@ -1373,29 +1529,29 @@ def generate_html(data):
                     {insight.get('deal_count', 0)} deals | {format_currency(insight.get('lost_acv'))} lost | {insight.get('pct_of_regional_loss', 0):.1f}% of regional losses | Action: {action_cat}
                 </div>
             </div>
-"""
-        html += """
+""")
+        out.write("""
         </div>
-"""
+""")
     else:
-        html += """
+        out.write("""
         <h3>POR Loss Reason RCA</h3>
         <p>No significant loss reasons to analyze this quarter.</p>
-"""
+""")
 
     # R360 Loss Reason RCA
     r360_loss_rca = loss_reason_rca.get("R360", [])
     if r360_loss_rca:
-        html += """
+        out.write("""
         <h3>R360 Loss Reason RCA</h3>
         <div class="rca-section">
-"""
+""")
         for insight in r360_loss_rca:
             severity = insight.get("severity", "MEDIUM").lower()
             severity_class = f"severity-{severity}"
             action_cat = insight.get("action_category", "PROCESS_REVIEW")
 
-            html += f"""
+            out.write(f"""
             <div class="rca-item {severity}">
                 <div class="rca-header">
                     <span class="rca-region">{insight.get('region', '')} - {insight.get('loss_reason', 'Unknown')}</span>
@@ -1406,26 +1562,31 @@ def generate_html(data):
                     {insight.get('deal_count', 0)} deals | {format_currency(insight.get('lost_acv'))} lost | {insight.get('pct_of_regional_loss', 0):.1f}% of regional losses | Action: {action_cat}
                 </div>
             </div>
-"""
-        html += """
+""")
+        out.write("""
         </div>
-"""
+""")
     else:
-        html += """
+        out.write("""
         <h3>R360 Loss Reason RCA</h3>
         <p>No significant loss reasons to analyze this quarter.</p>
-"""
+""")
+
+
+def _render_attainment_detail(out, data, model):
+    """Pipeline filter note and detailed attainment tables."""
+    attainment_detail = model.attainment_detail
 
     # Pipeline Analysis
-    html += """
+    out.write("""
         <h2>Pipeline Analysis</h2>
         <div class="filter-note">
             <strong>Filters Applied:</strong> Pipeline includes only opportunities created in last 6 months, owned by AE/AM roles (Account Executive, Account Manager, R360 Sales User).
         </div>
-"""
+""")
 
     # Detailed Attainment Tables
-    html += """
+    out.write("""
         <h3>POR Detailed Attainment by Region/Category</h3>
         <table>
             <tr>
@@ -1442,28 +1603,28 @@ def generate_html(data):
                 <th>Coverage</th>
                 <th>Status</th>
             </tr>
-"""
+""")
 
-    for row in attainment_detail.get("POR", []):
-        rag = row.get("rag_status", "RED")
-        html += f"""
+    for row in attainment_detail["POR"]:
+        rag = row.rag_status
+        out.write(f"""
             <tr>
-                <td>{row.get('region', '')}</td>
-                <td>{row.get('category', '')}</td>
-                <td>{format_currency(row.get('q1_target'))}</td>
-                <td>{format_currency(row.get('qtd_target'))}</td>
-                <td>{format_currency(row.get('qtd_acv'))}</td>
-                <td class="{get_rag_class(rag)}">{format_percent(row.get('qtd_attainment_pct'))}</td>
-                <td style="color: {'#dc3545' if row.get('qtd_gap', 0) < 0 else '#28a745'}">{format_currency(row.get('qtd_gap'))}</td>
-                <td>{format_currency(row.get('pipeline_acv'))}</td>
-                <td>{row.get('pipeline_opps', 0)}</td>
-                <td>{row.get('pipeline_avg_age_days', 0)} days</td>
-                <td>{row.get('pipeline_coverage_x', 0):.1f}x</td>
+                <td>{row.region}</td>
+                <td>{row.category}</td>
+                <td>{format_currency(row.q1_target)}</td>
+                <td>{format_currency(row.qtd_target)}</td>
+                <td>{format_currency(row.qtd_acv)}</td>
+                <td class="{get_rag_class(rag)}">{format_percent(row.qtd_attainment_pct)}</td>
+                <td style="color: {'#dc3545' if row.qtd_gap < 0 else '#28a745'}">{format_currency(row.qtd_gap)}</td>
+                <td>{format_currency(row.pipeline_acv)}</td>
+                <td>{row.pipeline_opps}</td>
+                <td>{row.pipeline_avg_age_days} days</td>
+                <td>{row.pipeline_coverage_x:.1f}x</td>
                 <td class="{get_rag_class(rag)}">{rag}</td>
             </tr>
-"""
+""")
 
-    html += """
+    out.write("""
         </table>
 
         <h3>R360 Detailed Attainment by Region/Category</h3>
@@ -1482,40 +1643,45 @@ def generate_html(data):
                 <th>Coverage</th>
                 <th>Status</th>
             </tr>
-"""
+""")
 
-    for row in attainment_detail.get("R360", []):
-        rag = row.get("rag_status", "RED")
-        html += f"""
+    for row in attainment_detail["R360"]:
+        rag = row.rag_status
+        out.write(f"""
             <tr>
-                <td>{row.get('region', '')}</td>
-                <td>{row.get('category', '')}</td>
-                <td>{format_currency(row.get('q1_target'))}</td>
-                <td>{format_currency(row.get('qtd_target'))}</td>
-                <td>{format_currency(row.get('qtd_acv'))}</td>
-                <td class="{get_rag_class(rag)}">{format_percent(row.get('qtd_attainment_pct'))}</td>
-                <td style="color: {'#dc3545' if row.get('qtd_gap', 0) < 0 else '#28a745'}">{format_currency(row.get('qtd_gap'))}</td>
-                <td>{format_currency(row.get('pipeline_acv'))}</td>
-                <td>{row.get('pipeline_opps', 0)}</td>
-                <td>{row.get('pipeline_avg_age_days', 0)} days</td>
-                <td>{row.get('pipeline_coverage_x', 0):.1f}x</td>
+                <td>{row.region}</td>
+                <td>{row.category}</td>
+                <td>{format_currency(row.q1_target)}</td>
+                <td>{format_currency(row.qtd_target)}</td>
+                <td>{format_currency(row.qtd_acv)}</td>
+                <td class="{get_rag_class(rag)}">{format_percent(row.qtd_attainment_pct)}</td>
+                <td style="color: {'#dc3545' if row.qtd_gap < 0 else '#28a745'}">{format_currency(row.qtd_gap)}</td>
+                <td>{format_currency(row.pipeline_acv)}</td>
+                <td>{row.pipeline_opps}</td>
+                <td>{row.pipeline_avg_age_days} days</td>
+                <td>{row.pipeline_coverage_x:.1f}x</td>
                 <td class="{get_rag_class(rag)}">{rag}</td>
             </tr>
-"""
+""")
 
-    html += """
+    out.write("""
         </table>
-"""
+""")
+
+
+def _render_loss_reasons(out, data, model):
+    """Close lost analysis by loss reason."""
+    loss_reasons = data["loss_reasons"]
 
     # Loss Analysis
-    html += """
+    out.write("""
         <h2>Close Lost Analysis</h2>
-"""
+""")
 
     # R360 Loss Reasons (POR has none in data)
     r360_losses = loss_reasons.get("R360", [])
     if r360_losses:
-        html += """
+        out.write("""
         <h3>R360 Loss Reasons (Top 5 by Region)</h3>
         <table>
             <tr>
@@ -1524,27 +1690,27 @@ def generate_html(data):
                 <th>Deal Count</th>
                 <th>Lost ACV</th>
             </tr>
-"""
+""")
         for row in r360_losses:
-            html += f"""
+            out.write(f"""
             <tr>
                 <td>{row.get('region', '')}</td>
                 <td>{row.get('loss_reason', '')}</td>
                 <td>{row.get('deal_count', 0)}</td>
                 <td>{format_currency(row.get('lost_acv'))}</td>
             </tr>
-"""
-        html += """
+""")
+        out.write("""
         </table>
-"""
+""")
     else:
-        html += """
+        out.write("""
         <p>No lost deals recorded for R360 this quarter.</p>
-"""
+""")
 
     por_losses = loss_reasons.get("POR", [])
     if por_losses:
-        html += """
+        out.write("""
         <h3>POR Loss Reasons (Top 5 by Region)</h3>
         <table>
             <tr>
@@ -1553,31 +1719,37 @@ def generate_html(data):
                 <th>Deal Count</th>
                 <th>Lost ACV</th>
             </tr>
-"""
+""")
         for row in por_losses:
-            html += f"""
+            out.write(f"""
             <tr>
                 <td>{row.get('region', '')}</td>
                 <td>{row.get('loss_reason', '')}</td>
                 <td>{row.get('deal_count', 0)}</td>
                 <td>{format_currency(row.get('lost_acv'))}</td>
             </tr>
-"""
-        html += """
+""")
+        out.write("""
         </table>
-"""
+""")
     else:
-        html += """
+        out.write("""
         <h3>POR Loss Reasons</h3>
         <p>No lost deals recorded for POR this quarter.</p>
-"""
+""")
+
+
+def _render_google_ads(out, data, model):
+    """Google Ads performance table."""
+    google_ads = model.google_ads
 
     # Google Ads Summary
-    html += """
+    out.write("""
         <h2>Google Ads Performance (QTD)</h2>
         <table>
             <tr>
                 <th>Product</th>
+                <th>Region</th>
                 <th>Impressions</th>
                 <th>Clicks</th>
                 <th>CTR</th>
@@ -1586,34 +1758,32 @@ def generate_html(data):
                 <th>Conversions</th>
                 <th>CPA</th>
             </tr>
-"""
+""")
 
-    por_ads = google_ads.get("POR", {})
-    r360_ads = google_ads.get("R360", {})
-
-    html += f"""
-            <tr>
-                <td>POR</td>
-                <td>{por_ads.get('impressions', 0):,}</td>
-                <td>{por_ads.get('clicks', 0):,}</td>
-                <td>{por_ads.get('ctr_pct', 0):.2f}%</td>
-                <td>{format_currency(por_ads.get('ad_spend_usd'))}</td>
-                <td>{format_currency(por_ads.get('cpc_usd'))}</td>
-                <td>{por_ads.get('conversions', 0):.1f}</td>
-                <td>{format_currency(por_ads.get('cpa_usd'))}</td>
-            </tr>
+    for product in ["POR", "R360"]:
+        for ads in google_ads[product]:
+            out.write(f"""
             <tr>
-                <td>R360</td>
-                <td>{r360_ads.get('impressions', 0):,}</td>
-                <td>{r360_ads.get('clicks', 0):,}</td>
-                <td>{r360_ads.get('ctr_pct', 0):.2f}%</td>
-                <td>{format_currency(r360_ads.get('ad_spend_usd'))}</td>
-                <td>{format_currency(r360_ads.get('cpc_usd'))}</td>
-                <td>{r360_ads.get('conversions', 0):.1f}</td>
-                <td>{format_currency(r360_ads.get('cpa_usd'))}</td>
+                <td>{product}</td>
+                <td>{ads.region}</td>
+                <td>{ads.impressions:,}</td>
+                <td>{ads.clicks:,}</td>
+                <td>{ads.ctr_pct:.2f}%</td>
+                <td>{format_currency(ads.ad_spend_usd)}</td>
+                <td>{format_currency(ads.cpc_usd)}</td>
+                <td>{ads.conversions:.1f}</td>
+                <td>{format_currency(ads.cpa_usd)}</td>
             </tr>
+""")
+
+    out.write("""
         </table>
-"""
+""")
+
+
+def _render_pipeline_rca(out, data, model):
+    """Pipeline coverage analysis."""
+    pipeline_rca = data.get("pipeline_rca", {"POR": [], "R360": []})
 
     # ==========================================================================
     # PIPELINE RCA SECTION (NEW in v2.5.0)
@@ -1621,7 +1791,7 @@ def generate_html(data):
     all_pipeline_rca = pipeline_rca.get("POR", []) + pipeline_rca.get("R360", [])
     pipeline_issues = [p for p in all_pipeline_rca if p.get("severity") in ["CRITICAL", "HIGH", "MEDIUM"]]
     if pipeline_issues:
-        html += """
+        out.write("""
         <h2>Pipeline Coverage Analysis</h2>
         <p class="note">Pipeline health and coverage analysis with root cause insights.</p>
         <table>
@@ -1636,14 +1806,14 @@ def generate_html(data):
                 <th>Severity</th>
                 <th>RCA Commentary</th>
             </tr>
-"""
+""")
         for p in pipeline_issues:
             health = p.get("pipeline_health", "")
             health_color = "#28a745" if health == "HEALTHY" else "#ffc107" if health == "ADEQUATE" else "#fd7e14" if health == "AT_RISK" else "#dc3545"
             severity = p.get("severity", "")
             severity_color = "#dc3545" if severity == "CRITICAL" else "#fd7e14" if severity == "HIGH" else "#ffc107"
 
-            html += f"""
+            out.write(f"""
             <tr>
                 <td>{p.get('product', '')}</td>
                 <td>{p.get('region', '')}</td>
@@ -1655,17 +1825,22 @@ def generate_html(data):
                 <td><span style="color: {severity_color}; font-weight: bold;">{severity}</span></td>
                 <td style="font-size: 11px;">{p.get('rca_commentary', '') or ''}</td>
             </tr>
-"""
-        html += """
+""")
+        out.write("""
         </table>
-"""
+""")
+
+
+def _render_trend_rca(out, data, model):
+    """Declining trend RCA table."""
+    trend_rca = data.get("trend_rca", {"POR": [], "R360": []})
 
     # ==========================================================================
     # TREND RCA SECTION (NEW in v2.5.0 - Declining Trends)
     # ==========================================================================
     all_trend_rca = trend_rca.get("POR", []) + trend_rca.get("R360", [])
     if all_trend_rca:
-        html += """
+        out.write("""
         <h2>Trend Analysis RCA</h2>
         <p class="note" style="background: #f8d7da; border-color: #dc3545; color: #721c24;">
             <strong>Alert:</strong> Areas showing declining week-over-week trends requiring investigation.
@@ -1675,13 +1850,14 @@ def generate_html(data):
                 <th>Product</th>
                 <th>Region</th>
                 <th>Declining Stages</th>
+                <th>WoW by Stage</th>
                 <th>MQL WoW</th>
                 <th>SQL WoW</th>
                 <th>Severity</th>
                 <th>RCA Commentary</th>
                 <th>Recommended Action</th>
             </tr>
-"""
+""")
         for t in all_trend_rca:
             severity = t.get("severity", "")
             severity_color = "#dc3545" if severity == "CRITICAL" else "#fd7e14" if severity == "HIGH" else "#ffc107"
@@ -1689,32 +1865,45 @@ def generate_html(data):
 
             mql_pct = t.get("mql_wow_pct") or 0
             sql_pct = t.get("sql_wow_pct") or 0
+            stage_chart = change_bars(
+                [t.get(f"{stage}_wow_pct") or 0 for stage in ("mql", "sql", "sal", "sqo")],
+                ("MQL", "SQL", "SAL", "SQO"),
+            )
 
-            html += f"""
+            out.write(f"""
             <tr>
                 <td>{t.get('product', '')}</td>
                 <td>{t.get('region', '')}</td>
                 <td>{declining} stage{'s' if declining != 1 else ''}</td>
+                <td>{stage_chart}</td>
                 <td style="color: {'#dc3545' if mql_pct < 0 else '#28a745'};">{mql_pct:+.0f}%</td>
                 <td style="color: {'#dc3545' if sql_pct < 0 else '#28a745'};">{sql_pct:+.0f}%</td>
                 <td><span style="color: {severity_color}; font-weight: bold;">{severity}</span></td>
                 <td style="font-size: 11px;">{t.get('rca_commentary', '') or ''}</td>
                 <td style="font-size: 11px; color: #0066cc;">{t.get('recommended_action', '') or ''}</td>
             </tr>
-"""
-        html += """
+""")
+        out.write("""
         </table>
-"""
+""")
+
+
+def _render_google_ads_rca(out, data, model):
+    """Google Ads RCA cards."""
+    google_ads_rca = data.get("google_ads_rca", {"POR": {}, "R360": {}})
 
     # ==========================================================================
     # GOOGLE ADS RCA SECTION (NEW in v2.5.0)
     # ==========================================================================
-    html += """
+    out.write("""
         <h2>Google Ads Performance RCA</h2>
-"""
+""")
     for product in ["POR", "R360"]:
-        ads_rca_data = google_ads_rca.get(product, {})
-        if ads_rca_data:
+        ads_rca_rows = google_ads_rca.get(product, [])
+        # The query returns one RCA row per region; older outputs had a single dict per product
+        if isinstance(ads_rca_rows, dict):
+            ads_rca_rows = [ads_rca_rows] if ads_rca_rows else []
+        for ads_rca_data in ads_rca_rows:
             ctr_perf = ads_rca_data.get("ctr_performance", "")
             cpa_perf = ads_rca_data.get("cpa_performance", "")
             severity = ads_rca_data.get("severity", "LOW")
@@ -1723,10 +1912,10 @@ def generate_html(data):
             cpa_color = "#28a745" if cpa_perf == "EFFICIENT" else "#ffc107" if cpa_perf == "AVERAGE" else "#dc3545"
             border_color = "#28a745" if severity == "LOW" else "#ffc107" if severity == "MEDIUM" else "#dc3545"
 
-            html += f"""
+            out.write(f"""
         <div class="rca-card" style="border-left: 4px solid {border_color}; padding: 15px; margin: 10px 0; background: #f8f9fa; border-radius: 4px;">
             <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                <span style="font-weight: 600; font-size: 14px;">{product} Google Ads</span>
+                <span style="font-weight: 600; font-size: 14px;">{product} Google Ads{f" - {ads_rca_data['region']}" if ads_rca_data.get('region') else ""}</span>
                 <span class="severity {severity.lower()}" style="padding: 3px 8px; border-radius: 3px; font-size: 11px; background: {'#d4edda' if severity == 'LOW' else '#fff3cd' if severity == 'MEDIUM' else '#f8d7da'}; color: {'#155724' if severity == 'LOW' else '#856404' if severity == 'MEDIUM' else '#721c24'};">{severity}</span>
             </div>
             <div style="margin: 10px 0; font-size: 13px;">
@@ -1739,7 +1928,12 @@ def generate_html(data):
                 → {ads_rca_data.get('recommended_action', '')}
             </div>
         </div>
-"""
+""")
+
+
+def _render_action_items(out, data, model):
+    """Consolidated action items by urgency."""
+    action_items = data.get("action_items", {"immediate": [], "short_term": [], "strategic": []})
 
     # ==========================================================================
     # CONSOLIDATED ACTION ITEMS SECTION (NEW in v2.5.0)
@@ -1749,20 +1943,20 @@ def generate_html(data):
     strategic_items = action_items.get("strategic", [])
 
     if immediate_items or short_term_items or strategic_items:
-        html += """
+        out.write("""
         <h2>Recommended Action Items</h2>
         <p class="note">Consolidated action items from all analyses, grouped by urgency.</p>
         <div class="action-section">
-"""
+""")
         # Immediate actions
         if immediate_items:
-            html += """
+            out.write("""
             <div class="action-group immediate">
                 <h4>IMMEDIATE (This Week)</h4>
-"""
+""")
             for item in immediate_items[:5]:  # Limit to top 5
                 severity_class = (item.get("severity") or "").lower()
-                html += f"""
+                out.write(f"""
                 <div class="action-item {severity_class}">
                     <div class="action-meta">
                         <span>{item.get('product', '')}</span>
@@ -1773,20 +1967,20 @@ def generate_html(data):
                     <div class="action-issue">{item.get('issue', '')}</div>
                     <div class="action-text">→ {item.get('action', '')}</div>
                 </div>
-"""
-            html += """
+""")
+            out.write("""
             </div>
-"""
+""")
 
         # Short-term actions
         if short_term_items:
-            html += """
+            out.write("""
             <div class="action-group short-term">
                 <h4>SHORT-TERM (This Month)</h4>
-"""
+""")
             for item in short_term_items[:5]:  # Limit to top 5
                 severity_class = (item.get("severity") or "").lower()
-                html += f"""
+                out.write(f"""
                 <div class="action-item {severity_class}">
                     <div class="action-meta">
                         <span>{item.get('product', '')}</span>
@@ -1796,19 +1990,19 @@ def generate_html(data):
                     <div class="action-issue">{item.get('issue', '')}</div>
                     <div class="action-text">→ {item.get('action', '')}</div>
                 </div>
-"""
-            html += """
+""")
+            out.write("""
             </div>
-"""
+""")
 
         # Strategic actions
         if strategic_items:
-            html += """
+            out.write("""
             <div class="action-group strategic">
                 <h4>STRATEGIC (This Quarter)</h4>
-"""
+""")
             for item in strategic_items[:5]:  # Limit to top 5
-                html += f"""
+                out.write(f"""
                 <div class="action-item">
                     <div class="action-meta">
                         <span>{item.get('product', '')}</span>
@@ -1818,16 +2012,177 @@ def generate_html(data):
                     <div class="action-issue">{item.get('issue', '')}</div>
                     <div class="action-text">→ {item.get('action', '')}</div>
                 </div>
-"""
-            html += """
+""")
+            out.write("""
             </div>
-"""
-        html += """
+""")
+        out.write("""
         </div>
-"""
+""")
+
+
+# Deal list columns: (header, cell kind); "link" cells are [text, url]
+DEAL_COLUMNS = (
+    ("Account", "text"),
+    ("Opportunity", "link"),
+    ("Region", "text"),
+    ("Category", "text"),
+    ("Stage", "text"),
+    ("Owner", "text"),
+    ("Close Date", "text"),
+    ("ACV", "currency"),
+)
+
+# Renders every [data-lazy-table] from its embedded JSON one page at a time,
+# so the page paints in constant time however many rows are embedded
+LAZY_TABLE_SCRIPT = """\
+        <script>
+        (function () {
+            function money(v) { return "$" + Math.round(v || 0).toLocaleString("en-US"); }
+            function esc(v) { return String(v == null ? "" : v).replace(/[&<>"]/g, function (c) { return "&#" + c.charCodeAt(0) + ";"; }); }
+            function text(v, kind) { return kind === "link" ? v[0] : v == null ? "" : v; }
+            function cell(v, kind) {
+                if (kind === "currency") return money(v);
+                if (kind === "link") return v[1] ? '<a href="' + esc(v[1]) + '" target="_blank">' + esc(v[0]) + "</a>" : esc(v[0]);
+                return esc(v);
+            }
+            document.querySelectorAll("[data-lazy-table]").forEach(function (root) {
+                var spec = JSON.parse(root.querySelector("script").textContent);
+                var size = Number(root.getAttribute("data-page-size"));
+                var body = root.querySelector("tbody"), info = root.querySelector(".lazy-table-info");
+                var input = root.querySelector("input"), buttons = root.querySelectorAll("button");
+                var view = spec.rows, page = 0, sortCol = -1, asc = true;
+                function apply() {
+                    var q = input.value.toLowerCase();
+                    view = !q ? spec.rows.slice() : spec.rows.filter(function (r) {
+                        return r.some(function (v, i) { return String(text(v, spec.kinds[i])).toLowerCase().indexOf(q) >= 0; });
+                    });
+                    if (sortCol >= 0) {
+                        var kind = spec.kinds[sortCol];
+                        view.sort(function (a, b) {
+                            var x = text(a[sortCol], kind), y = text(b[sortCol], kind);
+                            return (x < y ? -1 : x > y ? 1 : 0) * (asc ? 1 : -1);
+                        });
+                    }
+                    draw();
+                }
+                function draw() {
+                    var pages = Math.max(1, Math.ceil(view.length / size));
+                    page = Math.max(0, Math.min(page, pages - 1));
+                    body.innerHTML = view.slice(page * size, (page + 1) * size).map(function (r) {
+                        return "<tr>" + r.map(function (v, i) { return "<td>" + cell(v, spec.kinds[i]) + "</td>"; }).join("") + "</tr>";
+                    }).join("");
+                    info.textContent = view.length + " of " + spec.rows.length + " rows, page " + (page + 1) + " of " + pages;
+                }
+                root.querySelectorAll("th").forEach(function (th, i) {
+                    th.addEventListener("click", function () { asc = sortCol === i ? !asc : true; sortCol = i; page = 0; apply(); });
+                });
+                input.addEventListener("input", function () { page = 0; apply(); });
+                buttons[0].addEventListener("click", function () { page -= 1; draw(); });
+                buttons[1].addEventListener("click", function () { page += 1; draw(); });
+                draw();
+            });
+        })();
+        </script>
+"""
+
+
+def _deal_cells(deal):
+    """Return one deal as a row of raw cell values in DEAL_COLUMNS order."""
+    return [
+        deal.account_name,
+        [deal.opportunity_name or deal.opportunity_id, deal.salesforce_url],
+        deal.region,
+        deal.category,
+        deal.stage,
+        deal.owner_name,
+        deal.close_date or "",
+        deal.acv,
+    ]
+
+
+def _render_table(out, columns, rows):
+    """
+    Write a table of raw cell rows.
+
+    Small tables are written as static HTML rows. Tables with at least
+    LAZY_TABLE_MIN_ROWS rows are embedded as compact JSON and rendered a page
+    at a time, with sort and filter, by LAZY_TABLE_SCRIPT. Returns True if
+    the table is lazy.
+    """
+    headers = "".join(f"<th>{html.escape(header)}</th>" for header, _kind in columns)
+    if len(rows) < LAZY_TABLE_MIN_ROWS:
+        out.write(f"""
+        <table>
+            <tr>{headers}</tr>
+""")
+        for row in rows:
+            cells = []
+            for value, (_header, kind) in zip(row, columns):
+                if kind == "currency":
+                    cells.append(format_currency(value))
+                elif kind == "link":
+                    text, url = value
+                    cells.append(f'<a href="{html.escape(url)}" target="_blank">{html.escape(text)}</a>' if url
+                                 else html.escape(text))
+                else:
+                    cells.append(html.escape(str(value if value is not None else "")))
+            out.write("            <tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>\n")
+        out.write("""        </table>
+""")
+        return False
+
+    payload = json.dumps({"kinds": [kind for _header, kind in columns], "rows": rows}, separators=(",", ":"))
+    # Keep a "</script>" inside the data from closing the element
+    payload = payload.replace("</", "<\\/")
+    out.write(f"""
+        <div class="lazy-table" data-lazy-table data-page-size="{LAZY_TABLE_PAGE_SIZE}">
+            <div class="lazy-table-controls">
+                <input type="search" placeholder="Filter rows...">
+                <button type="button">&lsaquo; Prev</button>
+                <button type="button">Next &rsaquo;</button>
+                <span class="lazy-table-info">{len(rows):,} rows</span>
+            </div>
+            <table>
+                <thead><tr>{headers}</tr></thead>
+                <tbody></tbody>
+            </table>
+            <script type="application/json">{payload}</script>
+        </div>
+""")
+    return True
+
+
+def _render_deal_lists(out, data, model):
+    """Won, lost and open pipeline deal lists by product (large lists are paged client-side)."""
+    out.write("""
+        <h2>Deal Lists</h2>
+        <p class="note">Sorted by ACV. Lists with many deals can be filtered, sorted (click a header) and paged.</p>
+""")
+
+    lazy = False
+    for section, label in (("won_deals", "Won Deals"), ("lost_deals", "Lost Deals"), ("pipeline_deals", "Open Pipeline")):
+        for product, deals in getattr(model, section).items():
+            out.write(f"""
+        <h3>{product} {label} ({len(deals):,})</h3>
+""")
+            if not deals:
+                out.write(f"""        <p>No {label.lower()} recorded for {product}.</p>
+""")
+                continue
+            rows = [_deal_cells(deal) for deal in sorted(deals, key=lambda d: -d.acv)]
+            lazy = _render_table(out, DEAL_COLUMNS, rows) or lazy
+
+    if lazy:
+        out.write(LAZY_TABLE_SCRIPT)
+
+
+def _render_footer(out, data, model):
+    """Report footer."""
+    query_version = data.get("query_version", "2.5.0")
 
     # Footer
-    html += f"""
+    out.write(f"""
         <div class="footer">
             <p>Generated by Risk Analysis Report Generator v{query_version}</p>
             <p>Data Source: BigQuery (sfdc.OpportunityViewTable, Staging.StrategicOperatingPlan, Staging.DailyRevenueFunnel)</p>
@@ -1836,34 +2191,216 @@ def generate_html(data):
     </div>
 </body>
 </html>
-"""
-
-    return html
+""")
+
+
+# Report sections in page order: (name, data keys the fragment depends on, renderer).
+# A section with keys can be served from the render cache while those keys are unchanged;
+# the document head carries the generation timestamp and is always rendered.
+REPORT_SECTIONS = (
+    ("document_head", None, _render_document_head),
+    ("executive_summary", ("executive_counts", "grand_total", "quarterly_targets"), _render_executive_summary),
+    ("product_performance", ("product_totals",), _render_product_performance),
+    ("wins_bright_spots", ("wins_bright_spots",), _render_wins_bright_spots),
+    ("momentum_indicators", ("momentum_indicators",), _render_momentum_indicators),
+    ("top_risk_pockets", ("top_risk_pockets",), _render_top_risk_pockets),
+    ("funnel_pacing", ("funnel_pacing",), _render_funnel_pacing),
+    ("funnel_health", ("funnel_health",), _render_funnel_health),
+    ("funnel_rca_insights", ("funnel_rca_insights",), _render_funnel_rca_insights),
+    ("funnel_trends", ("funnel_trends",), _render_funnel_trends),
+    ("loss_reason_rca", ("loss_reason_rca",), _render_loss_reason_rca),
+    ("attainment_detail", ("attainment_detail",), _render_attainment_detail),
+    ("loss_reasons", ("loss_reasons",), _render_loss_reasons),
+    ("google_ads", ("google_ads",), _render_google_ads),
+    ("pipeline_rca", ("pipeline_rca",), _render_pipeline_rca),
+    ("trend_rca", ("trend_rca",), _render_trend_rca),
+    ("google_ads_rca", ("google_ads_rca",), _render_google_ads_rca),
+    ("action_items", ("action_items",), _render_action_items),
+    ("deal_lists", ("won_deals", "lost_deals", "pipeline_deals"), _render_deal_lists),
+    ("footer", ("query_version",), _render_footer),
+)
+
+
+def render_html(data, out, cache=None, stylesheet=None, minify=False):
+    """
+    Write the HTML report for report data (a dict or any Mapping, such as
+    ReportData) to a text stream.
+
+    Sections are written straight to `out` (a file or io.StringIO) instead of
+    being accumulated with string concatenation, so render time stays linear
+    as attainment, funnel, loss and pipeline row counts grow. With a
+    RenderCache, sections whose input data is unchanged are spliced in from
+    cached fragments instead of being re-rendered.
+
+    By default the stylesheet is inlined so the file is self-contained (e.g.
+    for email); pass the href returned by write_stylesheet() to link the shared
+    asset instead. With minify, comments and indentation are stripped from
+    every section (cached fragments are stored unminified).
+
+    Returns {"rendered": n, "cached": n} section counts.
+    """
+    # Row-heavy sections are validated up front and read by attribute
+    model = load_model(data)
+
+    stats = {"rendered": 0, "cached": 0}
+    for name, keys, renderer in REPORT_SECTIONS:
+        if cache is None or keys is None:
+            buffer = io.StringIO() if minify else out
+            if keys is None:
+                # Uncached sections (the document head) also carry the stylesheet markup
+                renderer(buffer, data, model, _style_block(stylesheet, minify))
+            else:
+                renderer(buffer, data, model)
+            if minify:
+                out.write(minify_html(buffer.getvalue()))
+            stats["rendered"] += 1
+            continue
+
+        key = cache.key(name, [data.get(k) for k in keys])
+        fragment = cache.get(key)
+        if fragment is None:
+            buffer = io.StringIO()
+            renderer(buffer, data, model)
+            fragment = buffer.getvalue()
+            cache.put(key, fragment)
+            stats["rendered"] += 1
+        else:
+            stats["cached"] += 1
+        out.write(minify_html(fragment) if minify else fragment)
+    return stats
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate the Q1 2026 risk analysis HTML report")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--from-json", nargs="?", const=str(REPORT_PATH), metavar="PATH",
+                        help="Render an existing report-data.json instead of querying BigQuery "
+                             "(default: data/report-data.json)")
+    source.add_argument("--snapshot", metavar="GENERATION",
+                        help="Render a snapshot generation ('current' for the live one)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-render whenever the artifact or live snapshot changes")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Seconds between change checks in watch mode (default: 1)")
+    parser.add_argument("--no-render-cache", action="store_true",
+                        help="Re-render every section instead of reusing cached fragments")
+    parser.add_argument("--linked-css", action="store_true",
+                        help="Link a shared, content-hashed stylesheet in reports/assets instead of inlining it")
+    parser.add_argument("--minify", action="store_true", help="Strip comments and indentation from the HTML")
+    args = parser.parse_args()
+    if args.watch and not (args.from_json or args.snapshot == "current"):
+        parser.error("--watch needs --from-json or --snapshot current")
+    return args
+
+
+def load_data(args):
+    """Load report data from the source selected on the command line."""
+    if args.from_json:
+        # Opened lazily: the renderers only decode the sections they read
+        return ReportData(args.from_json)
+    if args.snapshot:
+        generation = None if args.snapshot == "current" else args.snapshot
+        return load_generation(generation)
+    return run_bigquery()
+
+
+def source_version(args):
+    """Return a token that changes whenever the watched data source changes."""
+    if args.from_json:
+        try:
+            stat = Path(args.from_json).stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    return current_generation(SNAPSHOT_ROOT)
+
+
+def write_report(data, output_path, cache=None, stylesheet=None, minify=False):
+    """
+    Stream the HTML report to output_path. Returns render_html() section counts.
+
+    The report is streamed to a temp file next to output_path and renamed over
+    it once complete, so a render that fails part-way leaves the previous
+    report in place.
+    """
+    with atomic_open(output_path, "w", encoding="utf-8", buffering=RENDER_BUFFER_BYTES) as f:
+        return render_html(data, f, cache, stylesheet, minify)
+
+
+def watch(args, output_path, cache, stylesheet=None):
+    """Re-render output_path each time the data source changes, until interrupted."""
+    print(f"\nWatching {args.from_json or 'live snapshot'} for changes (Ctrl+C to stop)...")
+    version = source_version(args)
+    failed = None
+    try:
+        while True:
+            time.sleep(args.interval)
+            latest = source_version(args)
+            if latest is None or latest == version:
+                continue
+            start = time.perf_counter()
+            try:
+                data = load_data(args)
+                try:
+                    stats = write_report(data, output_path, cache, stylesheet, args.minify)
+                    report_date = data.get("report_date")
+                finally:
+                    if isinstance(data, ReportData):
+                        data.close()
+            except (OSError, ValueError) as e:
+                # The artifact may be caught mid-write by a non-atomic writer, or fail validation
+                # (ReportValidationError is a ValueError); keep the last report and retry next tick
+                if latest != failed:
+                    print(f"      Skipping render: {e}")
+                    failed = latest
+                continue
+            version = latest
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Re-rendered report for {report_date}: "
+                  f"{stats['rendered']} sections rendered, {stats['cached']} from cache ({elapsed_ms:.0f} ms)")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
 
 
 def main():
+    args = parse_args()
+
     print("=" * 60)
     print("Q1 2026 Bookings Risk Analysis HTML Report Generator")
     print("=" * 60)
 
-    # Run BigQuery
-    print("\n[1/3] Running BigQuery query...")
-    data = run_bigquery()
-    print(f"      Query returned data for report date: {data.get('report_date')}")
-
-    # Generate HTML
-    print("\n[2/3] Generating HTML report...")
-    html = generate_html(data)
+    # Load report data
+    if args.from_json:
+        print(f"\n[1/3] Loading report data from: {args.from_json}")
+    elif args.snapshot:
+        print(f"\n[1/3] Loading snapshot generation: {args.snapshot}")
+    else:
+        print("\n[1/3] Running BigQuery query...")
+    try:
+        data = load_data(args)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"      Loaded data for report date: {data.get('report_date')}")
 
-    # Save to file
+    # Generate HTML straight into the output file
     today = datetime.now().strftime("%Y-%m-%d")
     output_dir = Path(__file__).parent / "reports"
     output_dir.mkdir(exist_ok=True)
     output_path = output_dir / f"Q1_2026_Risk_Report_{today}.html"
 
-    print(f"\n[3/3] Saving report to: {output_path}")
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    cache = None if args.no_render_cache else RenderCache(RENDER_TEMPLATE_VERSION)
+    stylesheet = write_stylesheet(output_dir) if args.linked_css else None
+
+    print(f"\n[2/3] Generating HTML report to: {output_path}")
+    stats = write_report(data, output_path, cache, stylesheet, args.minify)
+    print(f"      Sections rendered: {stats['rendered']}, reused from cache: {stats['cached']}")
+
+    if cache is not None:
+        prune_render_cache()
+
+    print("\n[3/3] Report saved")
 
     # Summary
     print("\n" + "=" * 60)
@@ -1878,6 +2415,9 @@ def main():
     print(f"\nOutput File:    {output_path}")
     print("=" * 60)
 
+    if args.watch:
+        watch(args, output_path, cache, stylesheet)
+
     return output_path
 
 
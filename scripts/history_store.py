@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Report Snapshot History Store
+
+Ingests each refresh of report-data.json into a local SQLite database so that
+historical and period-over-period questions can be answered without going
+back to BigQuery (query_trend_analysis.sql).
+
+Tables:
+    snapshots     one row per snapshot date (report metadata)
+    section_rows  every aggregate row, keyed by snapshot date, section,
+                  product, region, category and source (payload kept as JSON)
+    deals         won/lost/pipeline deal rows normalized into columns
+
+Re-ingesting the same snapshot date replaces that day's rows.
+
+Usage:
+    python scripts/history_store.py ingest [data/report-data.json]
+    python scripts/history_store.py backfill
+    python scripts/history_store.py value grand_total total_qtd_acv --as-of 2026-01-14
+    python scripts/history_store.py series attainment_detail qtd_acv \
+        --product POR --region AMER --category "NEW LOGO"
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+HISTORY_DB = Path(__file__).parent.parent / "data" / "history.db"
+
+PRODUCTS = ("POR", "R360")
+
+DEAL_SECTIONS = {
+    "won_deals": "won",
+    "lost_deals": "lost",
+    "pipeline_deals": "pipeline",
+}
+
+DEAL_COLUMNS = [
+    "opportunity_id", "account_name", "opportunity_name", "product", "region",
+    "category", "deal_type", "acv", "close_date", "stage", "loss_reason",
+    "source", "owner_name", "owner_id", "salesforce_url",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_date     TEXT PRIMARY KEY,
+    generated_at_utc  TEXT,
+    percentile        TEXT,
+    query_version     TEXT,
+    ingested_at_utc   TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS section_rows (
+    snapshot_date  TEXT NOT NULL REFERENCES snapshots(snapshot_date) ON DELETE CASCADE,
+    section        TEXT NOT NULL,
+    group_key      TEXT,
+    product        TEXT,
+    region         TEXT,
+    category       TEXT,
+    source         TEXT,
+    row_idx        INTEGER NOT NULL,
+    payload        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_section_rows_lookup
+    ON section_rows (section, product, region, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_section_rows_date
+    ON section_rows (snapshot_date, section);
+
+CREATE TABLE IF NOT EXISTS deals (
+    snapshot_date     TEXT NOT NULL REFERENCES snapshots(snapshot_date) ON DELETE CASCADE,
+    status            TEXT NOT NULL,
+    opportunity_id    TEXT NOT NULL,
+    account_name      TEXT,
+    opportunity_name  TEXT,
+    product           TEXT,
+    region            TEXT,
+    category          TEXT,
+    deal_type         TEXT,
+    acv               REAL,
+    close_date        TEXT,
+    stage             TEXT,
+    loss_reason       TEXT,
+    source            TEXT,
+    owner_name        TEXT,
+    owner_id          TEXT,
+    salesforce_url    TEXT,
+    PRIMARY KEY (snapshot_date, status, opportunity_id)
+);
+CREATE INDEX IF NOT EXISTS idx_deals_opportunity
+    ON deals (opportunity_id, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_deals_segment
+    ON deals (product, region, status, snapshot_date);
+"""
+
+
+def connect(db_path=HISTORY_DB):
+    """Open (and if needed create) the history database."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _section_rows(section, value):
+    """Flatten one report section into (group_key, row) pairs."""
+    if isinstance(value, list):
+        for row in value:
+            yield None, row
+    elif isinstance(value, dict):
+        if value and all(isinstance(v, (list, dict)) for v in value.values()):
+            # Keyed by product (or by urgency for action_items)
+            for key, inner in value.items():
+                rows = inner if isinstance(inner, list) else [inner]
+                for row in rows:
+                    yield key, row
+        else:
+            yield None, value
+
+
+def _row_key(group_key, row, column):
+    if not isinstance(row, dict):
+        return None
+    value = row.get(column)
+    if value is None and column == "product" and group_key in PRODUCTS:
+        return group_key
+    return value
+
+
+def ingest(data, conn):
+    """Store one report snapshot. Returns the snapshot date that was written."""
+    snapshot_date = data.get("report_date") or data.get("period", {}).get("as_of_date")
+    if not snapshot_date:
+        raise ValueError("Report data has no report_date; cannot key the snapshot")
+
+    with conn:
+        conn.execute("DELETE FROM snapshots WHERE snapshot_date = ?", (snapshot_date,))
+        conn.execute(
+            "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?)",
+            (
+                snapshot_date,
+                data.get("generated_at_utc"),
+                data.get("percentile"),
+                data.get("query_version"),
+                datetime.utcnow().isoformat(),
+            ),
+        )
+
+        section_batch = []
+        deal_batch = []
+        duplicates = []
+        seen = set()
+        for section, value in data.items():
+            if section in DEAL_SECTIONS:
+                status = DEAL_SECTIONS[section]
+                for group_key, deal in _section_rows(section, value):
+                    row = (snapshot_date, status) + tuple(_row_key(group_key, deal, col) for col in DEAL_COLUMNS)
+                    # (status, opportunity_id) is part of the primary key; a second row would overwrite the first
+                    if row[1:3] in seen:
+                        duplicates.append(row[2])
+                    seen.add(row[1:3])
+                    deal_batch.append(row)
+                continue
+            if not isinstance(value, (list, dict)):
+                continue
+            for idx, (group_key, row) in enumerate(_section_rows(section, value)):
+                section_batch.append((
+                    snapshot_date,
+                    section,
+                    group_key,
+                    _row_key(group_key, row, "product"),
+                    _row_key(group_key, row, "region"),
+                    _row_key(group_key, row, "category"),
+                    _row_key(group_key, row, "source"),
+                    idx,
+                    json.dumps(row),
+                ))
+
+        if duplicates:
+            raise ValueError(
+                f"Snapshot {snapshot_date} lists {len(duplicates)} duplicate deal(s) "
+                f"({', '.join(sorted(set(duplicates))[:5])}); not ingested"
+            )
+
+        conn.executemany("INSERT INTO section_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", section_batch)
+        conn.executemany(
+            f"INSERT INTO deals VALUES ({', '.join('?' * (len(DEAL_COLUMNS) + 2))})",
+            deal_batch,
+        )
+
+    return snapshot_date
+
+
+def snapshot_dates(conn):
+    """Return all ingested snapshot dates, oldest first."""
+    return [r[0] for r in conn.execute("SELECT snapshot_date FROM snapshots ORDER BY snapshot_date")]
+
+
+def resolve_as_of(conn, as_of):
+    """Return the latest snapshot date on or before as_of, or None."""
+    row = conn.execute(
+        "SELECT MAX(snapshot_date) FROM snapshots WHERE snapshot_date <= ?", (as_of,)
+    ).fetchone()
+    return row[0]
+
+
+_KEY_FILTER = """
+    AND (:group_key IS NULL OR group_key = :group_key)
+    AND (:product IS NULL OR product = :product)
+    AND (:region IS NULL OR region = :region)
+    AND (:category IS NULL OR category = :category)
+    AND (:source IS NULL OR source = :source)
+"""
+
+
+def rows_as_of(conn, section, as_of, product=None, region=None, category=None, source=None, group_key=None):
+    """Return the section rows (as dicts) from the latest snapshot on or before as_of."""
+    snapshot_date = resolve_as_of(conn, as_of)
+    if snapshot_date is None:
+        return []
+    cursor = conn.execute(
+        "SELECT payload FROM section_rows WHERE snapshot_date = :snapshot_date AND section = :section"
+        + _KEY_FILTER + " ORDER BY row_idx",
+        {
+            "snapshot_date": snapshot_date, "section": section, "group_key": group_key,
+            "product": product, "region": region, "category": category, "source": source,
+        },
+    )
+    return [json.loads(r[0]) for r in cursor]
+
+
+def value_as_of(conn, section, field, as_of, **keys):
+    """
+    Return the value of `field` in `section` as of a date.
+
+    Key filters (product, region, category, source, group_key) must narrow the
+    section to a single row; returns None if no row matches.
+    """
+    rows = rows_as_of(conn, section, as_of, **keys)
+    if not rows:
+        return None
+    if len(rows) > 1:
+        raise ValueError(
+            f"{section} has {len(rows)} rows as of {as_of} for {keys}; "
+            "add product/region/category/source filters"
+        )
+    return rows[0].get(field)
+
+
+def series(conn, section, field, start=None, end=None, product=None, region=None,
+           category=None, source=None, group_key=None):
+    """
+    Return [(snapshot_date, value)] for one section field across snapshots.
+
+    As with value_as_of(), the key filters must narrow the section to a single
+    row per snapshot; raises ValueError otherwise.
+    """
+    params = {
+        "section": section, "path": f'$."{field}"', "start": start, "end": end,
+        "group_key": group_key, "product": product, "region": region,
+        "category": category, "source": source,
+    }
+    cursor = conn.execute(
+        "SELECT snapshot_date, COUNT(*), MAX(json_extract(payload, :path)) FROM section_rows"
+        " WHERE section = :section"
+        " AND (:start IS NULL OR snapshot_date >= :start)"
+        " AND (:end IS NULL OR snapshot_date <= :end)"
+        + _KEY_FILTER + " GROUP BY snapshot_date ORDER BY snapshot_date",
+        params,
+    )
+    points = []
+    for snapshot_date, count, value in cursor:
+        if count > 1:
+            keys = {"product": product, "region": region, "category": category, "source": source,
+                    "group_key": group_key}
+            raise ValueError(
+                f"{section} has {count} rows on {snapshot_date} for {keys}; "
+                "add product/region/category/source filters"
+            )
+        points.append((snapshot_date, value))
+    return points
+
+
+def deals_as_of(conn, as_of, status=None, product=None, region=None):
+    """Return deal rows from the latest snapshot on or before as_of."""
+    snapshot_date = resolve_as_of(conn, as_of)
+    if snapshot_date is None:
+        return []
+    cursor = conn.execute(
+        "SELECT * FROM deals WHERE snapshot_date = :snapshot_date"
+        " AND (:status IS NULL OR status = :status)"
+        " AND (:product IS NULL OR product = :product)"
+        " AND (:region IS NULL OR region = :region)"
+        " ORDER BY acv DESC",
+        {"snapshot_date": snapshot_date, "status": status, "product": product, "region": region},
+    )
+    return [dict(r) for r in cursor]
+
+
+def deal_history(conn, opportunity_id):
+    """Return every recorded state of one opportunity, oldest first."""
+    cursor = conn.execute(
+        "SELECT * FROM deals WHERE opportunity_id = ? ORDER BY snapshot_date", (opportunity_id,)
+    )
+    return [dict(r) for r in cursor]
+
+
+def backfill(conn):
+    """Ingest every retained snapshot generation. Returns the dates ingested."""
+    from snapshot_store import list_generations, load_generation
+
+    dates = []
+    for generation in list_generations():
+        dates.append(ingest(load_generation(generation), conn))
+    return dates
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Local SQLite history of report snapshots")
+    parser.add_argument("--db", default=str(HISTORY_DB), help="History database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="Ingest a report-data.json file")
+    p_ingest.add_argument("path", nargs="?", default=str(Path(__file__).parent.parent / "data" / "report-data.json"))
+
+    sub.add_parser("backfill", help="Ingest all retained snapshot generations")
+    sub.add_parser("dates", help="List ingested snapshot dates")
+
+    for name in ("value", "series"):
+        p = sub.add_parser(name, help=f"Query a section field ({name})")
+        p.add_argument("section")
+        p.add_argument("field")
+        p.add_argument("--as-of", default=datetime.now().strftime("%Y-%m-%d"))
+        p.add_argument("--start")
+        p.add_argument("--end")
+        p.add_argument("--product")
+        p.add_argument("--region")
+        p.add_argument("--category")
+        p.add_argument("--source")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    conn = connect(args.db)
+
+    if args.command == "ingest":
+        with open(args.path, "r") as f:
+            data = json.load(f)
+        try:
+            print(f"Ingested snapshot {ingest(data, conn)} into {args.db}")
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    elif args.command == "backfill":
+        try:
+            dates = backfill(conn)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Ingested {len(dates)} snapshots into {args.db}")
+    elif args.command == "dates":
+        for snapshot_date in snapshot_dates(conn):
+            print(snapshot_date)
+    else:
+        keys = {
+            "product": args.product, "region": args.region,
+            "category": args.category, "source": args.source,
+        }
+        if args.command == "value":
+            try:
+                print(value_as_of(conn, args.section, args.field, args.as_of, **keys))
+            except ValueError as e:
+                print(f"Error: {e}")
+                return 1
+        else:
+            try:
+                points = series(conn, args.section, args.field, args.start, args.end, **keys)
+            except ValueError as e:
+                print(f"Error: {e}")
+                return 1
+            for snapshot_date, value in points:
+                print(f"{snapshot_date}  {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
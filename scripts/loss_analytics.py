@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Incremental Loss Analytics
+
+Keeps running closed-lost aggregates per quarter by product x region x loss
+reason and by product x competitor, so loss_reasons, loss_reason_rca and
+competitor_losses can be rebuilt from the aggregates for any quarter, or
+across quarters, without rescanning closed-lost history.
+
+Each refresh is folded in by update(): deals seen for the first time are
+added, deals whose reason, competitor, ACV or region changed are moved, and
+deals from the report's quarter-to-date window that are no longer closed-lost
+(reopened) are taken out. Only those deals touch the aggregates. A small
+ledger of the deals already counted is kept for this.
+
+sections() then ranks reasons and recomputes pct_of_regional_loss (share of
+the region's top three reasons, as the query's window runs after its filter),
+severity, commentary and action category with the query's rules
+(query_comprehensive_risk_analysis.sql, loss_reason_rca).
+
+The deal lists do not carry PrimaryCompetitorName yet; deals without a
+competitor field count as lost_to_competitor "No" / "Not Captured", as in
+the query.
+
+Usage:
+    python scripts/loss_analytics.py update [data/report-data.json]
+    python scripts/loss_analytics.py verify [data/report-data.json]   # compare with the SQL sections
+    python scripts/loss_analytics.py show --quarter 2026-01-01
+    python scripts/loss_analytics.py show --all-quarters
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+from aggregation_engine import compare, safe_divide, sql_round
+from snapshot_store import atomic_write_json
+
+
+LOSS_ANALYTICS_PATH = Path(__file__).parent.parent / "data" / "loss-analytics.json"
+REPORT_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+STORE_VERSION = 1
+PRODUCTS = ("POR", "R360")
+
+LOSS_REASON_LIMIT = 5
+RCA_REASON_LIMIT = 3
+COMPETITOR_LIMIT = 10
+SEVERITY_ORDER = {"CRITICAL": 1, "HIGH": 2, "MEDIUM": 3, "LOW": 4}
+
+# Ledger record fields
+CLOSE_DATE, PRODUCT, REGION, REASON, COMPETITOR, ACV = range(6)
+
+
+def quarter_of(iso_date):
+    """First day of the quarter containing iso_date."""
+    day = date.fromisoformat(iso_date[:10])
+    return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1).isoformat()
+
+
+def new_store():
+    return {"version": STORE_VERSION, "last_snapshot": None, "deals": {}, "reasons": {}, "competitors": {}}
+
+
+def load_store(path=LOSS_ANALYTICS_PATH):
+    """Return the saved store, or a new empty one."""
+    path = Path(path)
+    if not path.exists():
+        return new_store()
+    with open(path, "r") as f:
+        store = json.load(f)
+    if store.get("version") != STORE_VERSION:
+        raise ValueError(f"{path} has store version {store.get('version')}, expected {STORE_VERSION}")
+    return store
+
+
+def save_store(store, path=LOSS_ANALYTICS_PATH):
+    atomic_write_json(Path(path), store)
+
+
+def _record(deal):
+    return [
+        deal["close_date"][:10],
+        deal.get("product"),
+        deal.get("region"),
+        deal.get("loss_reason") or "Not Specified",
+        deal.get("competitor") or "Not Captured",
+        deal.get("acv") or 0,
+    ]
+
+
+def _apply(store, record, sign):
+    quarter = quarter_of(record[CLOSE_DATE])
+    reasons = store["reasons"].setdefault(quarter, {})
+    key = f"{record[PRODUCT]}|{record[REGION]}|{record[REASON]}"
+    totals = reasons.setdefault(key, [0, 0])
+    totals[0] += sign
+    totals[1] = sql_round(totals[1] + sign * record[ACV], 2)
+    if not totals[0]:
+        del reasons[key]
+
+    competitors = store["competitors"].setdefault(quarter, {})
+    lost_to = "No" if record[COMPETITOR] == "Not Captured" else "Yes"
+    key = f"{record[PRODUCT]}|{lost_to}|{record[COMPETITOR]}"
+    totals = competitors.setdefault(key, [0, 0])
+    totals[0] += sign
+    totals[1] = sql_round(totals[1] + sign * record[ACV], 2)
+    if not totals[0]:
+        del competitors[key]
+
+
+def update(store, data):
+    """
+    Fold one report's closed-lost deals into the store.
+
+    Returns {"added": n, "changed": n, "removed": n}.
+    """
+    period = data["period"]
+    start, end = period["quarter_start"], period["as_of_date"]
+    current = {}
+    for deals in (data.get("lost_deals") or {}).values():
+        for deal in deals:
+            if deal.get("close_date") and (deal.get("acv") or 0) > 0:
+                current[deal["opportunity_id"]] = _record(deal)
+
+    counts = {"added": 0, "changed": 0, "removed": 0}
+    ledger = store["deals"]
+    for deal_id, record in current.items():
+        previous = ledger.get(deal_id)
+        if previous == record:
+            continue
+        if previous is not None:
+            _apply(store, previous, -1)
+        _apply(store, record, 1)
+        ledger[deal_id] = record
+        counts["changed" if previous is not None else "added"] += 1
+
+    # Deals the report window covers but no longer lists were reopened or re-staged
+    for deal_id in [d for d, r in ledger.items() if start <= r[CLOSE_DATE] <= end and d not in current]:
+        _apply(store, ledger.pop(deal_id), -1)
+        counts["removed"] += 1
+
+    store["last_snapshot"] = max(store["last_snapshot"] or end, end)
+    return counts
+
+
+def _like(reason, *fragments):
+    lowered = reason.lower()
+    return any(fragment in lowered for fragment in fragments)
+
+
+def rca_commentary(reason, deal_count, lost_acv):
+    """The query's auto-generated commentary for a loss reason."""
+    acv = sql_round(lost_acv)
+    if _like(reason, "price", "cost", "budget"):
+        return (f"Pricing sensitivity: {reason} accounts for ${acv} ({deal_count} deals). "
+                "Review competitive pricing and value proposition.")
+    if _like(reason, "competitor", "alternative"):
+        return f"Competitive loss: {reason} - ${acv}. Analyze competitor strengths and adjust positioning."
+    if _like(reason, "timing", "no decision", "stalled"):
+        return f"Deal stall: {reason} - ${acv}. Improve urgency creation and follow-up cadence."
+    if _like(reason, "feature", "functionality", "capability"):
+        return f"Feature gap: {reason} - ${acv}. Escalate to Product for roadmap consideration."
+    if _like(reason, "implementation", "complex", "resource"):
+        return f"Implementation concern: {reason} - ${acv}. Review onboarding messaging and support offerings."
+    return f"{reason}: ${acv} ({deal_count} deals). Review and categorize for actionable insights."
+
+
+def severity(lost_acv):
+    if lost_acv >= 50000:
+        return "CRITICAL"
+    if lost_acv >= 20000:
+        return "HIGH"
+    if lost_acv >= 10000:
+        return "MEDIUM"
+    return "LOW"
+
+
+def action_category(reason):
+    if _like(reason, "price", "cost", "budget"):
+        return "PRICING_REVIEW"
+    if _like(reason, "competitor"):
+        return "COMPETITIVE_INTEL"
+    if _like(reason, "timing", "no decision"):
+        return "SALES_PROCESS"
+    if _like(reason, "feature", "functionality"):
+        return "PRODUCT_FEEDBACK"
+    return "PROCESS_REVIEW"
+
+
+def _combined(store, kind, quarters):
+    totals = {}
+    for quarter in quarters:
+        for key, (count, acv) in store[kind].get(quarter, {}).items():
+            entry = totals.setdefault(key, [0, 0])
+            entry[0] += count
+            entry[1] = sql_round(entry[1] + acv, 2)
+    return totals
+
+
+def sections(store, quarters):
+    """Return loss_reasons, loss_reason_rca and competitor_losses over the given quarters."""
+    by_region = {}
+    for key, (count, acv) in _combined(store, "reasons", quarters).items():
+        product, region, reason = key.split("|", 2)
+        by_region.setdefault((product, region), []).append(
+            {"product": product, "region": region, "loss_reason": reason, "deal_count": count, "lost_acv": acv})
+
+    loss_reasons = {product: [] for product in PRODUCTS}
+    loss_reason_rca = {product: [] for product in PRODUCTS}
+    for (product, region), rows in sorted(by_region.items()):
+        rows.sort(key=lambda r: (-r["lost_acv"], r["loss_reason"]))
+        loss_reasons.setdefault(product, []).extend(rows[:LOSS_REASON_LIMIT])
+        # As in the query, the regional total is taken after the top-3 filter
+        top = rows[:RCA_REASON_LIMIT]
+        regional = sum(r["lost_acv"] for r in top)
+        for rank, row in enumerate(top, start=1):
+            share = safe_divide(row["lost_acv"], regional)
+            loss_reason_rca.setdefault(product, []).append(dict(row, **{
+                "pct_of_regional_loss": sql_round(share * 100, 1) if share is not None else None,
+                "rca_commentary": rca_commentary(row["loss_reason"], row["deal_count"], row["lost_acv"]),
+                "severity": severity(row["lost_acv"]),
+                "action_category": action_category(row["loss_reason"]),
+                "_rank": rank,
+            }))
+    for product, rows in loss_reason_rca.items():
+        rows.sort(key=lambda r: (SEVERITY_ORDER[r["severity"]], r["region"], r["_rank"]))
+        for row in rows:
+            del row["_rank"]
+
+    competitor_losses = []
+    for key, (count, acv) in _combined(store, "competitors", quarters).items():
+        product, lost_to, competitor = key.split("|", 2)
+        competitor_losses.append({"product": product, "lost_to_competitor": lost_to, "competitor": competitor,
+                                  "deal_count": count, "lost_acv": acv})
+    competitor_losses.sort(key=lambda r: (-r["lost_acv"], r["product"], r["competitor"]))
+
+    return {
+        "loss_reason_rca": loss_reason_rca,
+        "loss_reasons": loss_reasons,
+        "competitor_losses": competitor_losses[:COMPETITOR_LIMIT],
+    }
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Incremental closed-lost analytics")
+    parser.add_argument("--store", default=str(LOSS_ANALYTICS_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("update", "Fold a report's lost deals into the store"),
+                            ("verify", "Rebuild the sections from a report and compare with the SQL output")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("path", nargs="?", default=str(REPORT_PATH))
+    p_show = sub.add_parser("show", help="Print the sections for stored quarters")
+    p_show.add_argument("--quarter", help="Quarter start date (default: latest)")
+    p_show.add_argument("--all-quarters", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    if args.command == "verify":
+        with open(args.path, "r") as f:
+            data = json.load(f)
+        store = new_store()
+        update(store, data)
+        differences = []
+        for name, section in sections(store, [data["period"]["quarter_start"]]).items():
+            differences.extend(compare(data.get(name), section, name))
+        for line in differences:
+            print(line)
+        print(f"Loss analytics: {len(differences)} differences from the SQL output")
+        return 1 if differences else 0
+
+    try:
+        store = load_store(args.store)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.command == "update":
+        with open(args.path, "r") as f:
+            data = json.load(f)
+        counts = update(store, data)
+        save_store(store, args.store)
+        print(f"Loss analytics updated through {store['last_snapshot']}: {counts['added']} added, "
+              f"{counts['changed']} changed, {counts['removed']} removed ({len(store['deals'])} deals tracked)")
+        return 0
+
+    quarters = sorted(store["reasons"])
+    if not quarters:
+        print(f"Error: no loss analytics at {args.store}; run 'update' first")
+        return 1
+    if not args.all_quarters:
+        quarters = [args.quarter or quarters[-1]]
+    print(json.dumps(sections(store, quarters), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
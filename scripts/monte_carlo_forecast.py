@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Quarter-End Forecast
+
+Simulates quarter outcomes from the open pipeline and reports P10/P50/P90
+quarter-end attainment per product x region x category, per product and
+overall, in place of the static pipeline_coverage_x.
+
+Each open deal closing by quarter end is won with probability
+
+    stage prior  x  segment lift
+
+The stage prior comes from STAGE_WIN_PROBABILITY (closed deals carry no stage
+history, so per-stage rates cannot be learned from them). The segment lift is
+learned from won_deals and lost_deals: the segment's win rate over its
+product's, both smoothed toward PRIOR_WIN_RATE so thin segments are not
+all-or-nothing. Deals whose close date has already passed are discounted by
+PAST_DUE_FACTOR. Won deals add their ACV to the segment's QTD actuals.
+
+Trials are split into fixed chunks, each with its own seed, and spread across
+a process pool. Results are therefore reproducible for a given --seed
+whatever the worker count.
+
+Usage:
+    python scripts/monte_carlo_forecast.py
+    python scripts/monte_carlo_forecast.py --trials 50000 --workers 8 -o forecast.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+from aggregation_engine import DealColumns, aggregate, sql_round, targets_from_report
+
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+
+STAGE_WIN_PROBABILITY = {
+    "Discovery": 0.10, "Qualification": 0.10, "Stage 1": 0.10,
+    "Demonstration": 0.20, "Stage 2": 0.20,
+    "Trial": 0.25,
+    "Proposal": 0.35, "Stage 3": 0.35,
+    "Negotiation": 0.50, "Stage 4": 0.50,
+    "Fortification": 0.60,
+    "Contract Out": 0.75, "Stage 5": 0.75,
+    "Verbal Commitment": 0.85,
+}
+DEFAULT_STAGE_PROBABILITY = 0.20
+PRIOR_WIN_RATE = 0.30
+PRIOR_STRENGTH = 20
+PAST_DUE_FACTOR = 0.5
+MAX_PROBABILITY = 0.95
+
+DEFAULT_TRIALS = 20000
+TRIAL_CHUNKS = 32
+PERCENTILES = (10, 50, 90)
+
+
+def _smoothed_rate(won, lost):
+    return (won + PRIOR_WIN_RATE * PRIOR_STRENGTH) / (won + lost + PRIOR_STRENGTH)
+
+
+def win_probabilities(data):
+    """Return {(product, region, category): lift} learned from won and lost deals."""
+    counts = {}
+    for section, index in (("won_deals", 0), ("lost_deals", 1)):
+        for deals in (data.get(section) or {}).values():
+            for deal in deals:
+                for key in ((deal["product"], deal["region"], deal["category"]), (deal["product"],)):
+                    counts.setdefault(key, [0, 0])[index] += 1
+    return {
+        key: _smoothed_rate(*counts[key]) / _smoothed_rate(*counts[(key[0],)])
+        for key in counts if len(key) == 3
+    }
+
+
+def quarter_end(period):
+    """Return the last day of the report quarter as an ISO date."""
+    start = date.fromisoformat(period["quarter_start"])
+    return (start + timedelta(days=period["total_days"] - 1)).isoformat()
+
+
+def build_model(data):
+    """
+    Return the simulation inputs.
+
+    {"segments": [{product, region, category, q1_target, qtd_acv}],
+     "deals": [[(probability, acv), ...] per segment]}
+    """
+    period = data["period"]
+    sections = aggregate(DealColumns.from_report(data), targets_from_report(data), period)
+    lifts = win_probabilities(data)
+    end = quarter_end(period)
+    as_of = period["as_of_date"]
+
+    segments, index = [], {}
+    for rows in sections["attainment_detail"].values():
+        for row in rows:
+            index[(row["product"], row["region"], row["category"])] = len(segments)
+            segments.append({key: row[key] for key in ("product", "region", "category", "q1_target", "qtd_acv")})
+
+    deals = [[] for _ in segments]
+    for product_deals in (data.get("pipeline_deals") or {}).values():
+        for deal in product_deals:
+            key = (deal["product"], deal["region"], deal["category"])
+            if key not in index or (deal.get("close_date") or end) > end:
+                continue
+            probability = STAGE_WIN_PROBABILITY.get(deal.get("stage"), DEFAULT_STAGE_PROBABILITY)
+            probability *= lifts.get(key, 1.0)
+            if (deal.get("close_date") or end) < as_of:
+                probability *= PAST_DUE_FACTOR
+            deals[index[key]].append((min(probability, MAX_PROBABILITY), deal.get("acv") or 0))
+    return {"segments": segments, "deals": deals}
+
+
+# Per-process state, set once by the pool initializer
+_worker_deals = None
+
+
+def _init_worker(deals):
+    global _worker_deals
+    _worker_deals = deals
+
+
+def _simulate_chunk(seed, trials):
+    """Return per-segment lists of simulated won ACV for one chunk of trials."""
+    rng = random.Random(seed)
+    rand = rng.random
+    results = []
+    for segment_deals in _worker_deals:
+        results.append([sum(acv for p, acv in segment_deals if rand() < p) for _ in range(trials)])
+    return results
+
+
+def _percentile(ordered, pct):
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def _summary(labels, q1_target, qtd_acv, outcomes, pipeline_count):
+    ordered = sorted(outcomes)
+    row = dict(labels)
+    row.update({
+        "q1_target": q1_target,
+        "qtd_acv": qtd_acv,
+        "forecast_deals": pipeline_count,
+        "expected_acv": sql_round(qtd_acv + sum(ordered) / len(ordered), 2),
+    })
+    for pct in PERCENTILES:
+        acv = qtd_acv + _percentile(ordered, pct)
+        row[f"p{pct}_acv"] = sql_round(acv, 2)
+        row[f"p{pct}_attainment_pct"] = sql_round(acv / q1_target * 100, 1) if q1_target else None
+    row["prob_hit_target"] = sql_round(sum(1 for v in ordered if qtd_acv + v >= q1_target) / len(ordered) * 100, 1)
+    return row
+
+
+def forecast(data, trials=DEFAULT_TRIALS, workers=None, seed=42):
+    """Run the simulation. Returns {"segments": [...], "products": [...], "total": {...}}."""
+    if trials < 1:
+        raise ValueError(f"trials must be at least 1, got {trials}")
+    model = build_model(data)
+    segments, deals = model["segments"], model["deals"]
+    chunks = [trials // TRIAL_CHUNKS + (i < trials % TRIAL_CHUNKS) for i in range(TRIAL_CHUNKS)]
+    chunks = [(seed * TRIAL_CHUNKS + i, n) for i, n in enumerate(chunks) if n]
+
+    if workers == 1:
+        _init_worker(deals)
+        parts = [_simulate_chunk(s, n) for s, n in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(deals,)) as pool:
+            parts = list(pool.map(_simulate_chunk, *zip(*chunks)))
+    outcomes = [[v for part in parts for v in part[i]] for i in range(len(segments))]
+
+    result = {"trials": trials, "segments": [], "products": []}
+    for segment, values, segment_deals in zip(segments, outcomes, deals):
+        labels = {key: segment[key] for key in ("product", "region", "category")}
+        result["segments"].append(_summary(labels, segment["q1_target"], segment["qtd_acv"], values,
+                                           len(segment_deals)))
+
+    def combined(labels, members):
+        return _summary(labels, sum(segments[i]["q1_target"] for i in members),
+                        sum(segments[i]["qtd_acv"] for i in members),
+                        [sum(trial) for trial in zip(*(outcomes[i] for i in members))],
+                        sum(len(deals[i]) for i in members))
+
+    for product in sorted({s["product"] for s in segments}):
+        members = [i for i, s in enumerate(segments) if s["product"] == product]
+        result["products"].append(combined({"product": product}, members))
+    result["total"] = combined({"product": "ALL"}, range(len(segments)))
+    return result
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Monte Carlo quarter-end attainment forecast")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", help="Write the forecast here as JSON")
+    args = parser.parse_args()
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+    return args
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    with open(args.data, "r") as f:
+        data = json.load(f)
+
+    start = time.perf_counter()
+    result = forecast(data, args.trials, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 100)
+    print(f"QUARTER-END FORECAST ({args.trials:,} trials, {args.workers or os.cpu_count()} workers, "
+          f"{elapsed:.2f}s)")
+    print("=" * 100)
+    print(f"{'Segment':<28} {'Q1 Target':>12} {'QTD ACV':>12} {'Deals':>6} "
+          f"{'P10':>7} {'P50':>7} {'P90':>7} {'P(hit)':>7}")
+    for row in result["segments"] + result["products"] + [result["total"]]:
+        name = " ".join(str(row[k]) for k in ("product", "region", "category") if k in row)
+        print(f"{name:<28} ${row['q1_target']:>11,.0f} ${row['qtd_acv']:>11,.0f} {row['forecast_deals']:>6} "
+              + " ".join(f"{row[f'p{p}_attainment_pct'] or 0:>6.1f}%" for p in PERCENTILES)
+              + f" {row['prob_hit_target']:>6.1f}%")
+    print("=" * 100)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+        print(f"Forecast saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
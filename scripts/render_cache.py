@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Section Render Cache
+
+On-disk cache of rendered HTML report fragments. A fragment is keyed by a
+hash of the section name, the template version and the section's input data,
+so a refresh only re-renders sections whose data changed (intraday refreshes
+typically leave funnel_health, loss_reason_rca, google_ads_rca, action_items,
+... untouched) and splices the rest in from disk.
+
+The template version should change whenever rendering code changes;
+generate_html_report.py derives it from the hash of its own source.
+
+Usage:
+    python scripts/render_cache.py            # show cache size
+    python scripts/render_cache.py --clear
+    python scripts/render_cache.py --prune 500
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from snapshot_store import atomic_write
+
+
+CACHE_DIR = Path(__file__).parent / "reports" / ".render-cache"
+DEFAULT_MAX_ENTRIES = 500
+
+
+class RenderCache:
+    """Content-addressed store of rendered section fragments."""
+
+    def __init__(self, template_version, directory=CACHE_DIR):
+        self.template_version = template_version
+        self.directory = Path(directory)
+
+    def key(self, section, inputs):
+        """Return the cache key for a section rendered from `inputs`."""
+        digest = hashlib.sha256()
+        digest.update(self.template_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(section.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json.dumps(inputs, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.html"
+
+    def get(self, key):
+        """Return the cached fragment for key, or None. A hit refreshes the entry's age for prune()."""
+        path = self._path(key)
+        try:
+            fragment = path.read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Pruned by another process meanwhile; the fragment read is still valid
+        return fragment
+
+    def put(self, key, fragment):
+        """Store a rendered fragment."""
+        atomic_write(self._path(key), fragment.encode("utf-8"))
+
+
+def cache_entries(directory=CACHE_DIR):
+    """Return cached fragment paths, least recently used first."""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    return sorted(directory.glob("*/*.html"), key=lambda p: p.stat().st_mtime)
+
+
+def prune(max_entries=DEFAULT_MAX_ENTRIES, directory=CACHE_DIR):
+    """Delete the least recently used fragments beyond max_entries. Returns the number removed."""
+    entries = cache_entries(directory)
+    stale = entries[:max(len(entries) - max_entries, 0)]
+    for path in stale:
+        path.unlink()
+    return len(stale)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Inspect or prune the HTML section render cache")
+    parser.add_argument("--dir", default=str(CACHE_DIR), help="Cache directory")
+    parser.add_argument("--prune", type=int, metavar="MAX", help="Keep only the MAX most recently used fragments")
+    parser.add_argument("--clear", action="store_true", help="Remove every cached fragment")
+    args = parser.parse_args()
+
+    if args.clear:
+        print(f"Removed {prune(0, args.dir)} fragments")
+    elif args.prune is not None:
+        print(f"Removed {prune(args.prune, args.dir)} fragments")
+
+    entries = cache_entries(args.dir)
+    size = sum(p.stat().st_size for p in entries)
+    print(f"{len(entries)} cached fragments ({size:,} bytes) in {args.dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Lazy Report Data Access
+
+report-data.json is written by save_data() together with a sidecar index
+(report-data.index.json) holding the byte offset and length of every
+top-level section. ReportData memory-maps the artifact and decodes a section
+only the first time it is accessed, so callers that touch a handful of
+sections (the HTML report, print_summary(), diagnostics) never pay for a full
+parse of the deal and detail lists.
+
+ReportData is a read-only Mapping, so it can be passed anywhere a report dict
+is expected (data["period"], data.get("funnel_health", {}), ...).
+
+If the index is missing or does not match the file on disk (for example an
+artifact written by an older generator), the whole file is parsed once as a
+fallback.
+
+Usage:
+    python scripts/report_data.py                 # rebuild the index
+    python scripts/report_data.py --show period   # print one section
+"""
+
+import argparse
+import json
+import mmap
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+
+
+REPORT_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+INDEX_VERSION = 1
+
+
+def index_path_for(path):
+    """Return the sidecar index path for a report artifact."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.index.json")
+
+
+def encode_report(data):
+    """
+    Serialize data exactly as json.dump(data, f, indent=2) would.
+
+    Returns (payload_bytes, index) where index maps each top-level key to the
+    [offset, length] of its value inside payload_bytes. Sections keyed by
+    product with list values also get per-key row counts, so counts can be
+    reported without decoding the lists.
+    """
+    if not data:
+        return b"{}", {"version": INDEX_VERSION, "size": 2, "sections": {}, "row_counts": {}}
+
+    parts = [b"{\n"]
+    offset = 2
+    sections = {}
+    row_counts = {}
+    last = len(data) - 1
+    for i, (name, value) in enumerate(data.items()):
+        prefix = f"  {json.dumps(name)}: ".encode("utf-8")
+        # Nested lines sit one level deeper than a standalone dump; JSON strings
+        # never contain raw newlines, so re-indenting by replacement is safe.
+        body = json.dumps(value, indent=2).replace("\n", "\n  ").encode("utf-8")
+        suffix = b",\n" if i < last else b"\n"
+        sections[name] = [offset + len(prefix), len(body)]
+        if isinstance(value, dict) and value and all(isinstance(v, list) for v in value.values()):
+            row_counts[name] = {key: len(rows) for key, rows in value.items()}
+        parts.extend((prefix, body, suffix))
+        offset += len(prefix) + len(body) + len(suffix)
+    parts.append(b"}")
+    offset += 1
+
+    index = {"version": INDEX_VERSION, "size": offset, "sections": sections, "row_counts": row_counts}
+    return b"".join(parts), index
+
+
+def write_report(path, data):
+    """Atomically write the artifact and its sidecar index. Returns the index."""
+    from snapshot_store import atomic_write, atomic_write_json
+
+    payload, index = encode_report(data)
+    atomic_write(path, payload)
+    atomic_write_json(index_path_for(path), index)
+    return index
+
+
+def build_index(path=REPORT_PATH):
+    """Rebuild the sidecar index for an existing artifact (rewrites it in canonical form)."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return write_report(path, data)
+
+
+class ReportData(Mapping):
+    """Read-only, lazily decoded view of a report-data.json artifact."""
+
+    def __init__(self, path=REPORT_PATH, index_path=None):
+        self.path = Path(path)
+        self._cache = {}
+        self._file = open(self.path, "rb")
+        size = self._file.seek(0, 2)
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._row_counts = {}
+        self._sections = self._read_index(index_path or index_path_for(self.path), size)
+        if self._sections is None:
+            # Stale or missing index: fall back to a single full parse
+            self._cache = json.loads(self._mm[:]) if size else {}
+            self._sections = {name: None for name in self._cache}
+
+    def _read_index(self, index_path, size):
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if index.get("version") != INDEX_VERSION or index.get("size") != size:
+            return None
+        sections = index.get("sections", {})
+        for name, (offset, _length) in sections.items():
+            key = f"{json.dumps(name)}: ".encode("utf-8")
+            if self._mm[offset - len(key):offset] != key:
+                return None
+        self._row_counts = index.get("row_counts", {})
+        return sections
+
+    @property
+    def indexed(self):
+        """True when sections are served from the byte-offset index."""
+        return any(span is not None for span in self._sections.values())
+
+    @property
+    def loaded_sections(self):
+        """Names of sections decoded so far."""
+        return list(self._cache)
+
+    def row_counts(self, name):
+        """Return {key: row count} for a product-keyed list section without decoding it."""
+        if name in self._row_counts:
+            return dict(self._row_counts[name])
+        value = self.get(name)
+        if isinstance(value, dict):
+            return {key: len(rows) for key, rows in value.items() if isinstance(rows, list)}
+        return {}
+
+    def __getitem__(self, name):
+        if name in self._cache:
+            return self._cache[name]
+        span = self._sections[name]
+        offset, length = span
+        value = json.loads(self._mm[offset:offset + length])
+        self._cache[name] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+    def __contains__(self, name):
+        return name in self._sections
+
+    def to_dict(self):
+        """Decode every section and return a plain dict."""
+        return {name: self[name] for name in self._sections}
+
+    def close(self):
+        """Release the memory map and file handle."""
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Index or inspect report-data.json")
+    parser.add_argument("path", nargs="?", default=str(REPORT_PATH), help="Report artifact path")
+    parser.add_argument("--show", metavar="SECTION", help="Print one section instead of rebuilding the index")
+    args = parser.parse_args()
+
+    if args.show:
+        with ReportData(args.path) as data:
+            if args.show not in data:
+                print(f"Error: section '{args.show}' not found")
+                return 1
+            print(json.dumps(data[args.show], indent=2))
+        return 0
+
+    index = build_index(args.path)
+    print(f"Indexed {len(index['sections'])} sections ({index['size']:,} bytes) -> {index_path_for(args.path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
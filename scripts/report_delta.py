@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Report Snapshot Deltas
+
+Computes a compact patch between two report-data.json snapshots so clients
+and caches that already hold the previous snapshot can apply a small delta
+instead of downloading and parsing the full artifact again.
+
+Patch format (report-delta/1):
+    {
+      "format": "report-delta/1",
+      "base": <generated_at_utc of the old snapshot>,
+      "target": <generated_at_utc of the new snapshot>,
+      "order": [...],                 # only if top-level section order changed
+      "sections": {
+        "<name>": {"op": "delete"},
+        "<name>": {"op": "replace", "value": ...},
+        "<name>": {"op": "rows", "groups": {
+            "<group>": {
+              "delete": [key, ...],
+              "update": [{"key": key, "set": {...}, "unset": [...]}],
+              "insert": [row, ...],
+              "order": [key, ...]     # only if row order changed
+            }
+        }}
+      }
+    }
+
+Row-level diffs are used for list sections whose rows have a unique key:
+deal lists are matched by opportunity_id, aggregate sections by their key
+fields (product, region, category, source, ...). Anything else falls back to
+a whole-section replace. Unchanged sections are omitted.
+
+Usage:
+    python scripts/report_delta.py diff OLD.json NEW.json -o patch.json
+    python scripts/report_delta.py apply OLD.json patch.json -o NEW.json
+    python scripts/report_delta.py benchmark [data/report-data.json]
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+
+PATCH_FORMAT = "report-delta/1"
+
+DEAL_KEY = ("opportunity_id",)
+
+AGGREGATE_KEY_FIELDS = (
+    "product", "region", "category", "source", "source_channel",
+    "loss_reason", "competitor", "lost_to_competitor",
+)
+
+DELTA_PATH = Path(__file__).parent.parent / "data" / "report-data.delta.json"
+
+
+def _key_fields(rows):
+    """Return the key fields for a list of rows, or None if rows are not keyable."""
+    if not rows or not all(isinstance(r, dict) for r in rows):
+        return None
+    if all("opportunity_id" in r for r in rows):
+        return DEAL_KEY
+    fields = tuple(f for f in AGGREGATE_KEY_FIELDS if all(f in r for r in rows))
+    return fields or None
+
+
+def _row_key(row, fields):
+    return tuple(row.get(f) for f in fields)
+
+
+def _index_rows(rows, fields):
+    """Map key -> row, or None if any key repeats."""
+    index = {}
+    for row in rows:
+        key = _row_key(row, fields)
+        if key in index:
+            return None
+        index[key] = row
+    return index
+
+
+def _diff_rows(old_rows, new_rows):
+    """Return a row-level group diff, {} if equal, or None if rows cannot be keyed."""
+    fields = _key_fields(old_rows + new_rows)
+    if fields is None:
+        return None
+    old_index = _index_rows(old_rows, fields)
+    new_index = _index_rows(new_rows, fields)
+    if old_index is None or new_index is None:
+        return None
+
+    group = {}
+    deleted = [list(k) for k in old_index if k not in new_index]
+    inserted = [row for k, row in new_index.items() if k not in old_index]
+    updated = []
+    for key, new_row in new_index.items():
+        old_row = old_index.get(key)
+        if old_row is None or old_row == new_row:
+            continue
+        change = {"key": list(key)}
+        changed = {f: v for f, v in new_row.items() if f not in old_row or old_row[f] != v}
+        removed = [f for f in old_row if f not in new_row]
+        if changed:
+            change["set"] = changed
+        if removed:
+            change["unset"] = removed
+        updated.append(change)
+
+    if deleted:
+        group["delete"] = deleted
+    if updated:
+        group["update"] = updated
+    if inserted:
+        group["insert"] = inserted
+
+    # Applying delete/update/insert keeps surviving rows in place and appends
+    # inserts; only ship the full key order when that does not match
+    expected = [k for k in old_index if k in new_index] + [k for k in new_index if k not in old_index]
+    actual = list(new_index)
+    if expected != actual:
+        group["key_fields"] = list(fields)
+        group["order"] = [list(k) for k in actual]
+    elif group:
+        group["key_fields"] = list(fields)
+    return group
+
+
+def _diff_section(old, new):
+    """Return the op for one section, or None when unchanged."""
+    if old == new:
+        return None
+
+    if isinstance(old, list) and isinstance(new, list):
+        group = _diff_rows(old, new)
+        if group is not None:
+            return {"op": "rows", "groups": {"": group}}
+
+    if (isinstance(old, dict) and isinstance(new, dict)
+            and old.keys() == new.keys()
+            and all(isinstance(v, list) for v in list(old.values()) + list(new.values()))):
+        groups = {}
+        for name in new:
+            if old[name] == new[name]:
+                continue
+            group = _diff_rows(old[name], new[name])
+            if group is None:
+                return {"op": "replace", "value": new}
+            groups[name] = group
+        return {"op": "rows", "groups": groups}
+
+    return {"op": "replace", "value": new}
+
+
+def diff_reports(old, new):
+    """Compute a patch that turns the old report into the new one."""
+    sections = {}
+    for name, value in new.items():
+        if name not in old:
+            sections[name] = {"op": "replace", "value": value}
+            continue
+        op = _diff_section(old[name], value)
+        if op is not None:
+            sections[name] = op
+    for name in old:
+        if name not in new:
+            sections[name] = {"op": "delete"}
+
+    patch = {
+        "format": PATCH_FORMAT,
+        "base": old.get("generated_at_utc"),
+        "target": new.get("generated_at_utc"),
+        "sections": sections,
+    }
+    expected_order = [n for n in old if n in new] + [n for n in new if n not in old]
+    if expected_order != list(new):
+        patch["order"] = list(new)
+    return patch
+
+
+def _apply_rows(rows, group):
+    fields = tuple(group.get("key_fields", ()))
+    if not fields:
+        return rows
+    index = {_row_key(row, fields): row for row in rows}
+
+    for key in group.get("delete", []):
+        index.pop(tuple(key), None)
+    for change in group.get("update", []):
+        row = dict(index[tuple(change["key"])])
+        row.update(change.get("set", {}))
+        for field in change.get("unset", []):
+            row.pop(field, None)
+        index[tuple(change["key"])] = row
+    for row in group.get("insert", []):
+        index[_row_key(row, fields)] = row
+
+    if "order" in group:
+        return [index[tuple(key)] for key in group["order"]]
+    return list(index.values())
+
+
+def apply_patch(base, patch):
+    """Apply a patch to a base report and return the new report (base is not modified)."""
+    if patch.get("format") != PATCH_FORMAT:
+        raise ValueError(f"Unsupported patch format: {patch.get('format')}")
+    if patch.get("base") != base.get("generated_at_utc"):
+        raise ValueError(
+            f"Patch base {patch.get('base')} does not match report {base.get('generated_at_utc')}"
+        )
+
+    result = dict(base)
+    for name, op in patch["sections"].items():
+        kind = op["op"]
+        if kind == "delete":
+            result.pop(name, None)
+        elif kind == "replace":
+            result[name] = op["value"]
+        elif kind == "rows":
+            section = result[name]
+            if isinstance(section, list):
+                result[name] = _apply_rows(section, op["groups"][""])
+            else:
+                section = dict(section)
+                for group_name, group in op["groups"].items():
+                    section[group_name] = _apply_rows(section[group_name], group)
+                result[name] = section
+        else:
+            raise ValueError(f"Unknown patch op '{kind}' for section {name}")
+
+    if "order" in patch:
+        result = {name: result[name] for name in patch["order"]}
+    return result
+
+
+def encode_patch(patch):
+    """Serialize a patch compactly (deltas are meant for transfer, not reading)."""
+    return json.dumps(patch, separators=(",", ":")).encode("utf-8")
+
+
+def write_delta(old, new, path=DELTA_PATH):
+    """Write the patch from old to new next to report-data.json. Returns the patch size in bytes."""
+    from snapshot_store import atomic_write
+
+    payload = encode_patch(diff_reports(old, new))
+    atomic_write(path, payload)
+    return len(payload)
+
+
+def simulate_refresh(data, seed=7, changed_pct=5.0):
+    """
+    Return a copy of data mutated like a typical intraday refresh.
+
+    A few percent of pipeline deals advance stage or change ACV, some close as
+    won or lost, a handful of new deals appear, and a few aggregate rows move.
+    """
+    rng = random.Random(seed)
+    new = copy.deepcopy(data)
+    new["generated_at_utc"] = (data.get("generated_at_utc") or "") + "+1"
+    stages = ["Discovery", "Demo", "Proposal", "Negotiation", "Contract"]
+
+    for product, deals in new.get("pipeline_deals", {}).items():
+        n_changes = max(1, int(len(deals) * changed_pct / 100))
+        for deal in rng.sample(deals, min(n_changes, len(deals))):
+            if rng.random() < 0.5:
+                deal["stage"] = rng.choice(stages)
+            else:
+                deal["acv"] = round((deal.get("acv") or 0) * rng.uniform(0.8, 1.2), 2)
+        for _ in range(min(2, len(deals))):
+            deal = deals.pop(rng.randrange(len(deals)))
+            deal.update(stage="Closed Won", is_won=True, is_closed=True)
+            new.setdefault("won_deals", {}).setdefault(product, []).append(deal)
+        for i in range(3):
+            template = dict(rng.choice(deals)) if deals else {}
+            template["opportunity_id"] = f"SIM{product}{seed}{i:04d}"
+            template["stage"] = "Discovery"
+            deals.append(template)
+
+    for rows in new.get("attainment_detail", {}).values():
+        for row in rows[:2]:
+            row["qtd_acv"] = round((row.get("qtd_acv") or 0) + 1000, 2)
+    return new
+
+
+def benchmark(path, repeat=20):
+    """Print patch size and diff/apply timings for a simulated refresh of the artifact."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    old = json.loads(raw)
+    new = simulate_refresh(old)
+    full_size = len(json.dumps(new, indent=2).encode("utf-8"))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        patch = diff_reports(old, new)
+    diff_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    payload = encode_patch(patch)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        applied = apply_patch(old, json.loads(payload))
+    apply_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(raw)
+    parse_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    print("=" * 60)
+    print("REPORT DELTA BENCHMARK")
+    print("=" * 60)
+    print(f"Full artifact:     {full_size:>10,} bytes  (parse {parse_ms:.2f} ms)")
+    print(f"Delta patch:       {len(payload):>10,} bytes  ({len(payload) / full_size * 100:.2f}% of full)")
+    print(f"Sections changed:  {len(patch['sections'])}")
+    print(f"Diff time:         {diff_ms:>10.2f} ms")
+    print(f"Apply time:        {apply_ms:>10.2f} ms  (incl. patch parse)")
+    print(f"Round trip exact:  {applied == new}")
+    print("=" * 60)
+    return applied == new
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Diff, apply or benchmark report snapshot deltas")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_diff = sub.add_parser("diff", help="Write the patch from OLD to NEW")
+    p_diff.add_argument("old")
+    p_diff.add_argument("new")
+    p_diff.add_argument("-o", "--output", default=str(DELTA_PATH))
+
+    p_apply = sub.add_parser("apply", help="Apply a patch to a base report")
+    p_apply.add_argument("base")
+    p_apply.add_argument("patch")
+    p_apply.add_argument("-o", "--output", required=True)
+
+    p_bench = sub.add_parser("benchmark", help="Benchmark diff/apply on a simulated refresh")
+    p_bench.add_argument("path", nargs="?", default=str(Path(__file__).parent.parent / "data" / "report-data.json"))
+    p_bench.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    if args.command == "benchmark":
+        return 0 if benchmark(args.path, args.repeat) else 1
+
+    if args.command == "diff":
+        with open(args.old, "r") as f:
+            old = json.load(f)
+        with open(args.new, "r") as f:
+            new = json.load(f)
+        size = write_delta(old, new, args.output)
+        print(f"Delta saved to: {args.output} ({size:,} bytes)")
+        return 0
+
+    with open(args.base, "r") as f:
+        base = json.load(f)
+    with open(args.patch, "r") as f:
+        patch = json.load(f)
+    try:
+        result = apply_patch(base, patch)
+    except (KeyError, ValueError) as e:
+        print(f"Error applying patch: {e}")
+        return 1
+
+    from report_data import write_report
+    write_report(args.output, result)
+    print(f"Patched report saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
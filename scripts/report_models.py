@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Typed Report Records
+
+Compact, slot-based record classes for the row-heavy report sections:
+deals (won/lost/pipeline), attainment_detail, funnel_pacing and google_ads.
+load_model() makes one validating pass over the query output, so a malformed
+section fails at load time with the offending section/row named, instead of
+partway through rendering. From then on rows are read by attribute
+(row.qtd_acv) rather than row.get("qtd_acv", 0).
+
+Missing optional fields and nulls take the field default; missing or null
+required fields and wrongly typed values raise ReportValidationError.
+
+Usage:
+    python scripts/report_models.py [data/report-data.json]   # validate
+"""
+
+import json
+import sys
+from pathlib import Path
+
+
+PRODUCTS = ("POR", "R360")
+
+REQUIRED = object()
+
+_KIND_TYPES = {
+    "str": (str,),
+    "int": (int,),
+    "num": (int, float),
+    "bool": (bool,),
+}
+
+
+class ReportValidationError(ValueError):
+    """Raised when a report section does not have the expected shape."""
+
+
+def _slots(fields):
+    return tuple(name for name, _kind, _default in fields)
+
+
+class Record:
+    """Base class for slot-based report rows described by a FIELDS spec."""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    @classmethod
+    def from_row(cls, row, where, **overrides):
+        """Validate a dict row and build a record. `where` names the row in errors."""
+        if not isinstance(row, dict):
+            raise ReportValidationError(f"{where}: expected an object, got {type(row).__name__}")
+        record = cls.__new__(cls)
+        for name, kind, default in cls.FIELDS:
+            value = overrides[name] if name in overrides else row.get(name)
+            if value is None:
+                if default is REQUIRED:
+                    raise ReportValidationError(f"{where}: missing required field '{name}'")
+                value = default
+            elif not isinstance(value, _KIND_TYPES[kind]) or (kind != "bool" and isinstance(value, bool)):
+                raise ReportValidationError(
+                    f"{where}: field '{name}' should be {kind}, got {type(value).__name__} ({value!r})"
+                )
+            setattr(record, name, value)
+        return record
+
+    def to_dict(self):
+        """Return the record as a plain dict (field order preserved)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        keys = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__[:3])
+        return f"{type(self).__name__}({keys}, ...)"
+
+
+class Deal(Record):
+    """One opportunity from won_deals, lost_deals or pipeline_deals."""
+
+    FIELDS = (
+        ("opportunity_id", "str", REQUIRED),
+        ("account_name", "str", ""),
+        ("opportunity_name", "str", ""),
+        ("product", "str", REQUIRED),
+        ("region", "str", REQUIRED),
+        ("category", "str", ""),
+        ("deal_type", "str", ""),
+        ("acv", "num", 0),
+        ("close_date", "str", None),
+        ("stage", "str", ""),
+        ("is_won", "bool", False),
+        ("is_closed", "bool", False),
+        ("loss_reason", "str", None),
+        ("source", "str", ""),
+        ("owner_name", "str", ""),
+        ("owner_id", "str", ""),
+        ("salesforce_url", "str", ""),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class AttainmentRow(Record):
+    """One product x region x category row of attainment_detail."""
+
+    FIELDS = (
+        ("product", "str", REQUIRED),
+        ("region", "str", REQUIRED),
+        ("category", "str", REQUIRED),
+        ("q1_target", "num", 0),
+        ("qtd_target", "num", 0),
+        ("qtd_deals", "int", 0),
+        ("qtd_acv", "num", 0),
+        ("qtd_attainment_pct", "num", None),
+        ("q1_progress_pct", "num", 0),
+        ("qtd_gap", "num", 0),
+        ("qtd_lost_deals", "int", 0),
+        ("qtd_lost_acv", "num", 0),
+        ("win_rate_pct", "num", 0),
+        ("pipeline_opps", "int", 0),
+        ("pipeline_acv", "num", 0),
+        ("pipeline_avg_age_days", "num", 0),
+        ("pipeline_coverage_x", "num", 0),
+        ("rag_status", "str", "RED"),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class FunnelRow(Record):
+    """One product x region row of funnel_pacing (MQL -> SQL -> SAL -> SQO)."""
+
+    FIELDS = (
+        ("product", "str", REQUIRED),
+        ("region", "str", REQUIRED),
+        ("source_channel", "str", ""),
+        ("actual_mql", "int", 0),
+        ("target_mql", "int", 0),
+        ("mql_pacing_pct", "num", 0),
+        ("mql_rag", "str", "RED"),
+        ("actual_sql", "int", 0),
+        ("target_sql", "int", 0),
+        ("sql_pacing_pct", "num", 0),
+        ("sql_rag", "str", "RED"),
+        ("actual_sal", "int", 0),
+        ("target_sal", "int", 0),
+        ("sal_pacing_pct", "num", 0),
+        ("sal_rag", "str", "RED"),
+        ("actual_sqo", "int", 0),
+        ("target_sqo", "int", 0),
+        ("sqo_pacing_pct", "num", 0),
+        ("sqo_rag", "str", "RED"),
+        ("inbound_target_acv", "num", 0),
+        ("mql_to_sql_rate", "num", 0),
+        ("sql_to_sal_rate", "num", 0),
+        ("sal_to_sqo_rate", "num", 0),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class GoogleAdsRow(Record):
+    """One product x region row of google_ads."""
+
+    FIELDS = (
+        ("product", "str", REQUIRED),
+        ("region", "str", REQUIRED),
+        ("impressions", "int", 0),
+        ("clicks", "int", 0),
+        ("ad_spend_usd", "num", 0),
+        ("conversions", "num", 0),
+        ("ctr_pct", "num", 0),
+        ("cpc_usd", "num", 0),
+        ("cpa_usd", "num", 0),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+# section name -> record class; every section is keyed by product
+TYPED_SECTIONS = {
+    "won_deals": Deal,
+    "lost_deals": Deal,
+    "pipeline_deals": Deal,
+    "attainment_detail": AttainmentRow,
+    "funnel_pacing": FunnelRow,
+    "google_ads": GoogleAdsRow,
+}
+
+
+def load_section(data, section):
+    """Validate one product-keyed section into {product: [records]}."""
+    record_cls = TYPED_SECTIONS[section]
+    value = data.get(section)
+    if value is None:
+        return {product: [] for product in PRODUCTS}
+    if not isinstance(value, dict):
+        raise ReportValidationError(f"{section}: expected an object keyed by product")
+
+    result = {}
+    for product, rows in value.items():
+        if not isinstance(rows, list):
+            raise ReportValidationError(f"{section}.{product}: expected a list of rows")
+        # google_ads rows carry no product field; the group key supplies it
+        overrides = {"product": product} if record_cls is GoogleAdsRow else {}
+        result[product] = [
+            record_cls.from_row(row, f"{section}.{product}[{i}]", **overrides)
+            for i, row in enumerate(rows)
+        ]
+    for product in PRODUCTS:
+        result.setdefault(product, [])
+    return result
+
+
+class ReportModel:
+    """Typed view of a report: validated record lists plus the untyped remainder."""
+
+    __slots__ = ("raw",) + tuple(TYPED_SECTIONS)
+
+    def __init__(self, raw, sections):
+        self.raw = raw
+        for section, value in sections.items():
+            setattr(self, section, value)
+
+
+def load_model(data):
+    """
+    Validate the typed sections of a report in one pass and return a ReportModel.
+
+    data may be a dict or any Mapping (e.g. a lazily decoded ReportData); only
+    the typed sections are read.
+    """
+    return ReportModel(data, {section: load_section(data, section) for section in TYPED_SECTIONS})
+
+
+def main():
+    """Main entry point."""
+    path = sys.argv[1] if len(sys.argv) > 1 else Path(__file__).parent.parent / "data" / "report-data.json"
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    try:
+        model = load_model(data)
+    except ReportValidationError as e:
+        print(f"Invalid report data: {e}")
+        return 1
+
+    for section in TYPED_SECTIONS:
+        counts = {product: len(rows) for product, rows in getattr(model, section).items()}
+        print(f"{section:<20} {counts}")
+    print("Report data is valid.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
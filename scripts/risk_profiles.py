@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Risk Profiles
+
+Computes attainment, gaps, RAG and pipeline coverage for every SOP risk
+profile (percentile) in one run. The comprehensive query fetches actuals
+once at the report's percentile. query_sop_targets_by_percentile.sql then
+fetches the Q1/FY targets of every percentile in a single row. The shared
+deal lists are joined against each target set in memory with
+aggregation_engine, and the results are stored in the report keyed by
+percentile:
+
+    data["risk_profiles"]["P90"] = {grand_total, product_totals,
+                                    attainment_detail, source_attainment,
+                                    top_risk_pockets, executive_counts}
+
+Switching percentile in a viewer is then a lookup instead of a refresh.
+
+Usage:
+    python scripts/risk_profiles.py                          # query targets, compare profiles
+    python scripts/risk_profiles.py --targets sop-targets.json
+    python scripts/risk_profiles.py --percentiles P50,P90 --write   # store in data/report-data.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from aggregation_engine import DealColumns, aggregate
+from report_data import REPORT_PATH, write_report
+
+
+QUERY_PATH = Path(__file__).parent.parent / "sql" / "reports" / "query_sop_targets_by_percentile.sql"
+RESULT_COLUMN = "sop_targets_json"
+# The risk profiles offered by the report UI (RiskProfile in lib/constants/dimensions.ts)
+PERCENTILES = ("P50", "P75", "P90")
+PROFILE_SECTIONS = ("grand_total", "product_totals", "attainment_detail", "source_attainment", "top_risk_pockets")
+
+
+def run_targets_query():
+    """Fetch the SOP targets of every percentile. Raises RuntimeError on failure."""
+    try:
+        result = subprocess.run(
+            ["bq", "query", "--use_legacy_sql=false", "--format=json"],
+            stdin=open(QUERY_PATH, "r"),
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("SOP targets query timed out after 2 minutes")
+    except FileNotFoundError:
+        raise RuntimeError("'bq' command not found. Please install Google Cloud SDK.")
+
+    if result.returncode != 0:
+        raise RuntimeError(f"SOP targets query failed: {result.stderr.strip()}")
+    try:
+        rows = json.loads(result.stdout)
+        return json.loads(rows[0][RESULT_COLUMN])
+    except (json.JSONDecodeError, IndexError, KeyError, TypeError) as e:
+        raise RuntimeError(f"Could not parse SOP targets query output: {e}")
+
+
+def target_sets(sop_targets, data):
+    """
+    Split SOP target rows into one aggregation_engine target set per percentile.
+
+    The pipeline age of each segment does not depend on the percentile; it is
+    carried over from the report's attainment_detail.
+    """
+    ages = {(r["product"], r["region"], r["category"]): r.get("pipeline_avg_age_days")
+            for rows in (data.get("attainment_detail") or {}).values() for r in rows}
+    sets = {}
+
+    def target_set(percentile):
+        return sets.setdefault(percentile, {"segments": [], "sources": [], "fy_targets": {}})
+
+    for row in sop_targets.get("segments") or []:
+        segment = {key: row[key] for key in ("product", "region", "category", "q1_target")}
+        segment["pipeline_avg_age_days"] = ages.get((row["product"], row["region"], row["category"]))
+        target_set(row["percentile"])["segments"].append(segment)
+    for row in sop_targets.get("sources") or []:
+        target_set(row["percentile"])["sources"].append(
+            {key: row[key] for key in ("product", "region", "source", "q1_target")})
+    for row in sop_targets.get("fy_targets") or []:
+        target_set(row["percentile"])["fy_targets"][row["product"]] = row["fy_target"]
+    return sets
+
+
+def _executive_counts(attainment_detail, data):
+    rows = [r for product_rows in attainment_detail.values() for r in product_rows]
+    return {
+        "areas_exceeding_target": sum(1 for r in rows if (r["qtd_attainment_pct"] or 0) >= 100),
+        "areas_at_risk": sum(1 for r in rows if r["rag_status"] == "RED"),
+        "areas_needing_attention": sum(1 for r in rows if r["rag_status"] == "YELLOW"),
+        # Momentum comes from funnel trends, which do not depend on targets
+        "areas_with_momentum": (data.get("executive_counts") or {}).get("areas_with_momentum", 0),
+    }
+
+
+def compute_profiles(data, sets, percentiles=PERCENTILES):
+    """Return {percentile: sections} for every percentile that has targets."""
+    deals = DealColumns.from_report(data)
+    positions = range(len(deals))
+    profiles = {}
+    for percentile in percentiles:
+        if percentile not in sets:
+            continue
+        sections = aggregate(deals, sets[percentile], data["period"], positions)
+        profile = {name: sections[name] for name in PROFILE_SECTIONS}
+        profile["executive_counts"] = _executive_counts(sections["attainment_detail"], data)
+        profiles[percentile] = profile
+    return profiles
+
+
+def add_risk_profiles(data, sop_targets, percentiles=PERCENTILES):
+    """Compute every profile and store them in data["risk_profiles"]. Returns the profiles."""
+    profiles = compute_profiles(data, target_sets(sop_targets, data), percentiles)
+    data["risk_profiles"] = profiles
+    return profiles
+
+
+def _money(value):
+    return f"${value:,.0f}" if value >= 0 else f"-${-value:,.0f}"
+
+
+def print_profiles(profiles):
+    """Print a side-by-side comparison of the grand totals."""
+    print(f"{'Profile':<8} {'QTD Target':>14} {'QTD ACV':>14} {'Attain':>8} {'Gap':>14} "
+          f"{'Coverage':>9} {'RED':>4} {'YEL':>4}")
+    for percentile, profile in profiles.items():
+        total, counts = profile["grand_total"], profile["executive_counts"]
+        print(f"{percentile:<8} {_money(total['total_qtd_target']):>14} {_money(total['total_qtd_acv']):>14} "
+              f"{total['total_qtd_attainment_pct'] or 0:>7.1f}% {_money(total['total_qtd_gap']):>14} "
+              f"{total['total_pipeline_coverage_x'] or 0:>8.1f}x {counts['areas_at_risk']:>4} "
+              f"{counts['areas_needing_attention']:>4}")
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compute attainment for every SOP risk profile")
+    parser.add_argument("--data", default=str(REPORT_PATH))
+    parser.add_argument("--targets", help="SOP targets JSON (default: run the targets query)")
+    parser.add_argument("--percentiles", default=",".join(PERCENTILES))
+    parser.add_argument("--write", action="store_true", help="Store the profiles in the report data file")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    with open(args.data, "r") as f:
+        data = json.load(f)
+
+    try:
+        if args.targets:
+            with open(args.targets, "r") as f:
+                sop_targets = json.load(f)
+        else:
+            sop_targets = run_targets_query()
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    profiles = add_risk_profiles(data, sop_targets, [p for p in args.percentiles.split(",") if p])
+    print_profiles(profiles)
+
+    if args.write:
+        write_report(Path(args.data), data)
+        print(f"Risk profiles saved to: {args.data}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Top-k Risk Pocket Ranking
+
+Ranks the pockets furthest behind their QTD target at any grain: any
+combination of product, region, category, source, owner_name and deal_type,
+not just the product x region x category top 10 the query returns.
+
+Targets only exist at two grains (segment: product x region x category,
+source: product x region x source). The basis is the source targets when the
+grain has source but no category or deal type, otherwise the segment targets.
+A grain the basis fully determines sums basis targets directly. Finer grains
+(owner, deal type, source under a category) receive each basis target in
+proportion to their share of that basis's won + pipeline ACV (a basis with
+no such ACV has no finer pocket to carry its target).
+
+RiskRanker keeps per-pocket accumulators and a lazy-deletion heap keyed by
+gap. A deal change updates one pocket and re-scores only the pockets sharing
+its basis; top(k) pops stale heap entries as it meets them. Drill-down lists
+stay fast with thousands of pockets.
+
+Usage:
+    python scripts/risk_ranking.py                               # verify against top_risk_pockets
+    python scripts/risk_ranking.py --by region,source -k 15
+    python scripts/risk_ranking.py --by product,owner_name -k 20 -o owners.json
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from pathlib import Path
+
+from aggregation_engine import RISK_POCKET_FIELDS, rag_status, safe_divide, sql_round, targets_from_report
+
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+
+RANK_DIMENSIONS = ("product", "region", "category", "source", "owner_name", "deal_type")
+SEGMENT_BASIS = ("product", "region", "category")
+SOURCE_BASIS = ("product", "region", "source")
+DEAL_SECTIONS = (("won", "won_deals"), ("lost", "lost_deals"), ("pipeline", "pipeline_deals"))
+DEFAULT_K = 10
+
+# Pocket accumulator slots
+WON, WON_ACV, LOST, PIPELINE, PIPELINE_ACV = range(5)
+
+
+def basis_for(dims):
+    """Return the target grain a ranking grain is measured against."""
+    if "source" in dims and not {"category", "deal_type"} & set(dims):
+        return SOURCE_BASIS
+    return SEGMENT_BASIS
+
+
+def _key(deal, dims):
+    return tuple(deal.get(dim) or "" for dim in dims)
+
+
+class RiskRanker:
+    """Incrementally maintained top-k risk pockets at one grain."""
+
+    def __init__(self, dims, targets, period):
+        unknown = [dim for dim in dims if dim not in RANK_DIMENSIONS]
+        if unknown or not dims:
+            raise ValueError(f"Rank dimensions must be some of {', '.join(RANK_DIMENSIONS)}; got {dims}")
+        self.dims = tuple(dims)
+        self.basis = basis_for(self.dims)
+        self.direct = set(self.dims) <= set(self.basis)
+        self.period = period
+        self.fraction = period["days_elapsed"] / period["total_days"]
+
+        rows = targets["segments"] if self.basis == SEGMENT_BASIS else targets["sources"]
+        self.basis_targets = {}
+        for row in rows:
+            if (row.get("q1_target") or 0) > 0:
+                key = _key(row, self.basis)
+                self.basis_targets[key] = self.basis_targets.get(key, 0) + row["q1_target"]
+
+        self.pockets = {}          # pocket key -> accumulators
+        self.shares = {}           # basis key -> {pocket key: won + pipeline ACV}
+        self.weights = {}          # basis key -> won + pipeline ACV of all its pockets
+        self.pocket_bases = {}     # pocket key -> basis keys it has a share in
+        self.deals = {}            # opportunity_id -> (kind, pocket key, basis key, acv)
+        self.heap = []
+        self.version = {}
+        self.counter = 0
+
+        # A directly targeted pocket exists even with no deals, as in the query
+        self.direct_targets = {}
+        if self.direct:
+            positions = [self.basis.index(dim) for dim in self.dims]
+            for basis_key, target in self.basis_targets.items():
+                key = tuple(basis_key[i] for i in positions)
+                self.direct_targets[key] = self.direct_targets.get(key, 0) + target
+                self._pocket(key)
+        self.rescore()
+
+    def _pocket(self, key):
+        pocket = self.pockets.get(key)
+        if pocket is None:
+            pocket = self.pockets[key] = [0, 0.0, 0, 0, 0.0]
+        return pocket
+
+    def _counts(self, kind, deal):
+        """Won and lost deals only count when they closed in the quarter up to the as-of date."""
+        if kind == "pipeline":
+            return True
+        return self.period["quarter_start"] <= (deal.get("close_date") or "") <= self.period["as_of_date"]
+
+    def q1_target(self, key):
+        """The pocket's Q1 target: summed directly, or apportioned by ACV share."""
+        if self.direct:
+            return self.direct_targets.get(key, 0)
+        total = 0
+        for basis_key in self.pocket_bases.get(key, ()):
+            weight = self.weights[basis_key]
+            if weight > 0:
+                total += self.basis_targets.get(basis_key, 0) * self.shares[basis_key][key] / weight
+        return total
+
+    def _score(self, key):
+        """Push the pocket's current gap onto the heap, superseding older entries."""
+        self.counter += 1
+        self.version[key] = self.counter
+        heapq.heappush(self.heap, (self.row(key)["qtd_gap"], key, self.counter))
+        if len(self.heap) > 4 * len(self.pockets) + 64:
+            self.heap = [(gap, k, v) for gap, k, v in self.heap if self.version.get(k) == v]
+            heapq.heapify(self.heap)
+
+    def row(self, key):
+        """Return the pocket as a top_risk_pockets row."""
+        pocket = self.pockets.get(key) or [0, 0.0, 0, 0, 0.0]
+        q1_target = self.q1_target(key)
+        prorated = q1_target * self.fraction
+        qtd_acv = sql_round(pocket[WON_ACV], 2)
+        pipeline_acv = sql_round(pocket[PIPELINE_ACV], 2)
+        ratio = safe_divide(qtd_acv, prorated)
+        win_rate = safe_divide(pocket[WON], pocket[WON] + pocket[LOST])
+        row = dict(zip(self.dims, key))
+        row.update({
+            "qtd_target": sql_round(prorated, 2),
+            "qtd_acv": qtd_acv,
+            "qtd_gap": sql_round(qtd_acv - prorated, 2),
+            "qtd_attainment_pct": sql_round(ratio * 100, 1) if ratio is not None else None,
+            "rag_status": rag_status(qtd_acv, prorated),
+            "win_rate_pct": sql_round(win_rate * 100, 1) if win_rate is not None else None,
+            "pipeline_acv": pipeline_acv,
+            "pipeline_coverage_x": sql_round(safe_divide(pipeline_acv, q1_target - qtd_acv), 1),
+        })
+        return row
+
+    def _accumulate(self, kind, key, basis_key, acv, sign=1):
+        pocket = self._pocket(key)
+        if kind == "won":
+            pocket[WON] += sign
+            pocket[WON_ACV] += sign * acv
+        elif kind == "lost":
+            pocket[LOST] += sign
+        else:
+            pocket[PIPELINE] += sign
+            pocket[PIPELINE_ACV] += sign * acv
+        if kind != "lost":
+            shares = self.shares.setdefault(basis_key, {})
+            shares[key] = shares.get(key, 0) + sign * acv
+            self.weights[basis_key] = self.weights.get(basis_key, 0) + sign * acv
+            self.pocket_bases.setdefault(key, set()).add(basis_key)
+
+    def _apply(self, kind, key, basis_key, acv, sign):
+        self._accumulate(kind, key, basis_key, acv, sign)
+        # Apportioned targets move for every pocket sharing the basis
+        affected = [key] if self.direct or kind == "lost" else list(self.shares.get(basis_key, {}))
+        for pocket_key in affected:
+            self._score(pocket_key)
+
+    def add(self, kind, deal, score=True):
+        """Add a won, lost or pipeline deal (a deal_lists row)."""
+        if not self._counts(kind, deal):
+            return
+        record = (kind, _key(deal, self.dims), _key(deal, self.basis), deal.get("acv") or 0)
+        deal_id = deal.get("opportunity_id") or f"#{len(self.deals)}"
+        if deal_id in self.deals:
+            self.remove(deal_id)
+        self.deals[deal_id] = record
+        if score:
+            self._apply(*record, 1)
+        else:
+            self._accumulate(*record)
+
+    def remove(self, deal_id):
+        """Remove a deal by opportunity_id (no-op if unknown)."""
+        record = self.deals.pop(deal_id, None)
+        if record is not None:
+            self._apply(*record, -1)
+
+    def update(self, kind, deal):
+        """A deal changed: moved stage, closed, changed ACV, owner or source."""
+        self.remove(deal.get("opportunity_id"))
+        self.add(kind, deal)
+
+    def rescore(self):
+        """Score every pocket from scratch (after a bulk load)."""
+        self.heap, self.version = [], {}
+        for key in self.pockets:
+            self._score(key)
+
+    def top(self, k=DEFAULT_K):
+        """Return the k pockets furthest behind target (negative gaps only)."""
+        found, popped = [], []
+        while self.heap and len(found) < k:
+            entry = heapq.heappop(self.heap)
+            gap, key, version = entry
+            if self.version.get(key) != version:
+                continue
+            popped.append(entry)
+            if gap >= 0:
+                break
+            found.append(key)
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return [self.row(key) for key in found]
+
+
+def build_ranker(data, dims, targets=None):
+    """Load every deal in a report into a ranker at the given grain."""
+    ranker = RiskRanker(dims, targets or targets_from_report(data), data["period"])
+    for kind, section in DEAL_SECTIONS:
+        for deals in (data.get(section) or {}).values():
+            for deal in deals:
+                ranker.add(kind, deal, score=False)
+    ranker.rescore()
+    return ranker
+
+
+def verify(data):
+    """Compare the product x region x category ranking with the report's top_risk_pockets."""
+    expected = data.get("top_risk_pockets") or []
+    actual = build_ranker(data, SEGMENT_BASIS).top(len(expected))
+    differences = []
+    for i, (want, got) in enumerate(zip(expected, actual)):
+        for field in RISK_POCKET_FIELDS:
+            a, b = want.get(field), got.get(field)
+            if a != b and not (isinstance(a, (int, float)) and isinstance(b, (int, float)) and abs(a - b) <= 0.05):
+                differences.append(f"top_risk_pockets[{i}].{field}: expected {a!r}, got {b!r}")
+    if len(expected) != len(actual):
+        differences.append(f"top_risk_pockets: expected {len(expected)} rows, got {len(actual)}")
+    return differences
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Top-k risk pockets at any grain")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--by", help=f"Comma-separated grain from {', '.join(RANK_DIMENSIONS)}")
+    parser.add_argument("-k", type=int, default=DEFAULT_K)
+    parser.add_argument("-o", "--output", help="Write the ranked pockets here as JSON")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    with open(args.data, "r") as f:
+        data = json.load(f)
+
+    if not args.by:
+        differences = verify(data)
+        for line in differences:
+            print(line)
+        print(f"top_risk_pockets: {len(differences)} differences from the SQL output")
+        return 1 if differences else 0
+
+    dims = [dim for dim in args.by.split(",") if dim]
+    start = time.perf_counter()
+    try:
+        ranker = build_ranker(data, dims)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    pockets = ranker.top(args.k)
+    elapsed = time.perf_counter() - start
+
+    print(f"Top {len(pockets)} of {len(ranker.pockets)} pockets by {' x '.join(dims)} "
+          f"(targets from {' x '.join(ranker.basis)}, {elapsed * 1000:.1f} ms)")
+    for row in pockets:
+        name = " / ".join(str(row[dim]) for dim in dims)
+        print(f"  {name:<48} gap ${row['qtd_gap']:>12,.0f}  {row['qtd_attainment_pct'] or 0:>6.1f}%  {row['rag_status']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(pockets, indent=2))
+        print(f"Pockets saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
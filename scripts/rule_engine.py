@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+Compiled RCA Rule Engine
+
+Evaluates pipeline_rca, trend_rca, google_ads_rca and action_items from the
+metric tables already in the report (attainment_detail, funnel_trends,
+google_ads, funnel_rca_insights, loss_reason_rca). The CASE expressions of
+query_comprehensive_risk_analysis.sql become declarative rules, so a
+threshold change is a local re-evaluation instead of a query edit and a
+warehouse round trip.
+
+Rules are plain data (RULES below, or a JSON file with the same shape).
+Each table has an input, an optional `where`, and fields computed in order.
+Later fields and later tables may use earlier ones. A field is either
+
+    {"name": ..., "expr": "round(q1_target - qtd_acv, 2)"}
+    {"name": ..., "cases": [[condition, value], ...], "else": value}
+
+Conditions and expressions are Python expression syntax over column names,
+with SQL NULL semantics: comparisons and arithmetic involving None give
+None, and/or/not follow SQL's three-valued logic, and a case only matches a
+true condition. Only names, constants, operators and calls to round, abs,
+int and coalesce are accepted. Values are templates such
+as "{region} pipeline at {round(pipeline_coverage_x, 1)}x". A value that is
+a single {expr} keeps its type. Otherwise, as with CONCAT, the result is
+NULL if any part is NULL. Numbers print as CAST(... AS STRING) does, and
+{expr:money} prints like FORMAT("$%'.0f").
+
+Every expression is compiled once per run into a list comprehension over the
+table's columns, so each rule is evaluated for all rows in one bulk pass.
+
+Usage:
+    python scripts/rule_engine.py                     # verify against the SQL sections
+    python scripts/rule_engine.py --dump-rules > rules.json
+    python scripts/rule_engine.py --rules rules.json -o rca.json
+
+To publish sections from an edited rule set, refresh with
+python scripts/generate-data.py --rules rules.json, so the snapshot and every
+sidecar are written together with report-data.json.
+"""
+
+import argparse
+import ast
+import copy
+import json
+import string
+import sys
+import time
+from pathlib import Path
+
+from aggregation_engine import compare, sql_round
+
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+PRODUCTS = ("POR", "R360")
+
+ITEM_FIELDS = ("urgency", "category", "product", "region", "issue", "action", "severity")
+SEVERITY_RANK = {"CRITICAL": 1, "HIGH": 2, "MEDIUM": 3}
+URGENCY_SECTIONS = {"IMMEDIATE": "immediate", "SHORT_TERM": "short_term", "STRATEGIC": "strategic"}
+
+
+def _severity_order(field):
+    """The query's severity sort key (CRITICAL, HIGH, MEDIUM, then the rest)."""
+    return {"field": field, "rank": SEVERITY_RANK, "default": 4}
+
+
+RULES = {
+    "tables": [
+        {
+            "name": "pipeline_rca",
+            "input": "attainment_detail",
+            "where": "q1_target > 0",
+            "fields": [
+                {"name": "remaining_target", "expr": "round(q1_target - qtd_acv, 2)"},
+                {"name": "pipeline_health", "cases": [
+                    ["pipeline_coverage_x >= 3.0", "HEALTHY"],
+                    ["pipeline_coverage_x >= 2.0", "ADEQUATE"],
+                    ["pipeline_coverage_x >= 1.0", "AT_RISK"],
+                ], "else": "CRITICAL"},
+                {"name": "pipeline_age_status", "cases": [
+                    ["pipeline_avg_age_days > 90", "AGING"],
+                    ["pipeline_avg_age_days > 60", "MATURING"],
+                ], "else": "FRESH"},
+                {"name": "rca_commentary", "cases": [
+                    ["pipeline_coverage_x >= 3.0 and pipeline_avg_age_days <= 60",
+                     "{region} {category} pipeline healthy at {round(pipeline_coverage_x, 1)}x coverage. "
+                     "Fresh pipeline ({round(pipeline_avg_age_days, 0)} days avg) supports Q1 target."],
+                    ["pipeline_coverage_x >= 3.0 and pipeline_avg_age_days > 60",
+                     "{region} {category} has {round(pipeline_coverage_x, 1)}x coverage but aging "
+                     "({round(pipeline_avg_age_days, 0)} days avg). Focus on deal velocity."],
+                    ["pipeline_coverage_x >= 2.0",
+                     "{region} {category} pipeline adequate at {round(pipeline_coverage_x, 1)}x. "
+                     "Monitor closely - need {(q1_target - qtd_acv) / 2:money} more pipeline for safety."],
+                    ["pipeline_coverage_x >= 1.0",
+                     "{region} {category} pipeline AT RISK at only {round(pipeline_coverage_x, 1)}x. "
+                     "Urgent: Generate ${round((q1_target - qtd_acv) * 2, 0)} additional pipeline."],
+                ], "else": "{region} {category} CRITICAL pipeline gap - only {round(pipeline_coverage_x, 1)}x coverage. "
+                           "Immediate action required to build pipeline."},
+                {"name": "severity", "cases": [
+                    ["pipeline_coverage_x < 1.0", "CRITICAL"],
+                    ["pipeline_coverage_x < 2.0", "HIGH"],
+                    ["pipeline_coverage_x < 3.0", "MEDIUM"],
+                ], "else": "LOW"},
+                {"name": "recommended_action", "cases": [
+                    ["pipeline_coverage_x < 1.0",
+                     "Immediate pipeline generation needed. Deploy outbound, accelerate inbound campaigns."],
+                    ["pipeline_coverage_x < 2.0",
+                     "Increase prospecting activity. Review stalled deals for reactivation."],
+                    ["pipeline_avg_age_days > 90",
+                     "Focus on deal velocity. Review aging opportunities for close or disqualification."],
+                ], "else": "Maintain pipeline hygiene. Continue current prospecting cadence."},
+            ],
+            "output": ["product", "region", "category", "pipeline_acv", "pipeline_coverage_x", "pipeline_opps",
+                       "pipeline_avg_age_days", "pipeline_health", "pipeline_age_status", "remaining_target",
+                       "rca_commentary", "severity", "recommended_action"],
+            "order": [_severity_order("severity"), "region"],
+        },
+        {
+            "name": "trend_rca",
+            "input": "funnel_trends",
+            "where": "mql_trend == 'DOWN' or sql_trend == 'DOWN' or sal_trend == 'DOWN' or sqo_trend == 'DOWN'",
+            "fields": [
+                {"name": "mql_declining", "expr": "coalesce(mql_trend == 'DOWN', False)"},
+                {"name": "sql_declining", "expr": "coalesce(sql_trend == 'DOWN', False)"},
+                {"name": "sal_declining", "expr": "coalesce(sal_trend == 'DOWN', False)"},
+                {"name": "sqo_declining", "expr": "coalesce(sqo_trend == 'DOWN', False)"},
+                {"name": "declining_stage_count",
+                 "expr": "int(mql_declining) + int(sql_declining) + int(sal_declining) + int(sqo_declining)"},
+                {"name": "severity", "cases": [
+                    ["declining_stage_count >= 3", "CRITICAL"],
+                    ["mql_declining and coalesce(mql_wow_pct, 0) < -30", "CRITICAL"],
+                    ["int(mql_declining) + int(sql_declining) >= 2", "HIGH"],
+                    ["mql_declining or sql_declining", "MEDIUM"],
+                ], "else": "LOW"},
+                {"name": "rca_commentary", "cases": [
+                    ["mql_declining and coalesce(mql_wow_pct, 0) < -30",
+                     "{region} MQL dropped {abs(coalesce(mql_wow_pct, 0))}% WoW - significant lead gen decline. "
+                     "Investigate: campaign spend changes, landing page issues, or seasonal factors."],
+                    ["mql_declining and sql_declining",
+                     "{region} showing top-of-funnel contraction (MQL {coalesce(mql_wow_pct, 0)}%, SQL "
+                     "{coalesce(sql_wow_pct, 0)}%). Review marketing campaigns and SDR capacity."],
+                    ["mql_declining",
+                     "{region} MQL declining ({coalesce(mql_wow_pct, 0)}% WoW). "
+                     "Monitor campaign performance and lead sources."],
+                    ["sql_declining",
+                     "{region} SQL conversion declining ({coalesce(sql_wow_pct, 0)}% WoW). "
+                     "Check SDR follow-up rates and lead quality."],
+                    ["sal_declining and sqo_declining",
+                     "{region} mid-funnel contraction (SAL {coalesce(sal_wow_pct, 0)}%, SQO "
+                     "{coalesce(sqo_wow_pct, 0)}%). Review discovery and qualification process."],
+                ], "else": None},
+                {"name": "recommended_action", "cases": [
+                    ["mql_declining and coalesce(mql_wow_pct, 0) < -30",
+                     "Urgent: Audit ad campaigns, check website traffic, review lead source performance."],
+                    ["mql_declining",
+                     "Investigate lead gen decline. Consider supplementary campaigns or outbound boost."],
+                    ["sql_declining",
+                     "Review SDR performance. Check lead response time and qualification criteria."],
+                    ["sal_declining or sqo_declining",
+                     "Coach AEs on discovery and proposal process. Review deal stage progression."],
+                ], "else": "Continue monitoring trends."},
+            ],
+            "output": ["product", "region", "mql_declining", "sql_declining", "sal_declining", "sqo_declining",
+                       "mql_wow_pct", "sql_wow_pct", "sal_wow_pct", "sqo_wow_pct", "declining_stage_count",
+                       "severity", "rca_commentary", "recommended_action"],
+            "output_where": "rca_commentary is not None",
+            "order": [_severity_order("severity")],
+        },
+        {
+            "name": "google_ads_rca",
+            "input": "google_ads",
+            "fields": [
+                {"name": "ctr_performance", "cases": [
+                    ["ctr_pct >= 3.0", "STRONG"],
+                    ["ctr_pct >= 2.0", "AVERAGE"],
+                ], "else": "BELOW_AVERAGE"},
+                {"name": "cpa_performance", "cases": [
+                    ["cpa_usd <= 200", "EFFICIENT"],
+                    ["cpa_usd <= 400", "AVERAGE"],
+                ], "else": "EXPENSIVE"},
+                {"name": "severity", "cases": [
+                    ["cpa_usd > 500", "CRITICAL"],
+                    ["cpa_usd > 400 or ctr_pct < 1.5", "HIGH"],
+                    ["cpa_usd > 300 or ctr_pct < 2.0", "MEDIUM"],
+                ], "else": "LOW"},
+                {"name": "rca_commentary", "cases": [
+                    ["cpa_usd > 500",
+                     "{product} CPA at ${round(cpa_usd, 0)} - significantly above $500 threshold. "
+                     "Review keyword targeting, ad relevance, and landing page conversion."],
+                    ["ctr_pct < 1.5 and cpa_usd > 300",
+                     "{product} CTR low at {round(ctr_pct, 2)}% with high CPA (${round(cpa_usd, 0)}). "
+                     "Ad creative and targeting need optimization."],
+                    ["ctr_pct < 2.0",
+                     "{product} CTR at {round(ctr_pct, 2)}% - below 2% benchmark. "
+                     "Test new ad copy and review keyword match types."],
+                    ["cpa_usd > 300",
+                     "{product} CPA at ${round(cpa_usd, 0)} - above target. "
+                     "Optimize bidding strategy and negative keywords."],
+                    ["ctr_pct >= 3.0 and cpa_usd <= 200",
+                     "{product} campaigns performing well - {round(ctr_pct, 2)}% CTR, ${round(cpa_usd, 0)} CPA. "
+                     "Consider scaling spend."],
+                ], "else": "{product} ads at acceptable efficiency (${round(cpa_usd, 0)} CPA). "
+                           "Continue optimizing for incremental gains."},
+                {"name": "recommended_action", "cases": [
+                    ["cpa_usd > 500", "Urgent: Pause underperforming keywords, review ad relevance, optimize landing pages."],
+                    ["ctr_pct < 1.5", "Test new ad creative, refine audience targeting, review keyword quality."],
+                    ["cpa_usd > 300", "Optimize bidding, add negative keywords, improve landing page conversion."],
+                    ["ctr_pct >= 3.0 and cpa_usd <= 200", "Scale budget for high-performing campaigns."],
+                ], "else": "Continue A/B testing and incremental optimization."},
+            ],
+            "output": ["product", "region", "ctr_pct", "cpc_usd", "cpa_usd", "ctr_performance", "cpa_performance",
+                       "severity", "rca_commentary", "recommended_action"],
+            "order": ["region"],
+        },
+    ],
+    # Each emitter adds the input rows matching `where` as items. product, region
+    # and severity default to the row's own; issue and action to its
+    # rca_commentary and recommended_action
+    "action_items": [
+        {"urgency": "IMMEDIATE", "category": "FUNNEL", "input": "funnel_rca_insights",
+         "where": "severity in ('CRITICAL', 'HIGH')"},
+        {"urgency": "IMMEDIATE", "category": "PIPELINE", "input": "pipeline_rca", "where": "severity == 'CRITICAL'"},
+        {"urgency": "IMMEDIATE", "category": "TREND", "input": "trend_rca",
+         "where": "severity == 'CRITICAL' and rca_commentary is not None"},
+        {"urgency": "IMMEDIATE", "category": "GOOGLE_ADS", "input": "google_ads_rca", "where": "severity == 'CRITICAL'",
+         "region": None},
+        {"urgency": "SHORT_TERM", "category": "PIPELINE", "input": "pipeline_rca", "where": "severity == 'HIGH'"},
+        {"urgency": "SHORT_TERM", "category": "TREND", "input": "trend_rca",
+         "where": "severity == 'HIGH' and rca_commentary is not None"},
+        {"urgency": "SHORT_TERM", "category": "GOOGLE_ADS", "input": "google_ads_rca", "where": "severity == 'HIGH'",
+         "region": None},
+        {"urgency": "SHORT_TERM", "category": "LOSS_REASON", "input": "loss_reason_rca",
+         "where": "severity in ('CRITICAL', 'HIGH')",
+         "action": {"cases": [
+             ["action_category == 'PRICING_REVIEW'", "Review pricing competitiveness and value proposition messaging."],
+             ["action_category == 'COMPETITIVE_INTEL'", "Analyze competitor positioning and update battlecards."],
+             ["action_category == 'SALES_PROCESS'", "Improve urgency creation and follow-up cadence."],
+             ["action_category == 'PRODUCT_FEEDBACK'", "Escalate feature gaps to Product team for roadmap consideration."],
+         ], "else": "Review and categorize for process improvement."}},
+        {"urgency": "STRATEGIC", "category": "FUNNEL", "input": "funnel_rca_insights", "where": "severity == 'MEDIUM'"},
+        {"urgency": "STRATEGIC", "category": "PIPELINE", "input": "pipeline_rca", "where": "severity == 'MEDIUM'"},
+        {"urgency": "STRATEGIC", "category": "LOSS_REASON", "input": "loss_reason_rca", "where": "severity == 'MEDIUM'",
+         "action": {"cases": [
+             ["action_category == 'PRICING_REVIEW'", "Conduct pricing analysis and competitive benchmarking."],
+             ["action_category == 'COMPETITIVE_INTEL'", "Build competitor knowledge base and training materials."],
+             ["action_category == 'SALES_PROCESS'", "Develop sales enablement for objection handling."],
+             ["action_category == 'PRODUCT_FEEDBACK'", "Create product feedback loop for customer-driven roadmap."],
+         ], "else": "Implement process improvements based on loss patterns."}},
+    ],
+    "action_item_order": {
+        "IMMEDIATE": [{"field": "severity", "rank": {"CRITICAL": 1, "HIGH": 2}, "default": 3}, "product", "region"],
+        "SHORT_TERM": [{"field": "severity", "rank": {"CRITICAL": 1, "HIGH": 2}, "default": 3}, "product", "region"],
+        "STRATEGIC": ["product", "region"],
+    },
+}
+
+
+# -- NULL-aware runtime used by compiled expressions --------------------------
+
+def _null_safe(op):
+    def apply(a, b):
+        return None if a is None or b is None else op(a, b)
+    return apply
+
+
+def _cast_string(value):
+    """CAST(value AS STRING): integral floats print without a decimal part."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _fmt(value, spec):
+    if value is None:
+        return None
+    if spec == "money":
+        return f"${value:,.0f}"
+    return _cast_string(value)
+
+
+def _concat(*parts):
+    return None if any(part is None for part in parts) else "".join(parts)
+
+
+def _true(value):
+    return value is not None and bool(value)
+
+
+def _in(value, options):
+    return None if value is None else value in options
+
+
+def _coalesce(*values):
+    return next((value for value in values if value is not None), None)
+
+
+def _and(*values):
+    """SQL AND: FALSE if any operand is FALSE, else NULL if any is NULL."""
+    if any(value is not None and not value for value in values):
+        return False
+    return None if any(value is None for value in values) else True
+
+
+def _or(*values):
+    """SQL OR: TRUE if any operand is TRUE, else NULL if any is NULL."""
+    if any(value is not None and value for value in values):
+        return True
+    return None if any(value is None for value in values) else False
+
+
+def _not(value):
+    return None if value is None else not value
+
+
+RUNTIME = {
+    "_eq": _null_safe(lambda a, b: a == b),
+    "_ne": _null_safe(lambda a, b: a != b),
+    "_lt": _null_safe(lambda a, b: a < b),
+    "_le": _null_safe(lambda a, b: a <= b),
+    "_gt": _null_safe(lambda a, b: a > b),
+    "_ge": _null_safe(lambda a, b: a >= b),
+    "_add": _null_safe(lambda a, b: a + b),
+    "_sub": _null_safe(lambda a, b: a - b),
+    "_mul": _null_safe(lambda a, b: a * b),
+    # SAFE_DIVIDE: NULL instead of an error on a zero divisor
+    "_div": _null_safe(lambda a, b: None if b == 0 else a / b),
+    "_in": _in,
+    "_and": _and,
+    "_or": _or,
+    "_not": _not,
+    "_zip": zip,
+    "_range": range,
+    "_fmt": _fmt,
+    "_concat": _concat,
+    "_true": _true,
+    "round": lambda value, digits=0: sql_round(value, digits),
+    "abs": lambda value: None if value is None else abs(value),
+    "int": lambda value: None if value is None else int(value),
+    "coalesce": _coalesce,
+}
+FUNCTIONS = ("round", "abs", "int", "coalesce")
+
+_COMPARE = {ast.Eq: "_eq", ast.NotEq: "_ne", ast.Lt: "_lt", ast.LtE: "_le", ast.Gt: "_gt", ast.GtE: "_ge"}
+_ARITHMETIC = {ast.Add: "_add", ast.Sub: "_sub", ast.Mult: "_mul", ast.Div: "_div"}
+
+# The only syntax a rule expression may use (operators and contexts aside)
+_ALLOWED_NODES = (
+    ast.Expression, ast.Name, ast.Constant, ast.Compare, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Tuple, ast.Call,
+    ast.Load, ast.And, ast.Or, ast.Not, ast.USub, ast.UAdd, ast.In,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot,
+    ast.Add, ast.Sub, ast.Mult, ast.Div,
+)
+
+
+class RuleError(ValueError):
+    """A rule could not be parsed, compiled or evaluated."""
+
+
+class _NullSemantics(ast.NodeTransformer):
+    """Rewrite comparisons and arithmetic into the NULL-aware runtime calls."""
+
+    def __init__(self):
+        self.columns = set()
+
+    def _call(self, name, *args):
+        return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        return self._call("_and" if isinstance(node.op, ast.And) else "_or", *node.values)
+
+    def visit_Name(self, node):
+        if node.id not in FUNCTIONS and node.id not in RUNTIME:
+            self.columns.add(node.id)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        left, parts = node.left, []
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.Is, ast.IsNot)):
+                parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            elif isinstance(op, ast.In):
+                parts.append(self._call("_in", left, right))
+            elif type(op) in _COMPARE:
+                parts.append(self._call(_COMPARE[type(op)], left, right))
+            else:
+                raise RuleError(f"Unsupported comparison {type(op).__name__}")
+            left = right
+        return parts[0] if len(parts) == 1 else self._call("_and", *parts)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if type(node.op) not in _ARITHMETIC:
+            raise RuleError(f"Unsupported operator {type(node.op).__name__}")
+        return self._call(_ARITHMETIC[type(node.op)], node.left, node.right)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+            return ast.Constant(value=-node.operand.value)
+        if isinstance(node.op, ast.USub):
+            return self._call("_mul", ast.Constant(value=-1), node.operand)
+        if isinstance(node.op, ast.Not):
+            return self._call("_not", node.operand)
+        return node
+
+
+def _check_syntax(tree, text):
+    """Reject anything but names, constants, operators and calls to FUNCTIONS."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise RuleError(f"{type(node).__name__} is not allowed in {text!r}")
+        if isinstance(node, ast.Name) and node.id.startswith("_"):
+            raise RuleError(f"Name {node.id!r} is not allowed in {text!r}")
+        if isinstance(node, ast.Call) and (
+                not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords):
+            raise RuleError(f"Only {', '.join(FUNCTIONS)} may be called in {text!r}")
+
+
+def _expression(text, columns):
+    """Translate one expression to NULL-aware Python source, recording its columns."""
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise RuleError(f"Cannot parse {text!r}: {e.msg}")
+    _check_syntax(tree, text)
+    transformer = _NullSemantics()
+    tree = ast.fix_missing_locations(transformer.visit(tree))
+    columns.update(transformer.columns)
+    return f"({ast.unparse(tree.body)})"
+
+
+def _template(value, columns):
+    """Translate a value template to source; a lone {expr} keeps the value's type."""
+    if value is None:
+        return "None"
+    parts = []
+    for literal, field, spec, _ in string.Formatter().parse(value):
+        if literal:
+            parts.append(repr(literal))
+        if field is not None:
+            parts.append((_expression(field, columns), spec))
+    if len(parts) == 1 and isinstance(parts[0], tuple) and not parts[0][1]:
+        return parts[0][0]
+    if all(isinstance(part, str) for part in parts):
+        return repr(value)
+    return "_concat(" + ", ".join(
+        part if isinstance(part, str) else f"_fmt({part[0]}, {part[1]!r})" for part in parts) + ")"
+
+
+def _field_source(field, columns):
+    if "expr" in field:
+        return _expression(field["expr"], columns)
+    source = _template(field.get("else"), columns)
+    for condition, value in reversed(field["cases"]):
+        source = f"({_template(value, columns)} if _true({_expression(condition, columns)}) else {source})"
+    return source
+
+
+def compile_column(source, columns):
+    """Compile row-wise source into a function mapping a column table to a result list."""
+    names = sorted(columns)
+    if names:
+        code = (f"lambda table: [{source} for ({', '.join(names)},) in "
+                f"_zip({', '.join(f'table[{name!r}]' for name in names)})]")
+    else:
+        code = f"lambda table: [{source} for _ in _range(table['__rows__'])]"
+    return eval(compile(code, "<rule>", "eval"), dict(RUNTIME, __builtins__={}))
+
+
+class CompiledTable:
+    """One rule table, compiled: filter, derived fields, output filter and order."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec["name"]
+        self.where = self._compile_predicate(spec.get("where"), "where")
+        self.fields = []
+        for field in spec.get("fields", []):
+            columns = set()
+            source = _field_source(field, columns)
+            self.fields.append((field["name"], compile_column(source, columns), columns))
+        self.output_where = self._compile_predicate(spec.get("output_where"), "output_where")
+
+    @staticmethod
+    def _compile_predicate(text, label):
+        if not text:
+            return None
+        columns = set()
+        source = f"_true({_expression(text, columns)})"
+        return label, compile_column(source, columns), columns
+
+    @staticmethod
+    def _columns(rows, needed):
+        table = {"__rows__": len(rows)}
+        for name in needed:
+            table[name] = [row.get(name) for row in rows]
+        return table
+
+    def _run(self, label, function, rows, columns):
+        """Evaluate one compiled column, reporting failures (e.g. 'x' < 1) as RuleError."""
+        try:
+            return function(self._columns(rows, columns))
+        except (TypeError, ValueError, ArithmeticError) as e:
+            raise RuleError(f"{self.name}.{label}: {type(e).__name__}: {e}")
+
+    def _filter(self, rows, predicate):
+        if predicate is None:
+            return rows
+        label, function, columns = predicate
+        return [row for row, keep in zip(rows, self._run(label, function, rows, columns)) if keep]
+
+    def evaluate(self, rows):
+        """Return every row after `where`, with all fields added (before output filtering)."""
+        rows = [dict(row) for row in self._filter(rows, self.where)]
+        for name, function, columns in self.fields:
+            for row, value in zip(rows, self._run(name, function, rows, columns)):
+                row[name] = value
+        return rows
+
+    def output(self, rows):
+        """Apply output_where, ordering and output columns."""
+        rows = sort_rows(self._filter(rows, self.output_where), self.spec.get("order", []))
+        fields = self.spec.get("output")
+        return [{name: row.get(name) for name in fields} if fields else row for row in rows]
+
+
+def sort_rows(rows, order):
+    """Stable ORDER BY; NULLs sort first as in BigQuery."""
+    def key(row):
+        parts = []
+        for item in order:
+            if isinstance(item, dict):
+                parts.append(item["rank"].get(row.get(item["field"]), item.get("default", len(item["rank"]) + 1)))
+            else:
+                value = row.get(item)
+                parts.append((0, "") if value is None else (1, value))
+        return parts
+    return sorted(rows, key=key)
+
+
+def compile_rules(rules):
+    """Compile a rule set once: rule tables, then action item emitters."""
+    tables = [CompiledTable(spec) for spec in rules["tables"]]
+    emitters = []
+    for i, emitter in enumerate(rules["action_items"]):
+        fields = [{"name": "urgency", "expr": repr(emitter["urgency"])},
+                  {"name": "category", "expr": repr(emitter["category"])}]
+        for name, default in (("product", "{product}"), ("region", "{region}"),
+                              ("issue", "{rca_commentary}"), ("action", "{recommended_action}"),
+                              ("severity", "{severity}")):
+            value = emitter.get(name, default)
+            if isinstance(value, dict):
+                fields.append(dict(value, name=name))
+            else:
+                fields.append({"name": name, "cases": [], "else": value})
+        emitters.append((emitter["input"], CompiledTable({
+            "name": f"action_items[{i}]", "where": emitter.get("where"), "fields": fields,
+            "output": list(ITEM_FIELDS),
+        })))
+    return {"tables": tables, "emitters": emitters, "action_item_order": rules["action_item_order"]}
+
+
+def _rows(section):
+    """Flatten a product-keyed section; rows without a product take the group key."""
+    if isinstance(section, list):
+        return list(section)
+    rows = []
+    for product, product_rows in (section or {}).items():
+        for row in product_rows:
+            rows.append(row if "product" in row else dict(row, product=product))
+    return rows
+
+
+def evaluate(compiled, data, products=PRODUCTS):
+    """Evaluate every rule table and the action items against a report."""
+    inputs = {}
+    sections = {}
+    for table in compiled["tables"]:
+        source = inputs.get(table.spec["input"])
+        if source is None:
+            source = _rows(data.get(table.spec["input"]))
+        rows = table.evaluate(source)
+        inputs[table.name] = rows
+        output = table.output(rows)
+        sections[table.name] = {product: [row for row in output if row["product"] == product]
+                                for product in products}
+
+    items = []
+    for input_name, emitter in compiled["emitters"]:
+        source = inputs.get(input_name)
+        if source is None:
+            source = _rows(data.get(input_name))
+        items.extend(emitter.output(emitter.evaluate(source)))
+    sections["action_items"] = {
+        section: sort_rows([item for item in items if item["urgency"] == urgency],
+                           compiled["action_item_order"][urgency])
+        for urgency, section in URGENCY_SECTIONS.items()
+    }
+    return sections
+
+
+def _canonical(section):
+    """Rows in a fixed order, so rows tied on the query's ORDER BY compare equal."""
+    if isinstance(section, dict):
+        return {key: _canonical(value) for key, value in section.items()}
+    return sorted(section or [], key=lambda row: json.dumps(row, sort_keys=True, default=str))
+
+
+def verify(data, sections):
+    """Return differences between evaluated sections and the report's SQL output."""
+    differences = []
+    for name, section in sections.items():
+        differences.extend(compare(_canonical(data.get(name)), _canonical(section), name))
+    return differences
+
+
+def load_rules(path=None):
+    if not path:
+        return copy.deepcopy(RULES)
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Evaluate RCA and action item rules locally")
+    parser.add_argument("--data", default=str(DATA_PATH))
+    parser.add_argument("--rules", help="Rule set JSON (default: the query's rules)")
+    parser.add_argument("--dump-rules", action="store_true", help="Print the default rule set as JSON")
+    parser.add_argument("-o", "--output", help="Write the evaluated sections here as JSON")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if args.dump_rules:
+        print(json.dumps(RULES, indent=2))
+        return 0
+
+    with open(args.data, "r") as f:
+        data = json.load(f)
+    try:
+        rules = load_rules(args.rules)
+        start = time.perf_counter()
+        compiled = compile_rules(rules)
+        compiled_at = time.perf_counter()
+        sections = evaluate(compiled, data)
+        done = time.perf_counter()
+    except (OSError, json.JSONDecodeError, KeyError, RuleError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    counts = ", ".join(f"{name} {len(rows)}" for name, rows in sections["action_items"].items())
+    print(f"Compiled in {(compiled_at - start) * 1000:.1f} ms, evaluated in {(done - compiled_at) * 1000:.1f} ms")
+    print(f"Action items: {counts}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(sections, indent=2))
+        print(f"Sections saved to: {args.output}")
+    if not args.output and not args.rules:
+        differences = verify(data, sections)
+        for line in differences:
+            print(line)
+        print(f"Rule engine: {len(differences)} differences from the SQL output")
+        return 1 if differences else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Generational Snapshot Store
+
+Publishes report data as immutable generations instead of overwriting
+data/report-data.json in place. Each top-level section is serialized once and
+stored by content hash, so sections that did not change between refreshes are
+shared by every generation that references them.
+
+A refresh writes all new section objects and the generation manifest first,
+then flips the CURRENT pointer with an atomic rename. Readers resolve CURRENT
+and therefore keep serving the last complete generation until the new one is
+fully on disk. Old generations beyond the retention window are pruned together
+with any objects no longer referenced, so storage stays flat across daily
+refreshes.
+
+Layout:
+    data/snapshots/
+        CURRENT                     # id of the live generation
+        generations/<id>.json       # {"generation", "created_at_utc", "sections"}
+        objects/<hh>/<sha256>.json  # one serialized section
+
+Usage:
+    python scripts/snapshot_store.py              # list generations
+    python scripts/snapshot_store.py --prune 7    # keep the 7 newest
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+SNAPSHOT_ROOT = Path(__file__).parent.parent / "data" / "snapshots"
+DEFAULT_KEEP = 7
+
+
+def _file_mode(path):
+    """Mode for a file replacing path: the existing file's, else what open() would create."""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(path, mode="wb", **kwargs):
+    """
+    Open a temp file next to path for writing; it is renamed over path when
+    the block exits normally and removed if it raises, so readers never see a
+    partial file. The file gets the mode open() would give it (or keeps the
+    replaced file's), not mkstemp's owner-only 0600. Extra keyword arguments
+    (encoding, buffering) go to open().
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def atomic_write(path, payload):
+    """Atomically write bytes to path (see atomic_open)."""
+    with atomic_open(path) as f:
+        f.write(payload)
+    return Path(path)
+
+
+def atomic_write_json(path, data):
+    """Atomically write data as indented JSON (the report-data.json format)."""
+    return atomic_write(path, json.dumps(data, indent=2).encode("utf-8"))
+
+
+def encode_section(value):
+    """Serialize one section to the canonical bytes that are hashed and stored."""
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def section_hash(payload):
+    """Return the content hash used as an object id."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _object_path(root, digest):
+    return Path(root) / "objects" / digest[:2] / f"{digest}.json"
+
+
+def _generation_path(root, generation):
+    return Path(root) / "generations" / f"{generation}.json"
+
+
+def new_generation_id():
+    """Return a sortable generation id based on the current UTC time."""
+    return datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def current_generation(root=SNAPSHOT_ROOT):
+    """Return the id of the live generation, or None if nothing is published."""
+    pointer = Path(root) / "CURRENT"
+    if not pointer.exists():
+        return None
+    return pointer.read_text().strip() or None
+
+
+def list_generations(root=SNAPSHOT_ROOT):
+    """Return all generation ids on disk, oldest first."""
+    gen_dir = Path(root) / "generations"
+    if not gen_dir.exists():
+        return []
+    return sorted(p.stem for p in gen_dir.glob("*.json"))
+
+
+def read_manifest(generation=None, root=SNAPSHOT_ROOT):
+    """Load a generation manifest (the live one by default)."""
+    generation = generation or current_generation(root)
+    if generation is None:
+        raise FileNotFoundError(f"No published generation under {root}")
+    with open(_generation_path(root, generation), "r") as f:
+        return json.load(f)
+
+
+def load_section(digest, root=SNAPSHOT_ROOT):
+    """Decode a single stored section by its content hash."""
+    with open(_object_path(root, digest), "rb") as f:
+        return json.loads(f.read())
+
+
+def load_generation(generation=None, root=SNAPSHOT_ROOT):
+    """Reassemble the full report dict for a generation (the live one by default)."""
+    manifest = read_manifest(generation, root)
+    return {name: load_section(digest, root) for name, digest in manifest["sections"].items()}
+
+
+def publish(data, root=SNAPSHOT_ROOT, keep=DEFAULT_KEEP):
+    """
+    Store data as a new generation and make it live.
+
+    Returns (generation_id, stats) where stats counts sections written vs reused.
+    """
+    root = Path(root)
+    generation = new_generation_id()
+    sections = {}
+    written = 0
+    reused = 0
+
+    for name, value in data.items():
+        payload = encode_section(value)
+        digest = section_hash(payload)
+        obj_path = _object_path(root, digest)
+        if obj_path.exists():
+            reused += 1
+        else:
+            atomic_write(obj_path, payload)
+            written += 1
+        sections[name] = digest
+
+    manifest = {
+        "generation": generation,
+        "created_at_utc": datetime.utcnow().isoformat(),
+        "sections": sections,
+    }
+    atomic_write_json(_generation_path(root, generation), manifest)
+
+    # Flip the pointer last: until this rename, readers still see the previous generation
+    atomic_write(root / "CURRENT", generation.encode("utf-8"))
+
+    removed = prune(root, keep) if keep else (0, 0)
+    stats = {
+        "sections_written": written,
+        "sections_reused": reused,
+        "generations_pruned": removed[0],
+        "objects_pruned": removed[1],
+    }
+    return generation, stats
+
+
+def prune(root=SNAPSHOT_ROOT, keep=DEFAULT_KEEP):
+    """
+    Drop all but the newest `keep` generations and any objects they no longer reference.
+
+    The live generation is always retained. Returns (generations_removed, objects_removed).
+    """
+    root = Path(root)
+    keep = max(int(keep), 1)
+    generations = list_generations(root)
+    live = current_generation(root)
+    retained = set(generations[-keep:])
+    if live:
+        retained.add(live)
+
+    removed_generations = 0
+    for generation in generations:
+        if generation not in retained:
+            _generation_path(root, generation).unlink()
+            removed_generations += 1
+
+    referenced = set()
+    for generation in retained:
+        path = _generation_path(root, generation)
+        if path.exists():
+            with open(path, "r") as f:
+                referenced.update(json.load(f)["sections"].values())
+
+    removed_objects = 0
+    obj_dir = root / "objects"
+    if obj_dir.exists():
+        for obj_path in obj_dir.glob("*/*.json"):
+            if obj_path.stem not in referenced:
+                obj_path.unlink()
+                removed_objects += 1
+
+    return removed_generations, removed_objects
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Inspect or prune report snapshot generations")
+    parser.add_argument("--root", default=str(SNAPSHOT_ROOT), help="Snapshot store directory")
+    parser.add_argument("--prune", type=int, metavar="KEEP", help="Keep only the newest KEEP generations")
+    args = parser.parse_args()
+
+    if args.prune is not None:
+        removed_generations, removed_objects = prune(args.root, args.prune)
+        print(f"Pruned {removed_generations} generations and {removed_objects} objects")
+
+    live = current_generation(args.root)
+    generations = list_generations(args.root)
+    if not generations:
+        print(f"No generations found under {args.root}")
+        return 0
+
+    for generation in generations:
+        marker = "*" if generation == live else " "
+        manifest = read_manifest(generation, args.root)
+        print(f"{marker} {generation}  ({len(manifest['sections'])} sections)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
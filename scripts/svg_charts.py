@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Inline SVG Charts
+
+Tiny server-side charts for the HTML report, rendered straight from the data
+in Python: no charting JavaScript is shipped, so reports stay light and open
+instantly offline. Every function returns a self-contained <svg> string sized
+to sit inside a table cell.
+
+    sparkline       a series as a polyline, optionally over a dashed
+                    comparison series (e.g. this week's funnel vs last week's)
+    pacing_bar      a horizontal bar for a pacing/attainment percentage with
+                    a target marker, colored by RAG threshold
+    change_bars     diverging bars for a set of +/- percentage changes
+
+Usage:
+    python scripts/svg_charts.py              # benchmark chart rendering
+    python scripts/svg_charts.py --charts 1000
+"""
+
+import argparse
+import random
+import sys
+import time
+from html import escape
+
+
+GREEN = "#28a745"
+YELLOW = "#ffc107"
+RED = "#dc3545"
+GRAY = "#adb5bd"
+BLUE = "#0d6efd"
+
+
+def _fmt(value):
+    """Format a coordinate compactly (one decimal, no trailing zeros)."""
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def _points(values, width, height, pad, low, high):
+    span = (high - low) or 1
+    step = (width - 2 * pad) / max(len(values) - 1, 1)
+    return [
+        (pad + i * step, height - pad - ((v or 0) - low) / span * (height - 2 * pad))
+        for i, v in enumerate(values)
+    ]
+
+
+def _polyline(points, color, extra=""):
+    coords = " ".join(f"{_fmt(x)},{_fmt(y)}" for x, y in points)
+    return f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="1.5"{extra}/>'
+
+
+def sparkline(values, baseline=None, width=96, height=24, color=BLUE, title=None):
+    """
+    Return a sparkline of values; baseline, if given, is drawn dashed behind it.
+
+    Both series share one vertical scale starting at zero (or their minimum,
+    if negative), so the two shapes are directly comparable.
+    """
+    series = list(values) + list(baseline or ())
+    low = min(0, min((v or 0) for v in series)) if series else 0
+    high = max((v or 0) for v in series) if series else 1
+    pad = 2
+    parts = [f'<svg class="spark" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">']
+    if title:
+        parts.append(f"<title>{escape(title)}</title>")
+    if baseline:
+        parts.append(_polyline(_points(baseline, width, height, pad, low, high), GRAY, ' stroke-dasharray="2 2"'))
+    if values:
+        points = _points(values, width, height, pad, low, high)
+        parts.append(_polyline(points, color))
+        x, y = points[-1]
+        parts.append(f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="2" fill="{color}"/>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def rag_color(pct, green_at=90, yellow_at=70):
+    """Return the RAG color for a pacing percentage."""
+    if pct is None:
+        return GRAY
+    if pct >= green_at:
+        return GREEN
+    if pct >= yellow_at:
+        return YELLOW
+    return RED
+
+
+def pacing_bar(pct, target=100, max_pct=150, width=100, height=10, title=None):
+    """Return a bar filled to pct (capped at max_pct) with a marker at target."""
+    value = max(0, min(pct or 0, max_pct))
+    fill = value / max_pct * width
+    marker = target / max_pct * width
+    label = title if title is not None else f"{pct or 0:.0f}% of target"
+    return (
+        f'<svg class="pacing-bar" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">'
+        f"<title>{escape(label)}</title>"
+        f'<rect width="{width}" height="{height}" rx="2" fill="#e9ecef"/>'
+        f'<rect width="{_fmt(fill)}" height="{height}" rx="2" fill="{rag_color(pct)}"/>'
+        f'<line x1="{_fmt(marker)}" x2="{_fmt(marker)}" y1="0" y2="{height}" stroke="#343a40" stroke-width="1"/>'
+        "</svg>"
+    )
+
+
+def change_bars(changes, labels=None, limit=100, width=96, height=24, title=None):
+    """
+    Return diverging bars for percentage changes around a zero line.
+
+    Bars are clipped at +/- limit percent; positive changes are green and
+    negative ones red.
+    """
+    count = max(len(changes), 1)
+    slot = width / count
+    bar = max(slot - 2, 1)
+    middle = height / 2
+    parts = [f'<svg class="change-bars" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">']
+    if title or labels:
+        text = title or ", ".join(f"{label} {(c or 0):+.0f}%" for label, c in zip(labels, changes))
+        parts.append(f"<title>{escape(text)}</title>")
+    for i, change in enumerate(changes):
+        change = change or 0
+        size = min(abs(change), limit) / limit * (middle - 1)
+        y = middle - size if change >= 0 else middle
+        parts.append(f'<rect x="{_fmt(i * slot + 1)}" y="{_fmt(y)}" width="{_fmt(bar)}" '
+                     f'height="{_fmt(max(size, 0.5))}" fill="{GREEN if change >= 0 else RED}"/>')
+    parts.append(f'<line x1="0" x2="{width}" y1="{_fmt(middle)}" y2="{_fmt(middle)}" stroke="{GRAY}" stroke-width="0.5"/>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def benchmark(charts=500, repeat=5, seed=7):
+    """Print per-chart render time and size for each chart type."""
+    rng = random.Random(seed)
+    funnels = [[rng.randint(0, 200) for _ in range(4)] for _ in range(charts)]
+    pcts = [rng.uniform(0, 180) for _ in range(charts)]
+    changes = [[rng.uniform(-120, 120) for _ in range(4)] for _ in range(charts)]
+    cases = (
+        ("sparkline", lambda i: sparkline(funnels[i], funnels[i - 1], title="MQL/SQL/SAL/SQO")),
+        ("pacing_bar", lambda i: pacing_bar(pcts[i])),
+        ("change_bars", lambda i: change_bars(changes[i], ("MQL", "SQL", "SAL", "SQO"))),
+    )
+
+    print("=" * 60)
+    print(f"SVG CHART BENCHMARK ({charts:,} charts per type, best of {repeat})")
+    print("=" * 60)
+    print(f"{'Chart':<14} {'Total':>10} {'Per chart':>12} {'Avg size':>10}")
+    for name, render in cases:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = [render(i) for i in range(charts)]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        size = sum(len(svg) for svg in output) / charts
+        print(f"{name:<14} {best * 1000:>8.1f}ms {best / charts * 1e6:>10.1f}us {size:>9.0f}B")
+    print("=" * 60)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark inline SVG chart rendering")
+    parser.add_argument("--charts", type=int, default=500, help="Charts rendered per chart type")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    benchmark(args.charts, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,680 @@
+#!/usr/bin/env python3
+"""
+Synthetic Report Data Generator
+
+Produces query output with the exact report-data.json schema (every section,
+every field, same key order) at any scale, so the generators, renderers and
+benchmarks can be exercised without BigQuery access. Values are random but
+internally consistent: attainment, totals and risk pockets are aggregated
+from the generated deals by aggregation_engine (the query's own formulas),
+loss analysis comes from the lost deals through loss_analytics, the funnel
+sections are computed from generated counts by funnel_engine, and the RCA
+sections and action items follow from all of them through rule_engine.
+
+Scale is controlled by the number of products, regions and sources, pipeline
+deals per product (won and lost deals follow from it) and MQL/SQL detail rows
+per product. The same seed always produces the same report.
+
+Usage:
+    python scripts/synthetic_data.py -o /tmp/report-data.json
+    python scripts/synthetic_data.py --deals 50000 --details 20000 -o big.json
+    python scripts/synthetic_data.py --check      # compare schema with data/report-data.json
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from aggregation_engine import DealColumns, aggregate
+from funnel_engine import SECTION_ORDER, attainment_row, health_row, pacing_row, rollup
+from loss_analytics import new_store as new_loss_store, sections as loss_sections_of, update as update_loss_store
+from rule_engine import RULES, compile_rules, evaluate as evaluate_rules
+
+
+PRODUCTS = ("POR", "R360")
+REGIONS = ("AMER", "EMEA", "APAC")
+CATEGORIES = ("NEW LOGO", "EXPANSION", "MIGRATION")
+SOURCES = ("INBOUND", "OUTBOUND", "AE SOURCED", "AM SOURCED", "TRADESHOW", "PARTNERSHIPS")
+FUNNEL_STAGES = ("mql", "sql", "sal", "sqo")
+
+# Funnel target categories use NEW BUSINESS where deals use NEW LOGO
+FUNNEL_CATEGORIES = ("NEW BUSINESS", "EXPANSION", "MIGRATION")
+CATEGORY_KEYS = ("product", "region", "category")
+SOURCE_KEYS = CATEGORY_KEYS + ("source",)
+
+DEAL_TYPES = {"NEW LOGO": "New Business", "EXPANSION": "Existing Business", "MIGRATION": "Migration"}
+PIPELINE_STAGES = ("Discovery", "Qualification", "Demonstration", "Proposal", "Negotiation",
+                   "Fortification", "Contract Out", "Verbal Commitment")
+# Target scale of each SOP percentile relative to the report's own (P50)
+SOP_PERCENTILE_SCALES = {"P50": 1.0, "P75": 1.15, "P90": 1.3}
+LOSS_REASONS = ("Pricing was too high", "Not Ready to Buy", "Timing", "Not Interested",
+                "Unresponsive", "Integration", "Too expensive")
+
+REGION_WEIGHTS = (0.6, 0.25, 0.15)
+CATEGORY_WEIGHTS = (0.55, 0.3, 0.15)
+
+QUERY_VERSION = "2.6.1"
+REPORT_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+
+
+def _severity(pct):
+    return "CRITICAL" if pct < 50 else "HIGH" if pct < 70 else "MEDIUM" if pct < 90 else "LOW"
+
+
+def _trend(change_pct):
+    return "UP" if change_pct > 5 else "DOWN" if change_pct < -5 else "FLAT"
+
+
+def _sfdc_id(rng, prefix):
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    return prefix + "".join(rng.choice(alphabet) for _ in range(18 - len(prefix)))
+
+
+def _period(as_of):
+    quarter_start = date(as_of.year, 3 * ((as_of.month - 1) // 3) + 1, 1)
+    next_quarter = date(quarter_start.year + (quarter_start.month == 10), (quarter_start.month + 2) % 12 + 1, 1)
+    total_days = (next_quarter - quarter_start).days
+    elapsed = (as_of - quarter_start).days + 1
+    return {
+        "quarter_start": quarter_start.isoformat(),
+        "as_of_date": as_of.isoformat(),
+        "days_elapsed": elapsed,
+        "days_remaining": total_days - elapsed,
+        "total_days": total_days,
+        "quarter_pct_complete": round(elapsed / total_days * 100, 1),
+    }
+
+
+def _deals(rng, product, regions, count, kind, owners, quarter_start, as_of):
+    """Generate won, lost or pipeline deals for one product."""
+    deals = []
+    elapsed = (as_of - quarter_start).days
+    for _ in range(count):
+        region = rng.choices(regions, REGION_WEIGHTS[:len(regions)])[0]
+        category = rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+        account = f"{rng.choice(('Summit', 'Apex', 'Harbor', 'Valley', 'Metro', 'Prime', 'Atlas'))} " \
+                  f"{rng.choice(('Rentals', 'Equipment', 'Tool Hire', 'Event Co', 'Lifts', 'Party Rental'))} " \
+                  f"{rng.randint(1, 999)}"
+        opportunity_id = _sfdc_id(rng, "006")
+        owner_name, owner_id = rng.choice(owners)
+        if kind == "pipeline":
+            stage = rng.choice(PIPELINE_STAGES)
+            close_date = as_of + timedelta(days=rng.randint(-45, 120))
+        else:
+            stage = "Closed Won" if kind == "won" else "Closed Lost"
+            close_date = quarter_start + timedelta(days=rng.randint(0, max(elapsed, 0)))
+        deals.append({
+            "opportunity_id": opportunity_id,
+            "account_name": account,
+            "opportunity_name": f"{product} {DEAL_TYPES[category]} for {account}",
+            "product": product,
+            "region": region,
+            "category": category,
+            "deal_type": DEAL_TYPES[category],
+            "acv": round(rng.lognormvariate(9.3, 0.9), 2),
+            "close_date": close_date.isoformat(),
+            "stage": stage,
+            "is_won": kind == "won",
+            "is_closed": kind != "pipeline",
+            "loss_reason": rng.choice(LOSS_REASONS) if kind == "lost" else None,
+            "source": rng.choice(SOURCES[:-1]),
+            "owner_name": owner_name,
+            "owner_id": owner_id,
+            "salesforce_url": f"https://por.my.salesforce.com/{opportunity_id}",
+        })
+    return deals
+
+
+def _funnel_counts(rng, scale):
+    """Return (q1 targets, qtd targets, actuals) for MQL/SQL/SAL/SQO."""
+    q1_mql = max(1, int(rng.uniform(200, 900) * scale))
+    q1 = {"mql": q1_mql}
+    for prev, stage, rate in (("mql", "sql", 0.5), ("sql", "sal", 0.6), ("sal", "sqo", 0.5)):
+        q1[stage] = max(1, int(q1[prev] * rate * rng.uniform(0.8, 1.2)))
+    return q1
+
+
+def _funnel_row(rng, q1, pct_complete):
+    qtd = {s: max(1, round(q1[s] * pct_complete / 100)) for s in FUNNEL_STAGES}
+    actual = {s: max(0, round(qtd[s] * rng.uniform(0.3, 1.6))) for s in FUNNEL_STAGES}
+    pacing = {s: round(actual[s] / qtd[s] * 100) for s in FUNNEL_STAGES}
+    return qtd, actual, pacing
+
+
+def generate_report(seed=42, products=PRODUCTS, regions=REGIONS, sources=SOURCES, deals=250,
+                    details=0, owners=20, as_of=date(2026, 1, 14)):
+    """
+    Return a synthetic report dict with the report-data.json schema.
+
+    deals is the number of open pipeline deals per product; about a fifth as
+    many won and a twelfth as many lost deals are generated alongside.
+    details is the number of MQL detail rows per product (SQL details are
+    half as many).
+    """
+    rng = random.Random(seed)
+    period = _period(as_of)
+    pct_complete = period["quarter_pct_complete"]
+    quarter_start = date.fromisoformat(period["quarter_start"])
+    funnel_scale = max(deals / 250, 0.05)
+
+    won_deals, lost_deals, pipeline_deals = {}, {}, {}
+    for product in products:
+        pool = [(f"{rng.choice(('Alex', 'Jordan', 'Sam', 'Riley', 'Casey', 'Morgan'))} "
+                 f"{rng.choice(('Reed', 'Lopez', 'Green', 'Wright', 'Harris', 'Young'))} {i}",
+                 _sfdc_id(rng, "005")) for i in range(owners)]
+        won_deals[product] = _deals(rng, product, regions, deals // 5, "won", pool, quarter_start, as_of)
+        lost_deals[product] = _deals(rng, product, regions, deals // 12, "lost", pool, quarter_start, as_of)
+        pipeline_deals[product] = _deals(rng, product, regions, deals, "pipeline", pool, quarter_start, as_of)
+
+    def segment(section, product, region, category=None, source=None):
+        return [d for d in section[product] if d["region"] == region
+                and (category is None or d["category"] == category)
+                and (source is None or d["source"] == source)]
+
+    # Attainment and everything derived from it, aggregated the way the query does
+    segment_targets, source_targets, fy_targets = [], [], {}
+    for product in products:
+        for region in regions:
+            for category in CATEGORIES:
+                acv = sum(d["acv"] for d in segment(won_deals, product, region, category))
+                acv = max(acv, sum(d["acv"] for d in segment(pipeline_deals, product, region, category)) / 8)
+                segment_targets.append({
+                    "product": product, "region": region, "category": category,
+                    "q1_target": round(acv / max(pct_complete, 1) * 100 * rng.uniform(0.6, 1.6), 2),
+                    "pipeline_avg_age_days": rng.randint(20, 200),
+                })
+            for source in sources:
+                source_targets.append({"product": product, "region": region, "source": source,
+                                       "q1_target": round(rng.uniform(20000, 400000) * funnel_scale, 2)})
+        fy_targets[product] = round(sum(t["q1_target"] for t in segment_targets if t["product"] == product) * 4, 2)
+
+    columns = DealColumns({"won": (d for p in products for d in won_deals[p]),
+                           "lost": (d for p in products for d in lost_deals[p]),
+                           "pipeline": (d for p in products for d in pipeline_deals[p])})
+    sections = aggregate(columns, {"segments": segment_targets, "sources": source_targets, "fy_targets": fy_targets},
+                         period)
+    attainment_detail = {product: sections["attainment_detail"].get(product, []) for product in products}
+    source_attainment = {product: sections["source_attainment"].get(product, []) for product in products}
+    product_totals = sections["product_totals"]
+    grand_total = sections["grand_total"]
+    top_risk_pockets = sections["top_risk_pockets"]
+    all_rows = [row for product in products for row in attainment_detail[product]]
+
+    wins_bright_spots = {product: [] for product in products}
+    for row in all_rows:
+        product, region, category = row["product"], row["region"], row["category"]
+        if row["qtd_attainment_pct"] >= 100:
+            over = row["qtd_attainment_pct"]
+            wins_bright_spots[product].append({
+                "product": product, "region": region, "category": category,
+                "qtd_attainment_pct": over, "qtd_acv": row["qtd_acv"], "qtd_target": row["qtd_target"],
+                "performance_tier": "EXCEPTIONAL" if over >= 120 else "ON_TRACK",
+                "success_commentary": f"{region} {category} at {over:.0f}% - exceeding targets by {over - 100:.0f}%.",
+                "contributing_factor": "High win rate" if (row["win_rate_pct"] or 0) >= 50 else "Strong pipeline",
+                "pipeline_coverage_x": row["pipeline_coverage_x"], "win_rate_pct": row["win_rate_pct"],
+            })
+
+    # Funnel sections, one product x region row each (plus category/source breakdowns)
+    funnel_pacing, funnel_health, funnel_rca_insights, funnel_trends = {}, {}, {}, {}
+    funnel_by_category, funnel_by_source, momentum_indicators = {}, {}, {}
+    for product in products:
+        for section in (funnel_pacing, funnel_health, funnel_rca_insights, funnel_trends,
+                        funnel_by_category, funnel_by_source, momentum_indicators):
+            section[product] = []
+        for region in regions:
+            q1 = _funnel_counts(rng, funnel_scale)
+            qtd, actual, pacing = _funnel_row(rng, q1, pct_complete)
+            bottleneck = min(FUNNEL_STAGES, key=lambda s: pacing[s])
+            inputs = {"product": product, "region": region,
+                      "inbound_target_acv": round(rng.uniform(10000, 80000) * funnel_scale, 2)}
+            inputs.update({f"actual_{s}": actual[s] for s in FUNNEL_STAGES})
+            inputs.update({f"q1_target_{s}": q1[s] for s in FUNNEL_STAGES})
+            inputs.update({f"qtd_target_{s}": qtd[s] for s in FUNNEL_STAGES})
+            funnel_pacing[product].append(pacing_row(inputs))
+            funnel_health[product].append(health_row(inputs))
+
+            funnel_rca_insights[product].append({
+                "product": product, "region": region, "primary_bottleneck": bottleneck.upper(),
+                "severity": _severity(pacing[bottleneck]),
+                "rca_commentary": f"{region} {bottleneck.upper()} pacing at {pacing[bottleneck]}% of QTD target.",
+                "recommended_action": "Review conversion at the bottleneck stage and rebalance funnel investment.",
+                **{f"{s}_pacing_pct": pacing[s] for s in FUNNEL_STAGES},
+            })
+
+            current = {s: max(0, round(actual[s] / max(period["days_elapsed"], 1) * 7 * rng.uniform(0.6, 1.4)))
+                       for s in FUNNEL_STAGES}
+            prior = {s: max(0, round(current[s] * rng.uniform(0.6, 1.5))) for s in FUNNEL_STAGES}
+            wow_pct = {s: round((current[s] - prior[s]) / prior[s] * 100) if prior[s] else 0 for s in FUNNEL_STAGES}
+            trend_row = {"product": product, "region": region}
+            trend_row.update({f"{s}_current_7d": current[s] for s in FUNNEL_STAGES})
+            trend_row.update({f"{s}_prior_7d": prior[s] for s in FUNNEL_STAGES})
+            trend_row.update({f"{s}_wow_change": current[s] - prior[s] for s in FUNNEL_STAGES})
+            trend_row.update({f"{s}_wow_pct": wow_pct[s] for s in FUNNEL_STAGES})
+            trend_row.update({f"{s}_trend": _trend(wow_pct[s]) for s in FUNNEL_STAGES})
+            funnel_trends[product].append(trend_row)
+
+            for category in CATEGORIES:
+                row = next((r for r in attainment_detail[product]
+                            if r["region"] == region and r["category"] == category), None)
+                if row and row["rag_status"] != "GREEN" and (wow_pct["mql"] > 5 or (row["pipeline_coverage_x"] or 0) >= 2):
+                    positives = (wow_pct["mql"] > 5) + (wow_pct["sql"] > 5) + ((row["pipeline_coverage_x"] or 0) >= 2)
+                    momentum_indicators[product].append({
+                        "product": product, "region": region, "category": category,
+                        "momentum_tier": "STRONG_MOMENTUM" if positives >= 2 else "MODERATE_MOMENTUM",
+                        "positive_momentum_count": positives,
+                        "momentum_commentary": f"{region} {category} at {row['qtd_attainment_pct']:.0f}% "
+                                               f"({row['rag_status']}) showing positive momentum.",
+                        "mql_trend": _trend(wow_pct["mql"]), "mql_wow_pct": wow_pct["mql"],
+                        "sql_trend": _trend(wow_pct["sql"]), "sql_wow_pct": wow_pct["sql"],
+                        "current_attainment_pct": row["qtd_attainment_pct"],
+                        "pipeline_coverage_x": row["pipeline_coverage_x"],
+                        "gap_to_green": round(max(90 - row["qtd_attainment_pct"], 0)),
+                    })
+
+            source_inputs = []
+            for category in FUNNEL_CATEGORIES:
+                cat_q1 = {s: max(0, round(q1[s] * rng.uniform(0.2, 0.5))) for s in FUNNEL_STAGES}
+                for source in sources:
+                    src_q1 = {s: round(v * rng.uniform(0.1, 0.4)) for s, v in cat_q1.items()}
+                    src_qtd = {s: round(src_q1[s] * pct_complete / 100) for s in FUNNEL_STAGES}
+                    row = {"product": product, "region": region, "category": category, "source": source}
+                    row.update({f"q1_target_{s}": src_q1[s] for s in FUNNEL_STAGES})
+                    row.update({f"qtd_target_{s}": src_qtd[s] for s in FUNNEL_STAGES})
+                    row.update({f"actual_{s}": max(0, round(src_qtd[s] * rng.uniform(0.3, 1.6) + rng.randint(0, 3)))
+                                for s in FUNNEL_STAGES})
+                    source_inputs.append(row)
+            funnel_by_source[product].extend(attainment_row(row, SOURCE_KEYS) for row in source_inputs)
+            funnel_by_category[product].extend(attainment_row(row, CATEGORY_KEYS)
+                                               for row in rollup(source_inputs, CATEGORY_KEYS))
+
+    for name, section in (("funnel_pacing", funnel_pacing), ("funnel_health", funnel_health),
+                          ("funnel_by_category", funnel_by_category), ("funnel_by_source", funnel_by_source)):
+        for rows in section.values():
+            rows.sort(key=lambda r: tuple(r[key] for key in SECTION_ORDER[name]))
+
+    # Loss analysis from the lost deals
+    loss_store = new_loss_store()
+    update_loss_store(loss_store, {"period": period, "lost_deals": lost_deals})
+    loss_sections = loss_sections_of(loss_store, [period["quarter_start"]])
+    loss_reasons, loss_reason_rca = loss_sections["loss_reasons"], loss_sections["loss_reason_rca"]
+    competitor_losses = loss_sections["competitor_losses"]
+
+    # Google Ads (rows carry no product field; the group key supplies it)
+    google_ads = {}
+    for product in products:
+        google_ads[product] = []
+        for region in regions:
+            impressions = int(rng.uniform(2000, 20000) * funnel_scale) + 1
+            clicks = max(1, int(impressions * rng.uniform(0.03, 0.15)))
+            spend = round(clicks * rng.uniform(3, 12), 2)
+            conversions = max(clicks * rng.uniform(0.01, 0.08), 0.1)
+            ctr, cpc, cpa = round(clicks / impressions * 100, 2), round(spend / clicks, 2), round(spend / conversions, 2)
+            google_ads[product].append({"region": region, "impressions": impressions, "clicks": clicks,
+                                        "ad_spend_usd": spend, "conversions": conversions, "ctr_pct": ctr,
+                                        "cpc_usd": cpc, "cpa_usd": cpa})
+
+    # Pipeline, trend and Google Ads RCA and the action items, by the query's rules
+    rca = evaluate_rules(compile_rules(RULES), {
+        "attainment_detail": attainment_detail, "funnel_trends": funnel_trends, "google_ads": google_ads,
+        "funnel_rca_insights": funnel_rca_insights, "loss_reason_rca": loss_reason_rca,
+    }, products)
+    pipeline_rca, trend_rca, google_ads_rca = rca["pipeline_rca"], rca["trend_rca"], rca["google_ads_rca"]
+    action_items = rca["action_items"]
+
+    mql_details, sql_details = {}, {}
+    for product in products:
+        mql_details[product] = []
+        for _ in range(details):
+            region = rng.choices(regions, REGION_WEIGHTS[:len(regions)])[0]
+            record_id = _sfdc_id(rng, "00Q")
+            mql_date = quarter_start + timedelta(days=rng.randint(0, max(period["days_elapsed"] - 1, 0)))
+            converted = rng.random() < 0.45
+            mql_details[product].append({
+                "product": product, "region": region, "record_id": record_id,
+                "salesforce_url": f"https://por.my.salesforce.com/{record_id}",
+                "company_name": f"Company {rng.randint(1, 99999)}", "email": f"lead{rng.randint(1, 999999)}@example.com",
+                "source": rng.choice(sources), "mql_date": mql_date.isoformat(),
+                "converted_to_sql": "Yes" if converted else "No",
+                "mql_status": "CONVERTED" if converted else rng.choice(("ACTIVE", "STALLED", "REVERTED")),
+                "was_reverted": False, "days_in_stage": rng.randint(0, 30),
+                "lead_type": "MQL", "category": rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0],
+            })
+        sql_details[product] = []
+        for mql in mql_details[product][:details // 2]:
+            sql_date = date.fromisoformat(mql["mql_date"]) + timedelta(days=rng.randint(0, 7))
+            has_opp = rng.random() < 0.5
+            sql_details[product].append({
+                "product": product, "region": mql["region"], "record_id": mql["record_id"],
+                "salesforce_url": mql["salesforce_url"], "company_name": mql["company_name"], "email": mql["email"],
+                "source": mql["source"], "sql_date": sql_date.isoformat(), "mql_date": mql["mql_date"],
+                "days_mql_to_sql": (sql_date - date.fromisoformat(mql["mql_date"])).days,
+                "converted_to_sal": "Yes" if has_opp else "No", "converted_to_sqo": "No",
+                "has_opportunity": "Yes" if has_opp else "No",
+                "sql_status": "CONVERTED_SAL" if has_opp else rng.choice(("ACTIVE", "STALLED")),
+                "days_in_stage": rng.randint(0, 30), "category": mql["category"],
+            })
+
+    all_momentum = [m for product in products for m in momentum_indicators[product]]
+    return {
+        "generated_at_utc": datetime(as_of.year, as_of.month, as_of.day, 19).isoformat(),
+        "report_date": as_of.isoformat(),
+        "percentile": "P50",
+        "query_version": QUERY_VERSION,
+        "period": period,
+        "executive_counts": {
+            "areas_exceeding_target": sum(1 for r in all_rows if r["qtd_attainment_pct"] >= 100),
+            "areas_at_risk": sum(1 for r in all_rows if r["rag_status"] == "RED"),
+            "areas_needing_attention": sum(1 for r in all_rows if r["rag_status"] == "YELLOW"),
+            "areas_with_momentum": len(all_momentum),
+        },
+        "grand_total": grand_total,
+        "product_totals": product_totals,
+        "wins_bright_spots": wins_bright_spots,
+        "momentum_indicators": momentum_indicators,
+        "attainment_detail": attainment_detail,
+        "top_risk_pockets": top_risk_pockets,
+        "funnel_pacing": funnel_pacing,
+        "source_attainment": source_attainment,
+        "funnel_health": funnel_health,
+        "funnel_by_category": funnel_by_category,
+        "funnel_by_source": funnel_by_source,
+        "funnel_rca_insights": funnel_rca_insights,
+        "funnel_trends": funnel_trends,
+        "loss_reason_rca": loss_reason_rca,
+        "loss_reasons": loss_reasons,
+        "competitor_losses": competitor_losses,
+        "google_ads": google_ads,
+        "pipeline_rca": pipeline_rca,
+        "trend_rca": trend_rca,
+        "google_ads_rca": google_ads_rca,
+        "action_items": action_items,
+        "quarterly_targets": {
+            **{f"{product}_Q1_target": product_totals[product]["total_q1_target"] for product in products},
+            "combined_Q1_target": grand_total["total_q1_target"],
+        },
+        "won_deals": won_deals,
+        "lost_deals": lost_deals,
+        "pipeline_deals": pipeline_deals,
+        "mql_details": mql_details,
+        "sql_details": sql_details,
+    }
+
+
+def generate_sop_targets(report, scales=SOP_PERCENTILE_SCALES):
+    """
+    Return query_sop_targets_by_percentile.sql output for a report.
+
+    The report's targets are taken as P50; other percentiles scale them.
+    """
+    segments, sources, fy_targets = [], [], []
+    for percentile, scale in sorted(scales.items()):
+        for product, rows in sorted((report.get("attainment_detail") or {}).items()):
+            for row in sorted(rows, key=lambda r: (r["region"], r["category"])):
+                segments.append({"percentile": percentile, "product": product, "region": row["region"],
+                                 "category": row["category"], "q1_target": round(row["q1_target"] * scale, 2)})
+        for product, rows in sorted((report.get("source_attainment") or {}).items()):
+            for row in sorted(rows, key=lambda r: (r["region"], r["source"])):
+                sources.append({"percentile": percentile, "product": product, "region": row["region"],
+                                "source": row["source"], "q1_target": round(row["q1_target"] * scale, 2)})
+        for product, total in sorted((report.get("product_totals") or {}).items()):
+            if total:
+                fy_targets.append({"percentile": percentile, "product": product,
+                                   "fy_target": round(total["total_fy_target"] * scale, 2)})
+    return {"segments": segments, "sources": sources, "fy_targets": fy_targets}
+
+
+def generate_daily_funnel(report):
+    """
+    Return query_daily_funnel_counts.sql output for a report.
+
+    Each funnel_by_source row's actuals are spread evenly over the quarter's
+    elapsed days, so daily counts sum back to the report's funnel actuals.
+    """
+    period = report["period"]
+    start, days = date.fromisoformat(period["quarter_start"]), max(period["days_elapsed"], 1)
+    counts = {}
+    for rows in (report.get("funnel_by_source") or {}).values():
+        for row in rows:
+            for i in range(days):
+                key = ((start + timedelta(days=i)).isoformat(), row["product"], row["region"], row["source"])
+                totals = counts.setdefault(key, dict.fromkeys(FUNNEL_STAGES, 0))
+                for stage in FUNNEL_STAGES:
+                    actual = row.get(f"actual_{stage}") or 0
+                    totals[stage] += actual * (i + 1) // days - actual * i // days
+    return {
+        "quarter_start": period["quarter_start"],
+        "as_of_date": period["as_of_date"],
+        "rows": [{"date": d, "product": p, "region": r, "source": src, **totals}
+                 for (d, p, r, src), totals in sorted(counts.items()) if any(totals.values())],
+    }
+
+
+def _trend_metric(current, previous, banded=False):
+    """One {current, previous, delta, deltaPercent, trend} struct of the trend query."""
+    delta = current - previous
+    up, down = (previous * 1.01, previous * 0.99) if banded else (previous, previous)
+    return {
+        "current": current, "previous": previous, "delta": delta,
+        "deltaPercent": round(delta / previous * 100, 1) if previous else None,
+        "trend": "UP" if current > up else "DOWN" if current < down else "FLAT",
+    }
+
+
+def generate_trend_analysis(report, current, previous, products=PRODUCTS, regions=REGIONS):
+    """
+    Return query_trend_analysis.sql output for a report.
+
+    current and previous are (start, end) ISO date pairs. Won, lost and open
+    deals come from the report's deal lists and funnel counts from
+    generate_daily_funnel, so windows outside the report's quarter are empty.
+    """
+    def selected(row):
+        return row.get("product") in products and row.get("region") in regions
+
+    def in_window(day, window):
+        return bool(day) and window[0] <= day[:10] <= window[1]
+
+    won = [d for rows in (report.get("won_deals") or {}).values() for d in rows if selected(d)]
+    lost = [d for rows in (report.get("lost_deals") or {}).values() for d in rows if selected(d)]
+    funnel = [r for r in generate_daily_funnel(report)["rows"] if selected(r)]
+
+    def won_by_segment(window):
+        groups = {}
+        for deal in won:
+            if in_window(deal.get("close_date"), window):
+                group = groups.setdefault((deal["product"], deal["region"], deal["category"]), [0, 0])
+                group[0] += 1
+                group[1] += deal.get("acv") or 0
+        return groups
+
+    def win_rates(window):
+        counts = {}
+        for deals, index in ((won, 0), (lost, 1)):
+            for deal in deals:
+                if in_window(deal.get("close_date"), window):
+                    counts.setdefault((deal["product"], deal["region"], deal["category"]), [0, 0])[index] += 1
+        return {key: w / (w + l) * 100 for key, (w, l) in counts.items() if w + l}
+
+    def funnel_by_region(window):
+        groups = {}
+        for row in funnel:
+            if in_window(row["date"], window):
+                totals = groups.setdefault((row["product"], row["region"]), dict.fromkeys(FUNNEL_STAGES, 0))
+                for stage in FUNNEL_STAGES:
+                    totals[stage] += row[stage]
+        return groups
+
+    def daily(rows, window, field, value, period_type):
+        days = {}
+        for row in rows:
+            if in_window(row.get(field), window):
+                days[row[field][:10]] = days.get(row[field][:10], 0) + value(row)
+        return [{"date": day, "value": total, "periodType": period_type} for day, total in sorted(days.items())] or None
+
+    cur_won, prev_won = won_by_segment(current), won_by_segment(previous)
+    cur_rates, prev_rates = win_rates(current), win_rates(previous)
+    cur_funnel, prev_funnel = funnel_by_region(current), funnel_by_region(previous)
+
+    def summary(groups):
+        deals = sum(g[0] for g in groups.values())
+        acv = sum(g[1] for g in groups.values())
+        return acv, deals, acv / deals if deals else 0
+
+    (cur_acv, cur_deals, cur_avg), (prev_acv, prev_deals, prev_avg) = summary(cur_won), summary(prev_won)
+    pipeline = sum(d.get("acv") or 0 for rows in (report.get("pipeline_deals") or {}).values()
+                   for d in rows if selected(d))
+    cur_stage = {s: sum(t[s] for t in cur_funnel.values()) for s in FUNNEL_STAGES}
+    prev_stage = {s: sum(t[s] for t in prev_funnel.values()) for s in FUNNEL_STAGES}
+    empty = dict.fromkeys(FUNNEL_STAGES, 0)
+
+    return {
+        "periodInfo": {
+            "current": {"startDate": current[0], "endDate": current[1]},
+            "previous": {"startDate": previous[0], "endDate": previous[1]},
+            "daysInPeriod": (date.fromisoformat(current[1]) - date.fromisoformat(current[0])).days + 1,
+        },
+        "filters": {"products": list(products), "regions": list(regions)},
+        "revenueSummary": {
+            "totalACV": _trend_metric(cur_acv, prev_acv, banded=True),
+            "wonDeals": _trend_metric(cur_deals, prev_deals),
+            "pipelineACV": {"current": pipeline, "previous": 0, "delta": pipeline, "deltaPercent": 0, "trend": "FLAT"},
+            "avgDealSize": _trend_metric(cur_avg, prev_avg, banded=True),
+        },
+        "funnelSummary": {f"total{s.upper()}": _trend_metric(cur_stage[s], prev_stage[s]) for s in FUNNEL_STAGES},
+        "revenueByDimension": [
+            {"product": p, "region": r, "category": c,
+             "acv": _trend_metric(cur_won[(p, r, c)][1], prev_won.get((p, r, c), [0, 0])[1], banded=True),
+             "deals": _trend_metric(cur_won[(p, r, c)][0], prev_won.get((p, r, c), [0, 0])[0]),
+             "winRate": _trend_metric(cur_rates.get((p, r, c), 0), prev_rates.get((p, r, c), 0), banded=True)}
+            for p, r, c in sorted(cur_won)
+        ] or None,
+        "funnelByDimension": [
+            {"product": p, "region": r,
+             **{s: _trend_metric(totals[s], prev_funnel.get((p, r), empty)[s]) for s in FUNNEL_STAGES}}
+            for (p, r), totals in sorted(cur_funnel.items())
+        ] or None,
+        "charts": {
+            "acvTimeSeries": {
+                "metricName": "ACV Won",
+                "currentPeriod": daily(won, current, "close_date", lambda d: d.get("acv") or 0, "current"),
+                "previousPeriod": daily(won, previous, "close_date", lambda d: d.get("acv") or 0, "previous"),
+            },
+            **{f"{s}TimeSeries": {
+                "metricName": s.upper(),
+                "currentPeriod": daily(funnel, current, "date", lambda r, s=s: r[s], "current"),
+                "previousPeriod": daily(funnel, previous, "date", lambda r, s=s: r[s], "previous"),
+            } for s in ("mql", "sql")},
+        },
+        "generatedAt": (report.get("generated_at_utc") or "")[:19] + "Z",
+    }
+
+
+def schema_of(value):
+    """
+    Return the structural schema of a JSON value.
+
+    Objects map keys to schemas, lists take the merged schema of their items,
+    and scalars become a kind name (numbers are one kind; null matches any).
+    """
+    if isinstance(value, dict):
+        return {key: schema_of(item) for key, item in value.items()}
+    if isinstance(value, list):
+        merged = None
+        for item in value:
+            merged = _merge(merged, schema_of(item))
+        return [merged]
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "num"
+    return type(value).__name__
+
+
+def _merge(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if isinstance(a, dict) and isinstance(b, dict):
+        return {key: _merge(a.get(key), b.get(key)) for key in list(a) + [k for k in b if k not in a]}
+    if isinstance(a, list) and isinstance(b, list):
+        return [_merge(a[0], b[0])]
+    return a
+
+
+def schema_diff(expected, actual, path="$"):
+    """Return human-readable differences between two schemas (unknowns on either side are skipped)."""
+    if expected is None or actual is None:
+        return []
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        # Product-keyed groups (POR/R360) and action_items urgencies are data, not schema
+        diffs = [f"{path}.{key}: missing" for key in expected if key not in actual]
+        diffs += [f"{path}.{key}: unexpected" for key in actual if key not in expected]
+        for key in expected:
+            if key in actual:
+                diffs += schema_diff(expected[key], actual[key], f"{path}.{key}")
+        return diffs
+    if isinstance(expected, list) and isinstance(actual, list):
+        return schema_diff(expected[0], actual[0], f"{path}[]")
+    if expected != actual:
+        return [f"{path}: expected {expected}, got {actual}"]
+    return []
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate synthetic report-data.json query output")
+    parser.add_argument("-o", "--output", help="Write the report here (default: stdout)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--products", default=",".join(PRODUCTS))
+    parser.add_argument("--regions", default=",".join(REGIONS))
+    parser.add_argument("--sources", default=",".join(SOURCES))
+    parser.add_argument("--deals", type=int, default=250, help="Open pipeline deals per product")
+    parser.add_argument("--details", type=int, default=0, help="MQL detail rows per product")
+    parser.add_argument("--owners", type=int, default=20, help="Deal owners per product")
+    parser.add_argument("--as-of", default="2026-01-14", help="Report date (YYYY-MM-DD)")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare the synthetic schema with data/report-data.json and exit")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    report = generate_report(
+        seed=args.seed,
+        products=tuple(p for p in args.products.split(",") if p),
+        regions=tuple(r for r in args.regions.split(",") if r),
+        sources=tuple(s for s in args.sources.split(",") if s),
+        deals=args.deals,
+        details=args.details,
+        owners=args.owners,
+        as_of=date.fromisoformat(args.as_of),
+    )
+
+    if args.check:
+        with open(REPORT_PATH, "r") as f:
+            real = json.load(f)
+        diffs = schema_diff(schema_of(real), schema_of(report))
+        for diff in diffs:
+            print(diff)
+        print(f"{len(diffs)} schema difference(s) against {REPORT_PATH}")
+        return 1 if diffs else 0
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload)
+        rows = sum(len(report[s][p]) for s in ("won_deals", "lost_deals", "pipeline_deals") for p in report[s])
+        print(f"Synthetic report saved to: {args.output} ({len(payload):,} bytes, {rows:,} deals)")
+    else:
+        sys.stdout.write(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Funnel Time Series
+
+Keeps cumulative daily counts per product x region x source so that any
+period-over-period comparison is answered from prefix sums instead of a new
+query. Measures: MQL, SQL, SAL and SQO (by capture date, from
+query_daily_funnel_counts.sql over DailyRevenueFunnel) and won/lost deal
+counts and ACV (by close date, from the report's deal lists).
+
+The report's *_details lists cannot feed the stage measures: the
+comprehensive query emits mql_details/sql_details empty and has no SAL/SQO
+details. On a refresh without the daily funnel rows (query failed or
+skipped), the stage series keep their stored values and only the deal
+measures are restated.
+
+Every series is stored as running totals indexed by days since the origin
+date, so the total over any window [start, end] is
+
+    cumulative[end] - cumulative[start - 1]
+
+Series are also kept for every rollup ("ALL" in any of product, region and
+source), so each window total is a single lookup whatever the filter.
+
+Each refresh covers the quarter to date. update() takes the report (and
+the daily funnel rows) as authoritative for those days, finds the first day whose daily value changed
+and only recomputes the running totals from there; earlier history is
+untouched. The store is saved to data/funnel-time-series.json.
+
+Usage:
+    python scripts/time_series.py update [data/report-data.json] --run-query
+    python scripts/time_series.py update [data/report-data.json] --funnel daily-funnel.json
+    python scripts/time_series.py window --start 2026-01-08 --end 2026-01-14 --product POR
+    python scripts/time_series.py compare --end 2026-01-14 --days 7 --region AMER
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from aggregation_engine import safe_divide, sql_round
+from snapshot_store import atomic_write_json
+
+
+TIME_SERIES_PATH = Path(__file__).parent.parent / "data" / "funnel-time-series.json"
+REPORT_PATH = Path(__file__).parent.parent / "data" / "report-data.json"
+QUERY_PATH = Path(__file__).parent.parent / "sql" / "reports" / "query_daily_funnel_counts.sql"
+RESULT_COLUMN = "daily_funnel_json"
+STORE_VERSION = 1
+ALL = "ALL"
+
+# Daily funnel row fields
+STAGE_MEASURES = ("mql", "sql", "sal", "sqo")
+DEAL_MEASURES = {
+    "won_deals": ("won_deals", False),
+    "won_acv": ("won_deals", True),
+    "lost_deals": ("lost_deals", False),
+    "lost_acv": ("lost_deals", True),
+}
+MEASURES = STAGE_MEASURES + tuple(DEAL_MEASURES)
+ACV_MEASURES = ("won_acv", "lost_acv")
+
+
+def series_key(product=ALL, region=ALL, source=ALL):
+    return f"{product}|{region}|{source}"
+
+
+def _rollup_keys(product, region, source):
+    """The cell's own key and all seven rollups that include it."""
+    return [series_key(p, r, s) for p in (product, ALL) for r in (region, ALL) for s in (source, ALL)]
+
+
+def new_store(origin):
+    return {"version": STORE_VERSION, "origin": origin, "last_date": None, "series": {}}
+
+
+def load_store(path=TIME_SERIES_PATH):
+    """Return the saved store, or None if there is none yet."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        store = json.load(f)
+    if store.get("version") != STORE_VERSION:
+        raise ValueError(f"{path} has store version {store.get('version')}, expected {STORE_VERSION}")
+    return store
+
+
+def save_store(store, path=TIME_SERIES_PATH):
+    atomic_write_json(Path(path), store)
+
+
+def _day(store, iso_date):
+    return (date.fromisoformat(iso_date) - date.fromisoformat(store["origin"])).days
+
+
+def run_funnel_query():
+    """Fetch quarter-to-date daily funnel counts. Raises RuntimeError on failure."""
+    try:
+        result = subprocess.run(
+            ["bq", "query", "--use_legacy_sql=false", "--format=json"],
+            stdin=open(QUERY_PATH, "r"),
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Daily funnel query timed out after 2 minutes")
+    except FileNotFoundError:
+        raise RuntimeError("'bq' command not found. Please install Google Cloud SDK.")
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Daily funnel query failed: {result.stderr.strip()}")
+    try:
+        rows = json.loads(result.stdout)
+        return json.loads(rows[0][RESULT_COLUMN])
+    except (json.JSONDecodeError, IndexError, KeyError, TypeError) as e:
+        raise RuntimeError(f"Could not parse daily funnel query output: {e}")
+
+
+def daily_counts(data, funnel=None):
+    """
+    Return {(product, region, source): {measure: {iso_date: value}}} for one report.
+
+    Stage measures come from the daily funnel query output, if given.
+    """
+    cells = {}
+
+    def add(row, measure, day, value):
+        if not day or not value:
+            return
+        key = (row.get("product"), row.get("region"), row.get("source") or "UNKNOWN")
+        days = cells.setdefault(key, {}).setdefault(measure, {})
+        days[day[:10]] = days.get(day[:10], 0) + value
+
+    for row in (funnel or {}).get("rows") or []:
+        for measure in STAGE_MEASURES:
+            add(row, measure, row.get("date"), row.get(measure) or 0)
+    for measure, (section, is_acv) in DEAL_MEASURES.items():
+        for deals in (data.get(section) or {}).values():
+            for deal in deals:
+                add(deal, measure, deal.get("close_date"), (deal.get("acv") or 0) if is_acv else 1)
+    return cells
+
+
+def update(store, data, funnel=None):
+    """
+    Merge one report into the store. Returns the number of series changed.
+
+    Days from the quarter start to the as-of date are replaced by the
+    report's values; series are re-accumulated from their first changed day.
+    Stage measures are only restated when the daily funnel rows are given.
+    """
+    period = data["period"]
+    start, end = period["quarter_start"], period["as_of_date"]
+    if start < store["origin"]:
+        raise ValueError(f"Report starts {start}, before the store origin {store['origin']}")
+
+    first, last = _day(store, start), _day(store, end)
+    length = max(last, _day(store, store["last_date"]) if store["last_date"] else -1) + 1
+    window = last - first + 1
+
+    # Daily values of every rollup key within the window
+    fresh = {}
+    restated = MEASURES if funnel is not None else tuple(DEAL_MEASURES)
+    for (product, region, source), measures in daily_counts(data, funnel).items():
+        for key in _rollup_keys(product, region, source):
+            target = fresh.setdefault(key, {})
+            for measure, days in measures.items():
+                values = target.setdefault(measure, [0] * window)
+                for iso_date, value in days.items():
+                    if start <= iso_date <= end:
+                        values[_day(store, iso_date) - first] += value
+
+    touched = 0
+    for key in set(store["series"]) | set(fresh):
+        series = store["series"].setdefault(key, {})
+        changed = False
+        for measure in MEASURES:
+            cumulative = series.setdefault(measure, [])
+            if len(cumulative) < length:
+                cumulative.extend([cumulative[-1] if cumulative else 0] * (length - len(cumulative)))
+            if measure not in restated:
+                continue
+            values = fresh.get(key, {}).get(measure) or [0] * window
+            changed |= _restate(cumulative, first, values, measure in ACV_MEASURES)
+        touched += changed
+
+    store["last_date"] = max(store["last_date"] or end, end)
+    return touched
+
+
+def _restate(cumulative, first, values, is_acv):
+    """Replace the daily values from day `first` on; re-accumulate from the first change."""
+    def daily(i):
+        return cumulative[i] - (cumulative[i - 1] if i else 0)
+
+    changed_at = next((i for i, value in enumerate(values)
+                       if abs(daily(first + i) - value) > (0.005 if is_acv else 0)), None)
+    if changed_at is None:
+        return False
+
+    tail = [daily(i) for i in range(first + len(values), len(cumulative))]
+    running = cumulative[first + changed_at - 1] if first + changed_at else 0
+    for i, value in enumerate(values[changed_at:] + tail, start=first + changed_at):
+        running = sql_round(running + value, 2) if is_acv else running + value
+        cumulative[i] = running
+    return True
+
+
+def window_total(store, measure, start, end, product=ALL, region=ALL, source=ALL):
+    """Total of one measure over [start, end] (ISO dates, inclusive)."""
+    cumulative = store["series"].get(series_key(product, region, source), {}).get(measure)
+    if not cumulative:
+        return 0
+    hi = min(_day(store, end), len(cumulative) - 1)
+    lo = _day(store, start) - 1
+    if hi < 0 or hi <= lo:
+        return 0
+    total = cumulative[hi] - (cumulative[lo] if lo >= 0 else 0)
+    return sql_round(total, 2) if measure in ACV_MEASURES else total
+
+
+def window_totals(store, start, end, **keys):
+    return {measure: window_total(store, measure, start, end, **keys) for measure in MEASURES}
+
+
+def compare(store, current, previous, **keys):
+    """
+    Compare two windows, each a (start, end) pair.
+
+    Returns {measure: {current, previous, delta, delta_pct}}; delta_pct is
+    None when the previous window is zero, like the query's SAFE_DIVIDE.
+    """
+    result = {}
+    for measure in MEASURES:
+        now = window_total(store, measure, *current, **keys)
+        before = window_total(store, measure, *previous, **keys)
+        delta = sql_round(now - before, 2) if measure in ACV_MEASURES else now - before
+        pct = safe_divide(delta, before)
+        result[measure] = {"current": now, "previous": before, "delta": delta,
+                           "delta_pct": sql_round(pct * 100, 1) if pct is not None else None}
+    return result
+
+
+def trailing_windows(end, days):
+    """The `days`-day window ending on `end` and the one before it (funnel_trends uses 7)."""
+    end_date = date.fromisoformat(end)
+    current = ((end_date - timedelta(days=days - 1)).isoformat(), end)
+    previous = ((end_date - timedelta(days=2 * days - 1)).isoformat(),
+                (end_date - timedelta(days=days)).isoformat())
+    return current, previous
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Prefix-sum funnel time series")
+    parser.add_argument("--store", default=str(TIME_SERIES_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_update = sub.add_parser("update", help="Merge a report into the store")
+    p_update.add_argument("path", nargs="?", default=str(REPORT_PATH))
+    p_update.add_argument("--funnel", help="Saved daily funnel query output (daily_funnel_json)")
+    p_update.add_argument("--run-query", action="store_true", help="Run the daily funnel query for the stage measures")
+
+    for name, help_text in (("window", "Totals over one window"),
+                            ("compare", "Compare a trailing window with the one before it")):
+        p = sub.add_parser(name, help=help_text)
+        if name == "window":
+            p.add_argument("--start", required=True)
+        else:
+            p.add_argument("--days", type=int, default=7)
+        p.add_argument("--end", help="Last day (default: last stored day)")
+        p.add_argument("--product", default=ALL)
+        p.add_argument("--region", default=ALL)
+        p.add_argument("--source", default=ALL)
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    try:
+        store = load_store(args.store)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.command == "update":
+        with open(args.path, "r") as f:
+            data = json.load(f)
+        store = store or new_store(data["period"]["quarter_start"])
+        funnel = None
+        try:
+            if args.funnel:
+                with open(args.funnel, "r") as f:
+                    funnel = json.load(f)
+            elif args.run_query:
+                funnel = run_funnel_query()
+            touched = update(store, data, funnel)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Error: {e}")
+            return 1
+        save_store(store, args.store)
+        print(f"Time series updated through {store['last_date']}: {touched} of {len(store['series'])} series changed")
+        if funnel is None:
+            print("Stage measures (MQL/SQL/SAL/SQO) not updated; pass --run-query or --funnel")
+        return 0
+
+    if store is None:
+        print(f"Error: no time series at {args.store}; run 'update' first")
+        return 1
+    keys = {"product": args.product, "region": args.region, "source": args.source}
+    end = args.end or store["last_date"]
+
+    if args.command == "window":
+        for measure, total in window_totals(store, args.start, end, **keys).items():
+            print(f"{measure:<12} {total:>14,}")
+    else:
+        current, previous = trailing_windows(end, args.days)
+        print(f"{'Measure':<12} {current[0]}..{current[1]:<10} {previous[0]}..{previous[1]:<10} {'Delta':>12} {'Pct':>7}")
+        for measure, row in compare(store, current, previous, **keys).items():
+            pct = f"{row['delta_pct']:.1f}%" if row["delta_pct"] is not None else "-"
+            print(f"{measure:<12} {row['current']:>22,} {row['previous']:>22,} {row['delta']:>12,} {pct:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
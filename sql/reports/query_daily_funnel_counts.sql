@@ -0,0 +1,46 @@
+-- ============================================================================
+-- DAILY FUNNEL COUNTS
+-- Quarter-to-date MQL/SQL/SAL/SQO per capture date, product, region and
+-- source from DailyRevenueFunnel, with the same filters and source mapping
+-- as funnel_actuals_by_source in query_comprehensive_risk_analysis.sql.
+-- scripts/time_series.py folds these rows into its prefix-sum series (the
+-- comprehensive query's *_details lists carry no usable stage dates).
+-- ============================================================================
+WITH params AS (
+  SELECT
+    CURRENT_DATE() AS as_of_date,
+    DATE_TRUNC(CURRENT_DATE(), QUARTER) AS qtd_start
+),
+
+daily_counts AS (
+  SELECT
+    FORMAT_DATE('%Y-%m-%d', CAST(CaptureDate AS DATE)) AS date,
+    RecordType AS product,
+    Region AS region,
+    CASE
+      WHEN UPPER(COALESCE(Source, '')) = 'INBOUND' THEN 'INBOUND'
+      WHEN UPPER(COALESCE(Source, '')) = 'OUTBOUND' THEN 'OUTBOUND'
+      WHEN UPPER(COALESCE(Source, '')) IN ('AE SOURCED', 'AE_SOURCED') THEN 'AE SOURCED'
+      WHEN UPPER(COALESCE(Source, '')) IN ('AM SOURCED', 'AM_SOURCED') THEN 'AM SOURCED'
+      WHEN UPPER(COALESCE(Source, '')) = 'TRADESHOW' THEN 'TRADESHOW'
+      WHEN UPPER(COALESCE(Source, '')) = 'PARTNERSHIPS' THEN 'PARTNERSHIPS'
+      ELSE 'OTHER'
+    END AS source,
+    SUM(MQL) AS mql,
+    SUM(SQL) AS sql,
+    SUM(SAL) AS sal,
+    SUM(SQO) AS sqo
+  FROM `data-analytics-306119.Staging.DailyRevenueFunnel`, params p
+  WHERE CAST(CaptureDate AS DATE) >= p.qtd_start
+    AND CAST(CaptureDate AS DATE) <= p.as_of_date
+    AND RecordType IN ('POR', 'R360')
+    AND UPPER(FunnelType) NOT IN ('RENEWAL', 'R360 RENEWAL')
+    AND Region IN ('AMER', 'EMEA', 'APAC')
+  GROUP BY date, product, region, source
+)
+
+SELECT TO_JSON_STRING(STRUCT(
+  (SELECT FORMAT_DATE('%Y-%m-%d', qtd_start) FROM params) AS quarter_start,
+  (SELECT FORMAT_DATE('%Y-%m-%d', as_of_date) FROM params) AS as_of_date,
+  ARRAY(SELECT AS STRUCT * FROM daily_counts ORDER BY date, product, region, source) AS rows
+)) AS daily_funnel_json
@@ -0,0 +1,86 @@
+-- ============================================================================
+-- SOP TARGETS FOR EVERY RISK PROFILE
+-- Returns the Q1 ACV targets used by query_comprehensive_risk_analysis.sql
+-- (by region/category and by region/source) plus full-year targets, for every
+-- risk profile the report UI offers (P50/P75/P90), in a single row. Actuals
+-- are fetched once by the comprehensive query; scripts/risk_profiles.py joins
+-- them against each target set locally.
+-- ============================================================================
+WITH params AS (
+  SELECT
+    DATE_TRUNC(CURRENT_DATE(), QUARTER) AS quarter_start,
+    DATE_ADD(DATE_TRUNC(CURRENT_DATE(), QUARTER), INTERVAL 3 MONTH) AS quarter_end,
+    DATE_TRUNC(CURRENT_DATE(), YEAR) AS year_start,
+    DATE_ADD(DATE_TRUNC(CURRENT_DATE(), YEAR), INTERVAL 1 YEAR) AS year_end,
+    ['P50', 'P75', 'P90'] AS percentiles  -- RiskProfile in lib/constants/dimensions.ts
+),
+
+-- Same filters and category mapping as q1_targets in the comprehensive query
+segment_targets AS (
+  SELECT
+    sop.Percentile AS percentile,
+    sop.RecordType AS product,
+    sop.Region AS region,
+    CASE
+      WHEN sop.FunnelType IN ('NEW LOGO', 'R360 NEW LOGO', 'INBOUND', 'R360 INBOUND') THEN 'NEW LOGO'
+      WHEN sop.FunnelType IN ('EXPANSION', 'R360 EXPANSION') THEN 'EXPANSION'
+      WHEN sop.FunnelType IN ('MIGRATION', 'R360 MIGRATION') THEN 'MIGRATION'
+      ELSE sop.FunnelType
+    END AS category,
+    ROUND(SUM(CASE
+      WHEN sop.Source = 'PARTNERSHIPS' THEN 0.0  -- Zero out PARTNERSHIPS per data quality fix
+      ELSE sop.Target_ACV
+    END), 2) AS q1_target
+  FROM `data-analytics-306119.Staging.StrategicOperatingPlan` sop
+  CROSS JOIN params p
+  WHERE sop.RecordType IN ('POR', 'R360')
+    AND sop.OpportunityType != 'RENEWAL'
+    AND sop.TargetDate >= p.quarter_start
+    AND sop.TargetDate < p.quarter_end
+    AND sop.Region IN ('AMER', 'EMEA', 'APAC')
+    AND sop.Percentile IN UNNEST(p.percentiles)
+  GROUP BY percentile, product, region, category
+  HAVING q1_target > 0
+),
+
+-- Same filters as source_targets in the comprehensive query
+source_targets AS (
+  SELECT
+    sop.Percentile AS percentile,
+    sop.RecordType AS product,
+    sop.Region AS region,
+    sop.Source AS source,
+    ROUND(SUM(sop.Target_ACV), 2) AS q1_target
+  FROM `data-analytics-306119.Staging.StrategicOperatingPlan` sop
+  CROSS JOIN params p
+  WHERE sop.OpportunityType != 'RENEWAL'
+    AND sop.TargetDate >= p.quarter_start
+    AND sop.TargetDate < p.quarter_end
+    AND sop.RecordType IN ('POR', 'R360')
+    AND sop.Region IN ('AMER', 'EMEA', 'APAC')
+    AND sop.Percentile IN UNNEST(p.percentiles)
+    AND sop.Source NOT IN ('ALL', 'PARTNERSHIPS')  -- Exclude aggregate and zeroed-out sources
+  GROUP BY percentile, product, region, source
+),
+
+fy_targets AS (
+  SELECT
+    sop.Percentile AS percentile,
+    sop.RecordType AS product,
+    ROUND(SUM(CASE WHEN sop.Source = 'PARTNERSHIPS' THEN 0.0 ELSE sop.Target_ACV END), 2) AS fy_target
+  FROM `data-analytics-306119.Staging.StrategicOperatingPlan` sop
+  CROSS JOIN params p
+  WHERE sop.RecordType IN ('POR', 'R360')
+    AND sop.OpportunityType != 'RENEWAL'
+    AND sop.TargetDate >= p.year_start
+    AND sop.TargetDate < p.year_end
+    AND sop.Region IN ('AMER', 'EMEA', 'APAC')
+    AND sop.Percentile IN UNNEST(p.percentiles)
+  GROUP BY percentile, product
+)
+
+SELECT TO_JSON_STRING(STRUCT(
+  ARRAY(SELECT AS STRUCT * FROM segment_targets ORDER BY percentile, product, region, category) AS segments,
+  ARRAY(SELECT AS STRUCT * FROM source_targets ORDER BY percentile, product, region, source) AS sources,
+  ARRAY(SELECT AS STRUCT * FROM fy_targets ORDER BY percentile, product) AS fy_targets
+)) AS sop_targets_json